@@ -0,0 +1,173 @@
+"""
+Benchmark /graph/sample against a synthetic power-law graph.
+
+Requires a running Neo4j (same env as the API). Generates organizations with
+preferential-attachment RELATED edges so a few hubs carry hundreds of edges, plus
+recent documents that mention hubs often, then times the legacy collect/UNWIND query
+against the bounded fetch_graph_sample engine.
+
+    python -m benchmarks.bench_graph_sample --orgs 3000 --edges-per-node 4 --docs 50
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+
+from neo4j import Query
+
+from src.constants import SAMPLE_DOC_LIMIT
+from src.graph_db import GraphManager
+from src.services.graph_queries import fetch_graph_sample
+
+BENCH_PREFIX = "bench-powerlaw-"
+
+LEGACY_SAMPLE_CYPHER = """
+MATCH (d:Document)
+WITH d ORDER BY coalesce(d.created_at, 0) DESC LIMIT $doc_limit
+OPTIONAL MATCH (d)-[:MENTIONS]->(e)
+OPTIONAL MATCH (e)-[r:RELATED]->(t)
+WITH collect(distinct d) AS docs, collect(distinct e) AS ent_nodes, collect(distinct t) AS target_nodes, collect(distinct r) AS rels
+WITH docs, ent_nodes, target_nodes, rels
+UNWIND ent_nodes + target_nodes AS n
+WITH docs, rels, collect(distinct n) AS uniq_nodes
+WITH docs,
+     [n IN uniq_nodes | {id: elementId(n), labels: labels(n), name: coalesce(n.name, n.url), props: properties(n)}] AS nodes,
+     [r IN rels WHERE r IS NOT NULL | {id: elementId(r), type: type(r), source: elementId(startNode(r)), target: elementId(endNode(r)), props: properties(r)}] AS edges
+RETURN nodes, edges, size(nodes) AS node_count, size(edges) AS edge_count,
+       [d IN docs | {id: elementId(d), url: d.url, created_at: d.created_at}] AS documents
+"""
+
+
+def power_law_edges(n: int, m: int, rng: random.Random) -> list[tuple[int, int]]:
+    """Barabasi-Albert style preferential attachment; returns directed (source, target) pairs."""
+    edges: list[tuple[int, int]] = []
+    targets_pool: list[int] = list(range(m))
+    for node in range(m, n):
+        chosen = set()
+        while len(chosen) < m:
+            chosen.add(rng.choice(targets_pool))
+        for t in chosen:
+            edges.append((node, t) if rng.random() < 0.5 else (t, node))
+        targets_pool.extend(chosen)
+        targets_pool.extend([node] * m)
+    return edges
+
+
+def seed_graph(orgs: int, edges_per_node: int, docs: int, mentions_per_doc: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    edges = power_law_edges(orgs, edges_per_node, rng)
+    degree = [0] * orgs
+    for s, t in edges:
+        degree[s] += 1
+        degree[t] += 1
+    weighted = [i for i, d in enumerate(degree) for _ in range(d)]
+    now_ms = int(time.time() * 1000)
+
+    db = GraphManager()
+    with db.session() as session:
+        for start in range(0, orgs, 1000):
+            session.run(
+                "UNWIND $names AS name MERGE (o:Organization {name: name})",
+                names=[f"{BENCH_PREFIX}org-{i}" for i in range(start, min(orgs, start + 1000))],
+            ).consume()
+        for start in range(0, len(edges), 2000):
+            session.run(
+                """
+                UNWIND $pairs AS pair
+                MATCH (s:Organization {name: pair[0]}), (t:Organization {name: pair[1]})
+                MERGE (s)-[:RELATED {type: 'COMPETES_WITH'}]->(t)
+                """,
+                pairs=[[f"{BENCH_PREFIX}org-{s}", f"{BENCH_PREFIX}org-{t}"] for s, t in edges[start:start + 2000]],
+            ).consume()
+        session.run(
+            """
+            UNWIND $docs AS doc
+            MERGE (d:Document {url: doc.url}) SET d.created_at = doc.created_at
+            WITH d, doc
+            UNWIND doc.mentions AS name
+            MATCH (o:Organization {name: name})
+            MERGE (d)-[:MENTIONS]->(o)
+            """,
+            docs=[
+                {
+                    "url": f"{BENCH_PREFIX}doc-{i}",
+                    # future-dated so the benchmark documents are the "most recent" ones
+                    "created_at": now_ms + 10_000_000 + i,
+                    "mentions": [f"{BENCH_PREFIX}org-{rng.choice(weighted)}" for _ in range(mentions_per_doc)],
+                }
+                for i in range(docs)
+            ],
+        ).consume()
+    return {"orgs": orgs, "edges": len(edges), "max_degree": max(degree), "docs": docs}
+
+
+def cleanup() -> None:
+    db = GraphManager()
+    with db.session() as session:
+        session.run(
+            """
+            MATCH (n) WHERE n.name STARTS WITH $prefix OR n.url STARTS WITH $prefix
+            CALL (n) { DETACH DELETE n } IN TRANSACTIONS OF 1000 ROWS
+            """,
+            prefix=BENCH_PREFIX,
+        ).consume()
+
+
+def run_legacy(doc_limit: int, timeout: float) -> None:
+    db = GraphManager()
+    with db.session() as session:
+        session.run(Query(LEGACY_SAMPLE_CYPHER, timeout=timeout), doc_limit=doc_limit).single()
+
+
+def time_calls(fn, repeats: int) -> dict:
+    samples: list[float] = []
+    errors = 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        try:
+            fn()
+        except Exception:
+            errors += 1
+            continue
+        samples.append((time.perf_counter() - start) * 1000)
+    if not samples:
+        return {"errors": errors}
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 2),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 2),
+        "max_ms": round(samples[-1], 2),
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orgs", type=int, default=3000)
+    parser.add_argument("--edges-per-node", type=int, default=4)
+    parser.add_argument("--docs", type=int, default=50)
+    parser.add_argument("--mentions-per-doc", type=int, default=8)
+    parser.add_argument("--doc-limit", type=int, default=SAMPLE_DOC_LIMIT)
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic graph afterwards")
+    args = parser.parse_args()
+
+    try:
+        shape = seed_graph(args.orgs, args.edges_per_node, args.docs, args.mentions_per_doc, args.seed)
+        report = {
+            "graph": shape,
+            "doc_limit": args.doc_limit,
+            "legacy": time_calls(lambda: run_legacy(args.doc_limit, args.timeout), args.repeats),
+            "bounded": time_calls(lambda: fetch_graph_sample(args.doc_limit), args.repeats),
+        }
+        print(json.dumps(report, indent=2))
+    finally:
+        if not args.keep:
+            cleanup()
+
+
+if __name__ == "__main__":
+    main()
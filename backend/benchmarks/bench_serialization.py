@@ -0,0 +1,117 @@
+"""
+Serialization benchmark for graph payloads.
+
+Builds a synthetic `/graph/sample`-shaped payload and compares FastAPI's default path
+(jsonable_encoder + json.dumps) with orjson, full and compact (columnar) formats, reporting
+encode time and raw / gzip sizes.
+
+    python -m benchmarks.bench_serialization --nodes 5000 --edges 15000 --runs 20
+"""
+import argparse
+import gzip
+import json
+import random
+import statistics
+import time
+from typing import Any, Callable
+
+from fastapi.encoders import jsonable_encoder
+
+from src.config import Config
+from src.serialization import compact_graph, dumps
+
+_LABELS = ("Organization", "Person", "Location", "Topic")
+_TYPES = ("COMPETES_WITH", "WORKS_FOR", "HEADQUARTERED_IN", "PARTNERS_WITH", "RELATED_TO")
+
+
+def synthetic_sample(nodes: int, edges: int, seed: int = 7) -> dict[str, Any]:
+    rng = random.Random(seed)
+    node_list = []
+    for i in range(nodes):
+        label = _LABELS[i % len(_LABELS)]
+        node_list.append(
+            {
+                "id": f"4:5f1c2d3e-0a9b-4c8d-8e7f-6a5b4c3d2e1f:{i}",
+                "labels": [label],
+                "name": f"{label} {i}",
+                "props": {
+                    "name": f"{label} {i}",
+                    "industry": rng.choice(["Software", "Defense", "Retail", "Energy"]),
+                    "description": f"Entity {i} extracted from news coverage and filings.",
+                    "created_at": 1_700_000_000_000 + i,
+                    "write_seq": i,
+                },
+            }
+        )
+    edge_list = []
+    for j in range(edges):
+        s, t = rng.randrange(nodes), rng.randrange(nodes)
+        edge_list.append(
+            {
+                "id": f"5:5f1c2d3e-0a9b-4c8d-8e7f-6a5b4c3d2e1f:{j}",
+                "type": _TYPES[j % len(_TYPES)],
+                "source": node_list[s]["id"],
+                "target": node_list[t]["id"],
+                "props": {
+                    "reason": "Overlapping products and customers.",
+                    "source_urls": [f"https://news.example/{j}", f"https://wire.example/{j}"],
+                    "created_at": 1_700_000_000_000 + j,
+                    "write_seq": j,
+                },
+            }
+        )
+    return {"nodes": node_list, "edges": edge_list, "node_count": nodes, "edge_count": edges, "documents": [], "seq": 1}
+
+
+def _stdlib(content: Any) -> bytes:
+    # What FastAPI's default JSONResponse does for a returned dict.
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def encoders(sample: dict[str, Any]) -> dict[str, Callable[[], bytes]]:
+    return {
+        "stdlib full": lambda: _stdlib(sample),
+        "orjson full": lambda: dumps(sample),
+        "orjson compact+props": lambda: dumps(compact_graph(sample, include_props=True)),
+        "orjson compact": lambda: dumps(compact_graph(sample, include_props=False)),
+    }
+
+
+def measure(sample: dict[str, Any], runs: int = 10) -> dict[str, dict[str, float]]:
+    report = {}
+    for name, encode in encoders(sample).items():
+        times = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            body = encode()
+            times.append((time.perf_counter() - started) * 1000)
+        report[name] = {
+            "encode_ms": round(statistics.median(times), 2),
+            "bytes": len(body),
+            "gzip_bytes": len(gzip.compress(body, compresslevel=Config.GZIP_LEVEL)),
+        }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=2000)
+    parser.add_argument("--edges", type=int, default=6000)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    report = measure(synthetic_sample(args.nodes, args.edges), args.runs)
+    base = report["stdlib full"]
+    print(f"{args.nodes} nodes, {args.edges} edges (median of {args.runs} runs)")
+    for name, row in report.items():
+        print(
+            f"{name:22s} encode {row['encode_ms']:8.2f}ms ({base['encode_ms'] / row['encode_ms']:4.1f}x)  "
+            f"{row['bytes'] / 1024:9.1f} KiB ({base['bytes'] / row['bytes']:4.1f}x)  "
+            f"gzip {row['gzip_bytes'] / 1024:8.1f} KiB ({base['bytes'] / row['gzip_bytes']:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Import-time benchmark for the API process.
+
+Imports `src.api` in fresh interpreters and reports wall time plus the slowest modules from
+`python -X importtime`, so heavy dependencies creeping back onto the import path show up.
+
+    python -m benchmarks.bench_startup --runs 5 --top 15 --max-ms 2500
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+# Loaded by the startup warm-up or on first use, never by `import src.api`. (numpy itself is
+# imported by the neo4j driver, so the in-process indexes are tracked instead.)
+LAZY_MODULES = (
+    "langchain_google_genai",
+    "langgraph",
+    "langchain.agents",
+    "src.services.dedupe",
+    "src.services.entity_index",
+    "src.services.landscape",
+)
+
+_PROBE = (
+    "import sys, json, src.api; "
+    f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))"
+)
+
+
+def time_import(module: str = "src.api") -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {module}"], cwd=BACKEND_DIR, check=True)
+    return (time.perf_counter() - started) * 1000
+
+
+def slowest_modules(module: str = "src.api", top: int = 15) -> list[tuple[str, float]]:
+    """Top modules by cumulative import time (ms)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            rows.append((parts[2].strip(), int(parts[1]) / 1000))
+    return sorted(rows, key=lambda r: r[1], reverse=True)[:top]
+
+
+def eagerly_loaded() -> list[str]:
+    proc = subprocess.run([sys.executable, "-c", _PROBE], cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--max-ms", type=float, default=None, help="Exit non-zero if the median exceeds this.")
+    args = parser.parse_args()
+
+    times = [time_import() for _ in range(args.runs)]
+    median = statistics.median(times)
+    print(f"import src.api: median {median:.0f}ms  min {min(times):.0f}ms  max {max(times):.0f}ms ({args.runs} runs)")
+    for name, ms in slowest_modules(top=args.top):
+        print(f"  {ms:8.1f}ms  {name}")
+
+    leaked = eagerly_loaded()
+    if leaked:
+        print(f"Heavy modules imported eagerly: {', '.join(leaked)}")
+    if leaked or (args.max_ms is not None and median > args.max_ms):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Deterministic stand-ins for Gemini, Tavily and Neo4j.
+
+Each fake sleeps for a configurable latency so benchmarks measure our own overhead plus
+the number of round trips we make, without any network access.
+"""
+import re
+import threading
+import time
+from typing import Callable
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+
+
+def _pause(seconds: float) -> None:
+    if seconds > 0:
+        time.sleep(seconds)
+
+
+class FakeNode(dict):
+    """Dict of properties with a `labels` attribute, like neo4j.graph.Node."""
+
+    def __init__(self, props: dict, labels: list[str]):
+        super().__init__(props)
+        self.labels = frozenset(labels)
+        self.element_id = f"fake:{labels[0] if labels else 'Node'}:{props.get('name') or props.get('url')}"
+
+
+class FakeRecord(dict):
+    """Record supporting key and positional access."""
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return list(self.values())[key]
+        return super().__getitem__(key)
+
+    def data(self) -> dict:
+        return dict(self)
+
+
+class FakeResult:
+    def __init__(self, records: list[dict]):
+        self._records = [r if isinstance(r, FakeRecord) else FakeRecord(r) for r in records]
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def single(self):
+        return self._records[0] if self._records else None
+
+    def data(self) -> list[dict]:
+        return [r.data() for r in self._records]
+
+    def consume(self):
+        return None
+
+
+Responder = Callable[[str, dict], list[dict]] | list[dict]
+
+
+class FixtureStore:
+    """
+    Recorded-fixture layer: maps query shapes to canned results.
+
+    A fixture matches when every marker substring occurs in the (whitespace-collapsed)
+    query. The first match wins; unmatched queries return an empty result.
+    """
+
+    def __init__(self):
+        self._fixtures: list[tuple[tuple[str, ...], Responder]] = []
+        self.hits: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, *markers: str, respond: Responder) -> None:
+        self._fixtures.append((tuple(markers), respond))
+
+    def lookup(self, query: str, params: dict) -> list[dict]:
+        shape = re.sub(r"\s+", " ", query)
+        for markers, respond in self._fixtures:
+            if all(m in shape for m in markers):
+                with self._lock:
+                    self.hits[markers[0]] = self.hits.get(markers[0], 0) + 1
+                return respond(shape, params) if callable(respond) else list(respond)
+        with self._lock:
+            self.hits["<unmatched>"] = self.hits.get("<unmatched>", 0) + 1
+        return []
+
+
+class FakeSession:
+    def __init__(self, manager: "FakeGraphManager"):
+        self._manager = manager
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def close(self):
+        return None
+
+    def run(self, query, parameters: dict | None = None, **kwargs):
+        text = getattr(query, "text", query)
+        params = {**(parameters or {}), **kwargs}
+        self._manager.count_query()
+        _pause(self._manager.latency)
+        return FakeResult(self._manager.fixtures.lookup(text, params))
+
+    def execute_write(self, fn, *args, **kwargs):
+        return fn(self, *args, **kwargs)
+
+    def execute_read(self, fn, *args, **kwargs):
+        return fn(self, *args, **kwargs)
+
+
+class FakeGraphManager:
+    """Drop-in for GraphManager: `session()` returns a fixture-backed session."""
+
+    def __init__(self, fixtures: FixtureStore, latency: float = 0.0):
+        self.fixtures = fixtures
+        self.latency = latency
+        self.queries = 0
+        self._lock = threading.Lock()
+        self.driver = None
+
+    def count_query(self) -> None:
+        with self._lock:
+            self.queries += 1
+
+    def session(self):
+        return FakeSession(self)
+
+    def close(self):
+        return None
+
+
+class FakeTavilyClient:
+    """Deterministic Tavily search results derived from the query text."""
+
+    latency = 0.0
+
+    def __init__(self, api_key: str | None = None):
+        self.api_key = api_key
+
+    def search(self, query: str, max_results: int = 3, **kwargs) -> dict:
+        _pause(self.latency)
+        slug = re.sub(r"[^a-z0-9]+", "-", query.lower()).strip("-")[:40]
+        return {
+            "results": [
+                {
+                    "url": f"https://news.example/{slug}/{i}",
+                    "title": f"Result {i} for {query[:40]}",
+                    "content": f"{query}. " * 40,
+                }
+                for i in range(max_results or 3)
+            ]
+        }
+
+
+def _target_company(messages) -> str:
+    for msg in reversed(messages):
+        if isinstance(msg, HumanMessage):
+            match = re.search(r"'([^']+)'", str(msg.content))
+            if match:
+                return match.group(1)
+    return "Acme"
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Replays a fixed ReAct script: search -> check_graph -> save_to_graph -> final answer.
+
+    The step is derived from how many tool results are already in the conversation, so the
+    same script serves concurrent threads. Plain prompts (e.g. mood) get `text_response`.
+    """
+
+    latency: float = 0.0
+    competitors: int = 4
+    text_response: str = (
+        '{"mood_label": "Neutral", "confidence": 0.5, "drivers": ["scripted"], "sources": [], "timeframe": "90d"}'
+    )
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-fake"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _script(self, messages) -> AIMessage:
+        company = _target_company(messages)
+        # Count tool results since the latest user turn; threads are reused across prompts.
+        last_user = max((i for i, m in enumerate(messages) if isinstance(m, HumanMessage)), default=0)
+        step = sum(isinstance(m, ToolMessage) for m in messages[last_user:])
+        if step == 0:
+            return AIMessage(content="", tool_calls=[{"name": "search_tavily", "args": {"query": company}, "id": "call-search"}])
+        if step == 1:
+            return AIMessage(content="", tool_calls=[{"name": "check_graph", "args": {"name": company}, "id": "call-check"}])
+        if step == 2:
+            data = self._update(company)
+            return AIMessage(content="", tool_calls=[{"name": "save_to_graph", "args": {"data": data}, "id": "call-save"}])
+        return AIMessage(content=f"Saved {company} to graph.")
+
+    def _update(self, company: str) -> dict:
+        peers = [f"{company} Rival {i}" for i in range(self.competitors)]
+        return {
+            "source_url": f"https://news.example/{company.lower()}",
+            "entities": [{"name": company, "label": "Organization", "properties": {"industry": "Tech"}}]
+            + [{"name": p, "label": "Organization", "properties": {}} for p in peers],
+            "relationships": [
+                {
+                    "source": company,
+                    "target": p,
+                    "type": "COMPETES_WITH",
+                    "properties": {"reason": "same market", "source_url": "https://news.example"},
+                }
+                for p in peers
+            ],
+        }
+
+    def with_structured_output(self, schema, **kwargs):
+        """Extraction mode: one call answering with the same update the ReAct script saves."""
+
+        def respond(prompt) -> object:
+            _pause(self.latency)
+            return schema(updates=[self._update(_target_company([HumanMessage(content=str(prompt))]))])
+
+        return RunnableLambda(respond)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        _pause(self.latency)
+        if not any(isinstance(m, (ToolMessage, AIMessage)) for m in messages) and "Return ONLY" in str(messages[-1].content):
+            message = AIMessage(content=self.text_response)
+        else:
+            message = self._script(messages)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+__all__ = [
+    "FakeGraphManager",
+    "FakeNode",
+    "FakeRecord",
+    "FakeResult",
+    "FakeSession",
+    "FakeTavilyClient",
+    "FixtureStore",
+    "ScriptedChatModel",
+]
@@ -0,0 +1,228 @@
+"""
+Default recorded fixtures: a tiny in-memory world that answers the query shapes used by
+src/tools/graph.py, src/services/graph_queries.py and src/routes/graph.py.
+"""
+import threading
+
+from benchmarks.fakes import FakeNode, FixtureStore
+
+
+class GraphState:
+    """Just enough state for ingest and read paths to return plausible, stable results."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.seq = 0
+        self.entities: dict[str, str] = {}
+        self.competitors: dict[str, list[str]] = {}
+        self.documents: list[str] = []
+
+    def seed(self, companies: int = 50, competitors_per_company: int = 4, documents: int = 20) -> None:
+        for i in range(companies):
+            name = f"Company {i}"
+            self.entities[name] = "Organization"
+            self.competitors[name] = [f"Company {(i + k + 1) % companies}" for k in range(competitors_per_company)]
+        self.documents = [f"https://news.example/doc-{i}" for i in range(documents)]
+
+
+def _next_seq(state: GraphState):
+    def respond(_shape, _params):
+        with state.lock:
+            state.seq += 1
+            return [{"seq": state.seq}]
+
+    return respond
+
+
+def _merge_entities(state: GraphState):
+    def respond(shape, params):
+        label = shape.split("MERGE (e:", 1)[1].split(" ", 1)[0]
+        with state.lock:
+            for row in params["entities"]:
+                state.entities.setdefault(row["name"], label)
+        return []
+
+    return respond
+
+
+def _merge_relationships(state: GraphState):
+    def respond(_shape, params):
+        with state.lock:
+            for row in params.get("rels", []):
+                if row["type"] == "COMPETES_WITH":
+                    peers = state.competitors.setdefault(row["s"], [])
+                    if row["t"] not in peers:
+                        peers.append(row["t"])
+        return []
+
+    return respond
+
+
+def _exact_entity(state: GraphState):
+    def respond(_shape, params):
+        return [{"n.name": params["name"]}] if params["name"] in state.entities else []
+
+    return respond
+
+
+def _company_node(state: GraphState):
+    def respond(_shape, params):
+        for name, label in state.entities.items():
+            if label == "Organization" and name.lower() == params["name"].lower():
+                return [{"c": FakeNode({"name": name}, ["Organization"])}]
+        return []
+
+    return respond
+
+
+def _competitors(state: GraphState):
+    def respond(_shape, params):
+        name = params["name"]
+        with state.lock:
+            peers = set(state.competitors.get(name, []))
+            peers.update(other for other, theirs in state.competitors.items() if name in theirs)
+        return [
+            {"competitor": peer, "reason": "same market", "source": "https://news.example"}
+            for peer in sorted(peers)
+        ]
+
+    return respond
+
+
+def _profile(state: GraphState):
+    def respond(_shape, params):
+        name = next((n for n in state.entities if n.lower() == params["name"].lower()), None)
+        if name is None:
+            return []
+        return [
+            {
+                "e": FakeNode({"name": name, "industry": "Tech"}, [state.entities[name]]),
+                "sources": [{"url": url, "created_at": i} for i, url in enumerate(state.documents[:5])],
+                "related": [
+                    {"id": f"id:{peer}", "name": peer, "labels": ["Organization"], "type": "COMPETES_WITH"}
+                    for peer in state.competitors.get(name, [])
+                ],
+            }
+        ]
+
+    return respond
+
+
+def _documents(state: GraphState):
+    def respond(_shape, params):
+        limit = params.get("doc_limit") or params.get("limit") or 5
+        return [
+            {"id": f"doc:{url}", "url": url, "created_at": 1_700_000_000_000 - i}
+            for i, url in enumerate(state.documents[:limit])
+        ]
+
+    return respond
+
+
+def _known_sources(state: GraphState):
+    def respond(_shape, params):
+        urls = params.get("urls")
+        return [{"url": url, "hash": None} for url in state.documents if urls is None or url in urls]
+
+    return respond
+
+
+def _organizations(state: GraphState):
+    def respond(_shape, _params):
+        with state.lock:
+            return [{"name": n} for n, label in state.entities.items() if label == "Organization"]
+
+    return respond
+
+
+def _organization_edges(state: GraphState):
+    def respond(_shape, _params):
+        with state.lock:
+            return [
+                {"source": s, "target": t, "type": "COMPETES_WITH"}
+                for s, peers in state.competitors.items()
+                for t in peers
+            ]
+
+    return respond
+
+
+def _sample_entities(state: GraphState):
+    def respond(_shape, params):
+        names = list(state.entities)[: params.get("max_nodes", 50)]
+        return [{"id": f"id:{n}", "labels": [state.entities[n]], "name": n, "props": {"name": n}} for n in names]
+
+    return respond
+
+
+def _expand(state: GraphState, id_param: str):
+    def respond(_shape, params):
+        rows = []
+        limit = params.get("fanout") or params.get("max_per_hop") or 10
+        for node_id in params[id_param]:
+            name = node_id.split(":", 1)[1]
+            for peer in state.competitors.get(name, [])[:limit]:
+                rows.append(
+                    {
+                        "rel_id": f"rel:{name}->{peer}",
+                        "type": "COMPETES_WITH",
+                        "source": node_id,
+                        "target": f"id:{peer}",
+                        "rel_props": {},
+                        "id": f"id:{peer}",
+                        "labels": ["Organization"],
+                        "name": peer,
+                        "props": {"name": peer},
+                    }
+                )
+        return rows
+
+    return respond
+
+
+def _root(state: GraphState):
+    def respond(_shape, params):
+        name = next((n for n in state.entities if n.lower() == params["name"].lower()), None)
+        return [{"id": f"id:{name}", "name": name, "labels": [state.entities[name]]}] if name else []
+
+    return respond
+
+
+def _stats(state: GraphState):
+    def respond(_shape, _params):
+        return [{"entities": len(state.entities), "sources": len(state.documents), "dedupe_confidence": 100}]
+
+    return respond
+
+
+def default_fixtures(state: GraphState) -> FixtureStore:
+    store = FixtureStore()
+    # writes
+    store.add("MERGE (s:WriteSequence", respond=_next_seq(state))
+    store.add("MATCH (s:WriteSequence", respond=lambda _s, _p: [{"seq": state.seq}])
+    store.add("UNWIND $entities AS row", respond=_merge_entities(state))
+    store.add("UNWIND $rels AS row", respond=_merge_relationships(state))
+    store.add("UNWIND $names AS name", "MERGE (d)-[m:MENTIONS]", respond=[])
+    # entity resolution
+    store.add("WHERE n.name = $name RETURN n.name", respond=_exact_entity(state))
+    store.add("db.index.fulltext.queryNodes", "$label IN labels(node)", respond=[])
+    # competitors
+    store.add("MATCH (c:Organization) WHERE toLower(c.name)", respond=_company_node(state))
+    store.add("RETURN o.name AS competitor", respond=_competitors(state))
+    # graph views
+    store.add("RETURN elementId(e) AS id, e.name AS name", respond=_root(state))
+    store.add("AS related", "RETURN e, sources, related", respond=_profile(state))
+    store.add("UNWIND $frontier", respond=_expand(state, "frontier"))
+    store.add("UNWIND $entity_ids", respond=_expand(state, "entity_ids"))
+    store.add("UNWIND $doc_ids", respond=_sample_entities(state))
+    store.add("AS dedupe_confidence", respond=_stats(state))
+    # landscape projection (bulk load)
+    store.add("MATCH (o:Organization) RETURN o.name AS name", respond=_organizations(state))
+    store.add("RETURN a.name AS source, b.name AS target, type(r) AS type", respond=_organization_edges(state))
+    # source dedup (bootstrap scan, then batched lookups)
+    store.add("MATCH (d:Document)", "d.content_hash AS hash", respond=_known_sources(state))
+    store.add("MATCH (d:Document)", "d.url AS url", respond=_documents(state))
+    return store
+
+
+__all__ = ["GraphState", "default_fixtures"]
@@ -0,0 +1,306 @@
+"""
+Offline benchmark suite: stubbed LLM, search and graph.
+
+Drives ingest, entity resolution, competitor lookups, the /graph/* routes and the full
+/agents/company-insight flow under configurable concurrency, then writes p50/p95/p99
+latency and throughput per scenario to JSON so runs can be compared across commits.
+
+    python -m benchmarks.run --concurrency 8 --iterations 200 --db-latency-ms 2 --out results.json
+    python -m benchmarks.run --compare benchmarks/results/previous.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+import httpx
+
+import src.agent as agent_module
+import src.llm as llm_module
+import src.services.extraction as extraction_module
+import src.tools.search as search_module
+from benchmarks.fakes import FakeGraphManager, FakeTavilyClient, ScriptedChatModel
+from benchmarks.fixtures import GraphState, default_fixtures
+from src.config import Config
+from src.graph_db import GraphManager
+from src.schema import Entity, KnowledgeGraphUpdate, Relationship
+from src.services.graph_queries import fetch_competitors
+from src.services.landscape import org_projection
+from src.tools.graph import insert_knowledge, resolve_entity
+
+DEFAULT_OUT = Path(__file__).resolve().parent / "results" / "latest.json"
+SEED_COMPANIES = 50
+
+
+@dataclass
+class BenchEnv:
+    state: GraphState
+    graph: FakeGraphManager
+    model: ScriptedChatModel
+
+
+@contextmanager
+def offline_environment(db_latency: float = 0.0, llm_latency: float = 0.0, search_latency: float = 0.0):
+    """Swap Neo4j, Tavily and Gemini for deterministic fakes; restore everything afterwards."""
+    state = GraphState()
+    state.seed(companies=SEED_COMPANIES)
+    graph = FakeGraphManager(default_fixtures(state), latency=db_latency)
+    model = ScriptedChatModel(latency=llm_latency)
+
+    saved = {
+        "instance": GraphManager._instance,
+        "tavily": search_module.TavilyClient,
+        "tavily_key": Config.TAVILY_API_KEY,
+        "tavily_latency": FakeTavilyClient.latency,
+        "chat_model_class": llm_module.chat_model_class,
+        "executor": agent_module._agent_executor,
+        "structured": extraction_module._structured_llm,
+    }
+    # GraphManager.__new__ returns the cached instance, so every GraphManager() call gets the fake.
+    GraphManager._instance = graph
+    FakeTavilyClient.latency = search_latency
+    search_module.TavilyClient = FakeTavilyClient
+    Config.TAVILY_API_KEY = Config.TAVILY_API_KEY or "offline-bench"
+    llm_module.chat_model_class = lambda: (lambda **_: model)
+    agent_module._agent_executor = None
+    extraction_module._structured_llm = None
+    org_projection.mark_stale()
+    try:
+        yield BenchEnv(state, graph, model)
+    finally:
+        org_projection.mark_stale()
+        GraphManager._instance = saved["instance"]
+        search_module.TavilyClient = saved["tavily"]
+        Config.TAVILY_API_KEY = saved["tavily_key"]
+        FakeTavilyClient.latency = saved["tavily_latency"]
+        llm_module.chat_model_class = saved["chat_model_class"]
+        agent_module._agent_executor = saved["executor"]
+        extraction_module._structured_llm = saved["structured"]
+
+
+def _percentile(sorted_ms: list[float], pct: float) -> float:
+    if not sorted_ms:
+        return 0.0
+    rank = max(0, min(len(sorted_ms) - 1, int(round(pct / 100 * len(sorted_ms) + 0.5)) - 1))
+    return round(sorted_ms[rank], 3)
+
+
+def summarize(latencies_ms: list[float], errors: int, wall_s: float, queries: int) -> dict[str, Any]:
+    ordered = sorted(latencies_ms)
+    ops = len(ordered)
+    return {
+        "ops": ops,
+        "errors": errors,
+        "p50_ms": _percentile(ordered, 50),
+        "p95_ms": _percentile(ordered, 95),
+        "p99_ms": _percentile(ordered, 99),
+        "mean_ms": round(sum(ordered) / ops, 3) if ops else 0.0,
+        "throughput_ops_s": round(ops / wall_s, 2) if wall_s > 0 else 0.0,
+        "db_queries_per_op": round(queries / max(1, ops + errors), 2),
+        "wall_s": round(wall_s, 3),
+    }
+
+
+def run_sync(op: Callable[[int], Any], iterations: int, concurrency: int, env: BenchEnv) -> dict[str, Any]:
+    latencies: list[float] = []
+    errors = 0
+
+    def timed(i: int):
+        start = time.perf_counter()
+        try:
+            op(i)
+        except Exception as e:
+            logging.getLogger("bench").debug(f"op failed: {e}")
+            return None
+        return (time.perf_counter() - start) * 1000
+
+    queries_before = env.graph.queries
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for result in pool.map(timed, range(iterations)):
+            if result is None:
+                errors += 1
+            else:
+                latencies.append(result)
+    return summarize(latencies, errors, time.perf_counter() - start, env.graph.queries - queries_before)
+
+
+def run_http(
+    method: str, path: Callable[[int], str], body: Callable[[int], dict] | None, iterations: int, concurrency: int, env: BenchEnv
+) -> dict[str, Any]:
+    from src.api import app
+
+    async def main():
+        latencies: list[float] = []
+        errors = 0
+        sem = asyncio.Semaphore(concurrency)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+
+            async def one(i: int):
+                nonlocal errors
+                async with sem:
+                    start = time.perf_counter()
+                    response = await client.request(method, path(i), json=body(i) if body else None)
+                    await response.aread()
+                    if response.status_code >= 400:
+                        errors += 1
+                        return
+                    latencies.append((time.perf_counter() - start) * 1000)
+
+            await asyncio.gather(*(one(i) for i in range(iterations)))
+        return latencies, errors
+
+    queries_before = env.graph.queries
+    start = time.perf_counter()
+    latencies, errors = asyncio.run(main())
+    return summarize(latencies, errors, time.perf_counter() - start, env.graph.queries - queries_before)
+
+
+def _company(i: int) -> str:
+    return f"Company {i % SEED_COMPANIES}"
+
+
+def _update(i: int) -> KnowledgeGraphUpdate:
+    company = _company(i)
+    peer = _company(i + 7)
+    return KnowledgeGraphUpdate(
+        source_url=f"https://news.example/ingest-{i}",
+        entities=[
+            Entity(name=company, label="Organization", properties={"industry": "Tech"}),
+            Entity(name=peer, label="Organization"),
+            Entity(name=f"Person {i}", label="Person", properties={"role": "CEO"}),
+        ],
+        relationships=[
+            Relationship(source=company, target=peer, type="COMPETES_WITH", properties={"reason": "overlap"}),
+            Relationship(source=f"Person {i}", target=company, type="WORKS_FOR"),
+        ],
+    )
+
+
+def scenarios(env: BenchEnv) -> dict[str, Callable[[int, int], dict[str, Any]]]:
+    def resolve(i: int):
+        with env.graph.session() as session:
+            name = _company(i) if i % 2 == 0 else f"Unknown {i}"
+            return resolve_entity(session, name, "Organization")
+
+    get = lambda p: (lambda n, c: run_http("GET", p, None, n, c, env))  # noqa: E731
+    return {
+        "insert_knowledge": lambda n, c: run_sync(lambda i: insert_knowledge(_update(i)), n, c, env),
+        "resolve_entity": lambda n, c: run_sync(resolve, n, c, env),
+        "fetch_competitors": lambda n, c: run_sync(lambda i: fetch_competitors(_company(i)), n, c, env),
+        "GET /graph/sample": get(lambda i: "/graph/sample"),
+        "GET /graph/stats": get(lambda i: "/graph/stats"),
+        "GET /graph/recent-docs": get(lambda i: "/graph/recent-docs"),
+        "GET /graph/competitors": get(lambda i: f"/graph/competitors?company={_company(i)}"),
+        "GET /graph/profile": get(lambda i: f"/graph/profile?name={_company(i)}"),
+        "GET /graph/neighborhood": get(lambda i: f"/graph/neighborhood?name={_company(i)}&depth=2"),
+        "GET /graph/landscape": get(lambda i: f"/graph/landscape?company={_company(i)}"),
+        "POST /agents/company-insight": lambda n, c: run_http(
+            "POST", lambda i: "/agents/company-insight", lambda i: {"company": _company(i)}, n, c, env
+        ),
+        "POST /agents/company-insight (extract)": lambda n, c: run_http(
+            "POST",
+            lambda i: "/agents/company-insight",
+            lambda i: {"company": _company(i), "mode": "extract", "refresh": True},
+            n,
+            c,
+            env,
+        ),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_suite(
+    iterations: int = 100,
+    concurrency: int = 8,
+    db_latency_ms: float = 0.0,
+    llm_latency_ms: float = 0.0,
+    search_latency_ms: float = 0.0,
+    only: list[str] | None = None,
+) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    with offline_environment(db_latency_ms / 1000, llm_latency_ms / 1000, search_latency_ms / 1000) as env:
+        for name, scenario in scenarios(env).items():
+            if only and not any(key in name for key in only):
+                continue
+            results[name] = scenario(iterations, concurrency)
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": int(time.time()),
+            "python": platform.python_version(),
+            "iterations": iterations,
+            "concurrency": concurrency,
+            "db_latency_ms": db_latency_ms,
+            "llm_latency_ms": llm_latency_ms,
+            "search_latency_ms": search_latency_ms,
+        },
+        "scenarios": results,
+    }
+
+
+def compare(current: dict[str, Any], previous: dict[str, Any]) -> list[str]:
+    lines = []
+    for name, stats in current["scenarios"].items():
+        before = previous.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        for key in ("p50_ms", "p95_ms", "throughput_ops_s"):
+            old, new = before.get(key) or 0, stats.get(key) or 0
+            change = ((new - old) / old * 100) if old else 0.0
+            lines.append(f"{name:32s} {key:18s} {old:>10} -> {new:>10} ({change:+.1f}%)")
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--db-latency-ms", type=float, default=1.0)
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0)
+    parser.add_argument("--search-latency-ms", type=float, default=0.0)
+    parser.add_argument("--only", action="append", help="substring filter for scenario names (repeatable)")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT)
+    parser.add_argument("--compare", type=Path, help="previous results JSON to diff against")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, force=True)
+    report = run_suite(
+        iterations=args.iterations,
+        concurrency=args.concurrency,
+        db_latency_ms=args.db_latency_ms,
+        llm_latency_ms=args.llm_latency_ms,
+        search_latency_ms=args.search_latency_ms,
+        only=args.only,
+    )
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(report, indent=2))
+    for name, stats in report["scenarios"].items():
+        print(
+            f"{name:32s} p50 {stats['p50_ms']:>9.2f}ms  p95 {stats['p95_ms']:>9.2f}ms  "
+            f"p99 {stats['p99_ms']:>9.2f}ms  {stats['throughput_ops_s']:>9.1f} ops/s  errors {stats['errors']}"
+        )
+    if args.compare:
+        print("\n".join(compare(report, json.loads(args.compare.read_text()))))
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
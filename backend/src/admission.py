@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+
+from src.config import Config
+from src.telemetry import metrics
+
+logger = logging.getLogger("admission")
+
+
+class AdmissionRejected(Exception):
+    """Raised instead of queueing when a mission could not finish within its budget."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+@dataclass
+class Ticket:
+    client: str
+    # Slots held: 1 per mission, more for batches that run several LLM calls at once.
+    weight: int = 1
+    arrived: float = field(default_factory=time.monotonic)
+    started: float | None = None
+
+
+class AdmissionController:
+    """
+    Bounded, per-client-fair admission for agent missions.
+
+    At most `concurrency` missions run at once. Waiters queue per client and slots are handed
+    out round-robin across clients, so one busy caller cannot starve the rest; a weighted
+    ticket (a batch) holds several slots and waits at the head of the line until they are
+    free. The expected
+    queue wait is derived from an EWMA of recent mission durations; a request is rejected up
+    front when its predicted completion would pass `budget` (RUN_MISSION_TIMEOUT), or when the
+    queue or the caller's share of it is full. All state lives on the event loop.
+    """
+
+    def __init__(
+        self,
+        concurrency: int,
+        max_queue: int,
+        max_per_client: int,
+        budget: float,
+        initial_estimate: float,
+        alpha: float = 0.2,
+    ):
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.max_per_client = max_per_client
+        self.budget = budget
+        self.alpha = alpha
+        self.ewma_seconds = initial_estimate
+        self.running = 0
+        self._queues: OrderedDict[str, deque[tuple[Ticket, asyncio.Future]]] = OrderedDict()
+
+    @property
+    def queued(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    def predicted_wait(self, ahead: int | None = None) -> float:
+        """Seconds until a new arrival would start, given the queue ahead of it."""
+        ahead = self.queued if ahead is None else ahead
+        if self.running < self.concurrency and ahead == 0:
+            return 0.0
+        return (ahead // self.concurrency + 1) * self.ewma_seconds
+
+    def _admit_or_reject(self, client: str) -> None:
+        wait = self.predicted_wait()
+        if wait + self.ewma_seconds > self.budget:
+            raise AdmissionRejected("predicted wait exceeds the mission deadline", wait + self.ewma_seconds - self.budget)
+        if self.queued >= self.max_queue:
+            raise AdmissionRejected("admission queue full", wait)
+        if len(self._queues.get(client, ())) >= self.max_per_client:
+            raise AdmissionRejected("too many queued missions for this client", wait)
+
+    async def acquire(self, client: str, timeout: float | None = None, weight: int = 1) -> Ticket:
+        ticket = Ticket(client, weight=max(1, min(weight, self.concurrency)))
+        if self.running + ticket.weight <= self.concurrency and not self._queues:
+            return self._start(ticket)
+        try:
+            self._admit_or_reject(client)
+        except AdmissionRejected as e:
+            metrics.inc("gotham_admission_rejected_total", help="Missions shed before queueing.", reason=e.reason)
+            logger.warning(f"🚦 Rejected mission for {client}: {e.reason} (retry after {e.retry_after}s)")
+            raise
+        waiter = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(client, deque()).append((ticket, waiter))
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except BaseException:
+            self._forget(client, waiter)
+            if waiter.done() and not waiter.cancelled():
+                # Granted a slot in the same instant we gave up; hand it on.
+                self.release(ticket, record=False)
+            raise
+        return ticket
+
+    def _forget(self, client: str, waiter: asyncio.Future) -> None:
+        queue = self._queues.get(client)
+        if queue is None:
+            return
+        for item in list(queue):
+            if item[1] is waiter:
+                queue.remove(item)
+        if not queue:
+            del self._queues[client]
+
+    def _start(self, ticket: Ticket) -> Ticket:
+        self.running += ticket.weight
+        ticket.started = time.monotonic()
+        metrics.observe(
+            "gotham_admission_wait_seconds", ticket.started - ticket.arrived, help="Time missions spent queued."
+        )
+        return ticket
+
+    def release(self, ticket: Ticket, record: bool = True) -> None:
+        self.running -= ticket.weight
+        if record and ticket.started is not None:
+            duration = time.monotonic() - ticket.started
+            self.ewma_seconds = self.alpha * duration + (1 - self.alpha) * self.ewma_seconds
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Start queued missions round-robin across clients while slots are free."""
+        while self.running < self.concurrency and self._queues:
+            client, queue = next(iter(self._queues.items()))
+            ticket, waiter = queue[0]
+            if not waiter.done() and self.running + ticket.weight > self.concurrency:
+                break
+            queue.popleft()
+            # Rotate: this client goes to the back of the line for its next waiter.
+            del self._queues[client]
+            if queue:
+                self._queues[client] = queue
+            if waiter.done():
+                continue
+            self._start(ticket)
+            waiter.set_result(None)
+
+    def view(self) -> dict:
+        return {
+            "running": self.running,
+            "queued": self.queued,
+            "clients_waiting": len(self._queues),
+            "estimated_mission_s": round(self.ewma_seconds, 2),
+            "predicted_wait_s": round(self.predicted_wait(), 2),
+        }
+
+
+admission = AdmissionController(
+    concurrency=Config.ADMISSION_CONCURRENCY,
+    max_queue=Config.ADMISSION_MAX_QUEUE,
+    max_per_client=Config.ADMISSION_MAX_PER_CLIENT,
+    budget=Config.RUN_MISSION_TIMEOUT,
+    initial_estimate=Config.ADMISSION_INITIAL_ESTIMATE,
+)
+
+
+__all__ = ["AdmissionController", "AdmissionRejected", "Ticket", "admission"]
@@ -4,11 +4,11 @@ import random
 import time
 import threading
 
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langgraph.checkpoint.memory import MemorySaver
-from langchain.agents import create_agent
+from langchain_core.callbacks import BaseCallbackHandler
 
-from src.config import Config
+from src.deadline import Deadline, DeadlineExceeded, current_deadline, deadline_scope
+from src.llm import build_chat_model
+from src.telemetry import bind_thread_id, current_thread_id, metrics, record_span, span
 from src.tools.graph import save_to_graph, check_graph
 from src.tools.search import search_tavily
 
@@ -33,31 +33,112 @@ _agent_executor = None
 _llm_semaphore = threading.BoundedSemaphore(3)
 
 
-def _invoke_with_backoff(agent_executor, payload, thread_id: str | None):
+class _AgentStepTracer(BaseCallbackHandler):
+    """
+    Times each model turn and tool call of an agent run into the span histogram, and stops
+    the run at the next step once the request deadline has passed.
+    """
+
+    # Re-raise from callbacks so a DeadlineExceeded aborts the LangGraph run.
+    raise_error = True
+
+    def __init__(self, deadline: Deadline | None = None):
+        self._starts: dict = {}
+        self._deadline = deadline
+
+    def _start(self, run_id) -> None:
+        self._starts[run_id] = time.perf_counter()
+
+    def _finish(self, run_id, span_name: str, status: str) -> None:
+        start = self._starts.pop(run_id, None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        record_span(span_name, elapsed, status)
+        logger.debug(f"{span_name} {elapsed * 1000:.0f}ms status={status} thread={current_thread_id()}")
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        if self._deadline is not None:
+            self._deadline.check("agent.llm")
+        self._start(run_id)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._finish(run_id, "agent.llm", "ok")
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, "agent.llm", "error")
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        if self._deadline is not None:
+            self._deadline.check(f"agent.tool.{(serialized or {}).get('name', 'tool')}")
+        self._start(run_id)
+        self._starts[(run_id, "name")] = (serialized or {}).get("name", "tool")
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._finish(run_id, f"agent.tool.{self._starts.pop((run_id, 'name'), 'tool')}", "ok")
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, f"agent.tool.{self._starts.pop((run_id, 'name'), 'tool')}", "error")
+
+
+def _invoke_with_backoff(agent_executor, payload, thread_id: str | None, deadline: Deadline | None = None):
     """Invoke the agent with capped concurrency and jittered backoff on 429/503."""
     backoff_base = 1.0
     max_retries = 3
+    config = {"callbacks": [_AgentStepTracer(deadline)]}
+    if thread_id:
+        config["configurable"] = {"thread_id": thread_id}
     for attempt in range(max_retries + 1):
+        if deadline is not None:
+            deadline.check("agent.invoke")
         try:
-            if thread_id:
-                return agent_executor.invoke(payload, config={"configurable": {"thread_id": thread_id}})
-            return agent_executor.invoke(payload)
+            return agent_executor.invoke(payload, config=config)
+        except DeadlineExceeded:
+            raise
         except Exception as exc:
             msg = str(exc)
             retriable = any(code in msg for code in ["429", "RESOURCE_EXHAUSTED", "quota", "temporarily unavailable", "503"])
+            if any(code in msg for code in ["429", "RESOURCE_EXHAUSTED"]):
+                metrics.inc("gotham_llm_rate_limited_total", help="Agent invocations rejected with 429.")
             if not retriable or attempt >= max_retries:
                 raise
             sleep_for = backoff_base * (2**attempt) + random.uniform(0, 0.5)
+            if deadline is not None and sleep_for >= deadline.remaining():
+                # Sleeping would outlive the request; give the quota back instead.
+                raise DeadlineExceeded(f"deadline exceeded during backoff (thread {thread_id})") from exc
+            metrics.inc("gotham_llm_retries_total", help="Agent invocations retried after a transient error.")
+            metrics.observe("gotham_llm_backoff_seconds", sleep_for, help="Backoff sleeps before agent retries.")
+            logger.warning(
+                f"Agent call failed ({msg[:120]}); retry {attempt + 1}/{max_retries} in {sleep_for:.2f}s "
+                f"(thread {thread_id})"
+            )
             time.sleep(sleep_for)
 
+def invoke_llm(runnable, payload, thread_id: str | None = None, deadline: Deadline | None = None):
+    """
+    Invoke any LLM runnable under the shared concurrency cap, with 429/503 backoff.
+
+    `deadline` defaults to the request's deadline; queueing, retries and every agent step stop
+    once it has passed, and tool calls (search, graph) see it as their per-call timeout.
+    """
+    deadline = deadline or current_deadline()
+    with span("agent.queue_wait"):
+        acquired = _llm_semaphore.acquire(timeout=deadline.remaining() if deadline is not None else None)
+    if not acquired:
+        raise DeadlineExceeded("deadline exceeded waiting for an LLM slot")
+    try:
+        with deadline_scope(deadline):
+            return _invoke_with_backoff(runnable, payload, thread_id, deadline)
+    finally:
+        _llm_semaphore.release()
+
+
 def _build_agent():
-    llm = ChatGoogleGenerativeAI(
-        model=Config.MODEL_NAME,
-        temperature=0,
-        max_retries=Config.LLM_MAX_RETRIES,
-        timeout=Config.LLM_TIMEOUT,
-        convert_system_message_to_human=True
-    )
+    # Imported here so `src.api` starts without LangGraph; the warm-up builds the agent early.
+    from langchain.agents import create_agent
+    from langgraph.checkpoint.memory import MemorySaver
+
+    llm = build_chat_model(temperature=0)
     memory = MemorySaver()
     return create_agent(
         llm,
@@ -72,11 +153,11 @@ def get_agent_executor():
         _agent_executor = _build_agent()
     return _agent_executor
 
-def run_agent(task: str, thread_id: str | None = None) -> str:
+def run_agent(task: str, thread_id: str | None = None, deadline: Deadline | None = None) -> str:
     agent_executor = get_agent_executor()
     payload = {"messages": [("user", task)]}
-    with _llm_semaphore:
-        result = _invoke_with_backoff(agent_executor, payload, thread_id)
+    with bind_thread_id(thread_id), span("agent.run"):
+        result = invoke_llm(agent_executor, payload, thread_id, deadline)
 
     last_msg = result["messages"][-1]
     content = last_msg.content
@@ -1,12 +1,48 @@
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from src.agent import run_agent  # re-export for legacy tests
 
+from src.config import Config
 from src.routes.agents import router as agents_router
 from src.routes.graph import router as graph_router
+from src.routes.ops import router as ops_router
+from src.serialization import CompressionMiddleware, FastJSONResponse
+from src.startup import run_warmup, warmup_state
 
-app = FastAPI(title="Gotham OSINT API", version="1.0")
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    background: list[asyncio.Task] = []
+    # Warm-up runs in the background so `/` answers immediately; `/ready` reports progress.
+    if Config.WARMUP_ON_STARTUP:
+        background.append(asyncio.create_task(run_warmup(retry=True)))
+    else:
+        warmup_state.skip()
+    if Config.DEDUPE_INTERVAL_SECONDS > 0:
+        # Imported here: dedupe pulls in numpy, the entity index and the landscape projection.
+        from src.services.dedupe import dedupe_loop
+
+        background.append(asyncio.create_task(dedupe_loop(Config.DEDUPE_INTERVAL_SECONDS)))
+    try:
+        yield
+    finally:
+        for task in background:
+            task.cancel()
+
+
+app = FastAPI(
+    title="Gotham OSINT API", version="1.0", lifespan=lifespan, default_response_class=FastJSONResponse
+)
+# The mood batch stream must reach the client line by line; gzip would hold lines back.
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=Config.GZIP_MIN_BYTES,
+    compresslevel=Config.GZIP_LEVEL,
+    exclude_paths=("/agents/company-mood/batch",),
+)
 logging.basicConfig(level=logging.INFO)
 
 
@@ -18,6 +54,7 @@ def health():
 # Include routers
 app.include_router(agents_router)
 app.include_router(graph_router)
+app.include_router(ops_router)
 
 # Backward compatibility for tests expecting run_agent on api module
 __all__ = ["app", "run_agent"]
@@ -6,21 +6,100 @@ from dotenv import load_dotenv
 # Load backend/.env deterministically (independent of CWD).
 load_dotenv(dotenv_path=Path(__file__).resolve().parents[1] / ".env")
 
+# On-disk caches live in the user cache directory (XDG_CACHE_HOME), not the source tree.
+_CACHE_DIR = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "gotham"
+
 class Config:
     # Model
     MODEL_NAME = os.getenv("LLM_MODEL", "gemini-2.5-flash")
     LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "6"))
     LLM_TIMEOUT = int(os.getenv("LLM_TIMEOUT", "60"))
     RUN_MISSION_TIMEOUT = int(os.getenv("RUN_MISSION_TIMEOUT", "120"))
+
+    # Batch mood
+    MOOD_BATCH_SEARCH_CONCURRENCY = int(os.getenv("MOOD_BATCH_SEARCH_CONCURRENCY", "8"))
+    MOOD_BATCH_LLM_CONCURRENCY = int(os.getenv("MOOD_BATCH_LLM_CONCURRENCY", "3"))
+    MOOD_BATCH_CHAR_BUDGET = int(os.getenv("MOOD_BATCH_CHAR_BUDGET", "24000"))
+    MOOD_BATCH_MAX_PER_CALL = int(os.getenv("MOOD_BATCH_MAX_PER_CALL", "6"))
     
+    # On-disk cache of identical chat model calls (agent turns, extraction, mood)
+    LLM_CACHE = os.getenv("LLM_CACHE", "1") == "1"
+    LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", str(_CACHE_DIR / "llm_cache.sqlite"))
+    LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "86400"))
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+
+    # Response compression (gzip) for bodies of at least this many bytes
+    GZIP_MIN_BYTES = int(os.getenv("GZIP_MIN_BYTES", "1024"))
+    GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "5"))
+
+    # MCP server (src/server.py): transport and bind address for sse/streamable-http
+    MCP_TRANSPORT = os.getenv("MCP_TRANSPORT", "stdio")
+    MCP_HOST = os.getenv("MCP_HOST", "127.0.0.1")
+    MCP_PORT = int(os.getenv("MCP_PORT", "8001"))
+    MCP_SEARCH_CONCURRENCY = int(os.getenv("MCP_SEARCH_CONCURRENCY", "8"))
+
+    # Warm the Neo4j driver, agent and LLM clients in the background at startup (see /ready);
+    # failed steps are retried with exponential backoff between these bounds (s)
+    WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "1") == "1"
+    WARMUP_RETRY_SECONDS = float(os.getenv("WARMUP_RETRY_SECONDS", "2"))
+    WARMUP_RETRY_MAX_SECONDS = float(os.getenv("WARMUP_RETRY_MAX_SECONDS", "60"))
+    # Apply pending graph migrations (src.migrations) as part of the warm-up
+    MIGRATE_ON_STARTUP = os.getenv("MIGRATE_ON_STARTUP", "1") == "1"
+
+    # Admission control for agent missions: concurrent missions, queue bounds, first duration guess (s)
+    ADMISSION_CONCURRENCY = int(os.getenv("ADMISSION_CONCURRENCY", "3"))
+    ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "20"))
+    ADMISSION_MAX_PER_CLIENT = int(os.getenv("ADMISSION_MAX_PER_CLIENT", "4"))
+    ADMISSION_INITIAL_ESTIMATE = float(os.getenv("ADMISSION_INITIAL_ESTIMATE", "30"))
+
+    # Default mission mode for agent endpoints: "agent" (tool loop) or "extract" (one structured call)
+    MISSION_MODE = os.getenv("MISSION_MODE", "agent")
+
+    # Mission planner
+    PLANNER_MIN_EXECUTIVES = int(os.getenv("PLANNER_MIN_EXECUTIVES", "2"))
+    PLANNER_MIN_COMPETITORS = int(os.getenv("PLANNER_MIN_COMPETITORS", "4"))
+    PLANNER_MOOD_TTL = float(os.getenv("PLANNER_MOOD_TTL", "3600"))
+
+    # Change feed
+    CHANGES_POLL_INTERVAL = float(os.getenv("CHANGES_POLL_INTERVAL", "1.0"))
+
+    # Semantic entity resolution (optional stage after exact/fuzzy matching)
+    SEMANTIC_RESOLUTION = os.getenv("SEMANTIC_RESOLUTION", "0") == "1"
+    SEMANTIC_RESOLUTION_THRESHOLD = float(os.getenv("SEMANTIC_RESOLUTION_THRESHOLD", "0.88"))
+    ENTITY_EMBEDDING_MODEL = os.getenv("ENTITY_EMBEDDING_MODEL", "hashing")
+    ENTITY_INDEX_PATH = os.getenv("ENTITY_INDEX_PATH", str(_CACHE_DIR / "entity_index.npz"))
+    ENTITY_INDEX_SAVE_EVERY = int(os.getenv("ENTITY_INDEX_SAVE_EVERY", "50"))
+
+    # Duplicate consolidation
+    DEDUPE_THRESHOLD = float(os.getenv("DEDUPE_THRESHOLD", "0.9"))
+    DEDUPE_BATCH_SIZE = int(os.getenv("DEDUPE_BATCH_SIZE", "50"))
+    DEDUPE_INTERVAL_SECONDS = float(os.getenv("DEDUPE_INTERVAL_SECONDS", "0"))
+    DEDUPE_LOG_PATH = os.getenv("DEDUPE_LOG_PATH", str(_CACHE_DIR / "merge_log.jsonl"))
+
     # Search
     MAX_SEARCH_RESULTS = 3
+    SEARCH_TIMEOUT = float(os.getenv("SEARCH_TIMEOUT", "60"))
+    # With compaction on, SEARCH_RAW_CHARS of each hit are ranked and SNIPPET_TOKEN_BUDGET tokens
+    # (~4 chars/token) kept per search call; with it off, hits keep the SEARCH_CONTENT_CHARS cap
+    SEARCH_RAW_CHARS = int(os.getenv("SEARCH_RAW_CHARS", "8000"))
+    SNIPPET_COMPACTION = os.getenv("SNIPPET_COMPACTION", "1") == "1"
+    SNIPPET_TOKEN_BUDGET = int(os.getenv("SNIPPET_TOKEN_BUDGET", "800"))
+    # Already-ingested sources in agent searches: "mark" (elide content), "filter" (drop) or "off"
+    SOURCE_DEDUP = os.getenv("SOURCE_DEDUP", "mark")
+    SOURCE_BLOOM_BITS = int(os.getenv("SOURCE_BLOOM_BITS", str(1 << 20)))
     
     # Neo4j - Priority: Cloud URI > Localhost Fallback
     NEO4J_URI = os.getenv("NEO4J_URI", f"bolt://localhost:{os.getenv('NEO4J_BOLT_PORT', 7687)}")
     NEO4J_USER = os.getenv("NEO4J_AUTH", "neo4j/password").split("/")[0]
     NEO4J_PASSWORD = os.getenv("NEO4J_AUTH", "neo4j/password").split("/")[1]
 
+    # Telemetry
+    SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "500"))
+    QUERY_PROFILE_SAMPLE_RATE = float(os.getenv("QUERY_PROFILE_SAMPLE_RATE", "0"))
+    DEBUG_ENDPOINTS = os.getenv("DEBUG_ENDPOINTS", "0") == "1"
+    OTEL_EXPORTER_OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
+    OTEL_SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "gotham-backend")
+
     # Keys
     TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
     GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
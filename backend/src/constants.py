@@ -1,2 +1,25 @@
 SAMPLE_DOC_LIMIT = 5
+SAMPLE_MAX_ENTITIES_PER_DOC = 25
+SAMPLE_MAX_EDGES_PER_ENTITY = 10
+SAMPLE_MAX_NODES = 250
+RECENT_DOCS_LIMIT = 15
+RECENT_DOCS_LIMIT_MAX = 200
 COMPETITOR_DISPLAY_CAP = 4
+LANDSCAPE_LIMIT = 10
+LANDSCAPE_LIMIT_MAX = 100
+PROFILE_RELATED_LIMIT = 50
+PROFILE_SOURCES_LIMIT = 50
+NEIGHBORHOOD_MAX_DEPTH = 3
+NEIGHBORHOOD_MAX_PER_HOP = 25
+NEIGHBORHOOD_MAX_NODES = 300
+MOOD_BATCH_MAX_COMPANIES = 200
+MCP_BATCH_MAX_UPDATES = 100
+MCP_BATCH_MAX_QUERIES = 20
+EXPORT_PAGE_SIZE = 1000
+EXPORT_PAGE_SIZE_MAX = 5000
+CHANGES_MAX_SEQS = 500
+CHANGES_KEEPALIVE_SECONDS = 15
+DEDUPE_MAX_BLOCK_SIZE = 200
+MIGRATION_BATCH_SIZE = 1000
+EDGE_SOURCE_URLS_MAX = 20
+SEARCH_CONTENT_CHARS = 2000
@@ -0,0 +1,70 @@
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from src.telemetry import metrics
+
+
+class DeadlineExceeded(TimeoutError):
+    """The request's time budget ran out; routes map it to 504 like any other timeout."""
+
+
+class Deadline:
+    """Absolute monotonic deadline for one request, checked at every stage boundary."""
+
+    def __init__(self, expires_at: float):
+        self.expires_at = expires_at
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self, stage: str) -> None:
+        if self.expired:
+            metrics.inc("gotham_deadline_exceeded_total", help="Work abandoned at a deadline check.", stage=stage)
+            raise DeadlineExceeded(f"deadline exceeded before {stage}")
+
+    def timeout(self, cap: float | None = None) -> float:
+        """Per-call timeout: what is left of the budget, optionally capped (never 0, which drivers read as "no timeout")."""
+        left = max(self.remaining(), 0.001)
+        return left if cap is None else min(cap, left)
+
+
+_current: contextvars.ContextVar[Deadline | None] = contextvars.ContextVar("gotham_deadline", default=None)
+
+
+def current_deadline() -> Deadline | None:
+    return _current.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Deadline | None) -> Iterator[Deadline | None]:
+    """Make `deadline` visible to search, graph and LLM calls in this context (threadpool-safe)."""
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def check_deadline(stage: str) -> None:
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.check(stage)
+
+
+def call_timeout(cap: float | None = None) -> float | None:
+    """Remaining budget for a single downstream call, or `cap` when no deadline is set."""
+    deadline = _current.get()
+    return cap if deadline is None else deadline.timeout(cap)
+
+
+__all__ = ["Deadline", "DeadlineExceeded", "call_timeout", "check_deadline", "current_deadline", "deadline_scope"]
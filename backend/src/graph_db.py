@@ -1,9 +1,96 @@
 import logging
-from neo4j import GraphDatabase, Driver
+import time
+from neo4j import GraphDatabase, Driver, Query
 from src.config import Config
+from src.deadline import call_timeout, check_deadline
+from src.query_profiler import ProfiledResult, query_profiler
+from src.relationships import SEMANTIC_TYPES
 
 logger = logging.getLogger(__name__)
 
+
+class _TracedRunner:
+    """
+    Wraps a session or transaction so every `run` goes through the query profiler:
+    timed until its records are drained, optionally PROFILEd, and slow-logged.
+    Each statement is also a deadline checkpoint for the current request.
+    """
+
+    # Auto-commit session.run accepts a Query with its own timeout; tx.run does not.
+    _per_query_timeout = False
+
+    def __init__(self, inner):
+        self._inner = inner
+        self._pending: ProfiledResult | None = None
+
+    def _drain_pending(self) -> None:
+        # The driver buffers an unread result when the next query runs; doing it here first
+        # records its timing (e.g. fire-and-forget MERGEs) while its records stay readable.
+        if self._pending is not None:
+            self._pending.buffer()
+            self._pending = None
+
+    def run(self, query, parameters=None, **kwargs):
+        self._drain_pending()
+        check_deadline("graph.query")
+        text = getattr(query, "text", query)
+        timeout = call_timeout() if self._per_query_timeout else None
+        if timeout is not None and not isinstance(query, Query):
+            query = Query(query, timeout=timeout)
+        if query_profiler.should_profile(text):
+            query = (
+                Query(f"PROFILE {query.text}", metadata=query.metadata, timeout=query.timeout)
+                if isinstance(query, Query)
+                else f"PROFILE {query}"
+            )
+        params = {**(parameters or {}), **kwargs}
+        started = time.perf_counter()
+        try:
+            result = self._inner.run(query, parameters, **kwargs)
+        except Exception:
+            query_profiler.record(text, (time.perf_counter() - started) * 1000, params, status="error")
+            raise
+        self._pending = ProfiledResult(result, query_profiler, text, params, started)
+        return self._pending
+
+    def __getattr__(self, name):
+        return getattr(self._inner, name)
+
+
+class TracedSession(_TracedRunner):
+    _per_query_timeout = True
+
+    def __enter__(self):
+        self._inner.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self._drain_pending()
+        return self._inner.__exit__(*exc)
+
+    @staticmethod
+    def _traced_work(fn):
+        def work(tx, *args, **kwargs):
+            runner = _TracedRunner(tx)
+            value = fn(runner, *args, **kwargs)
+            runner._drain_pending()
+            return value
+
+        # Read by the driver like @unit_of_work(timeout=...): the transaction gets what is
+        # left of the request's budget.
+        timeout = call_timeout()
+        if timeout is not None:
+            work.timeout = timeout
+        return work
+
+    def execute_write(self, fn, *args, **kwargs):
+        return self._inner.execute_write(self._traced_work(fn), *args, **kwargs)
+
+    def execute_read(self, fn, *args, **kwargs):
+        return self._inner.execute_read(self._traced_work(fn), *args, **kwargs)
+
+
 class GraphManager:
     _instance = None
     
@@ -43,6 +130,25 @@ class GraphManager:
             "CREATE CONSTRAINT topic_name_unique IF NOT EXISTS FOR (t:Topic) REQUIRE t.name IS UNIQUE",
             "CREATE FULLTEXT INDEX entity_name_index IF NOT EXISTS FOR (n:Person|Organization) ON EACH [n.name]",
             "CREATE FULLTEXT INDEX entity_name_index_loc_topic IF NOT EXISTS FOR (n:Location|Topic) ON EACH [n.name]",
+            "CREATE CONSTRAINT write_sequence_name_unique IF NOT EXISTS FOR (s:WriteSequence) REQUIRE s.name IS UNIQUE",
+            "CREATE INDEX document_write_seq IF NOT EXISTS FOR (d:Document) ON (d.write_seq)",
+            "CREATE INDEX tombstone_write_seq IF NOT EXISTS FOR (t:Tombstone) ON (t.write_seq)",
+            "CREATE RANGE INDEX document_created_at IF NOT EXISTS FOR (d:Document) ON (d.created_at)",
+            "CREATE INDEX document_content_hash IF NOT EXISTS FOR (d:Document) ON (d.content_hash)",
+            "CREATE INDEX person_write_seq IF NOT EXISTS FOR (p:Person) ON (p.write_seq)",
+            "CREATE INDEX org_write_seq IF NOT EXISTS FOR (o:Organization) ON (o.write_seq)",
+            "CREATE INDEX location_write_seq IF NOT EXISTS FOR (l:Location) ON (l.write_seq)",
+            "CREATE INDEX topic_write_seq IF NOT EXISTS FOR (t:Topic) ON (t.write_seq)",
+        ] + [
+            f"CREATE INDEX {rel_type.lower()}_write_seq IF NOT EXISTS FOR ()-[r:{rel_type}]-() ON (r.write_seq)"
+            for rel_type in SEMANTIC_TYPES
+        ] + [
+            # created_at-ordered export pages seek on these.
+            f"CREATE RANGE INDEX {label.lower()}_created_at IF NOT EXISTS FOR (n:{label}) ON (n.created_at)"
+            for label in ("Person", "Organization", "Location", "Topic")
+        ] + [
+            f"CREATE RANGE INDEX {rel_type.lower()}_created_at IF NOT EXISTS FOR ()-[r:{rel_type}]-() ON (r.created_at)"
+            for rel_type in (*SEMANTIC_TYPES, "MENTIONS")
         ]
         with self.driver.session() as session:
             for q in queries:
@@ -57,7 +163,7 @@ class GraphManager:
         except Exception as e:
             logger.warning(f"🔁 Reconnecting Neo4j driver due to: {e}")
             self._initialize(force=True)
-        return self.driver.session()
+        return TracedSession(self.driver.session())
 
 if __name__ == "__main__":
     GraphManager().setup_constraints()
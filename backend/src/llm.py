@@ -0,0 +1,30 @@
+from src.config import Config
+from src.llm_cache import get_llm_cache
+
+# langchain_google_genai (and google.genai under it) takes seconds to import, so it is only
+# loaded when the first chat model is built -- normally by the startup warm-up.
+_chat_model_cls = None
+
+
+def chat_model_class():
+    global _chat_model_cls
+    if _chat_model_cls is None:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        _chat_model_cls = ChatGoogleGenerativeAI
+    return _chat_model_cls
+
+
+def build_chat_model(temperature: float = 0):
+    """Gemini chat model with the repo-wide model, retry, timeout and response-cache settings."""
+    return chat_model_class()(
+        model=Config.MODEL_NAME,
+        temperature=temperature,
+        max_retries=Config.LLM_MAX_RETRIES,
+        timeout=Config.LLM_TIMEOUT,
+        convert_system_message_to_human=True,
+        cache=get_llm_cache(),
+    )
+
+
+__all__ = ["build_chat_model", "chat_model_class"]
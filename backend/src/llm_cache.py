@@ -0,0 +1,142 @@
+import contextvars
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Sequence
+
+from langchain_core._api import LangChainBetaWarning
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+
+from src.config import Config
+from src.telemetry import metrics
+
+logger = logging.getLogger("llm_cache")
+
+_bypass: contextvars.ContextVar[bool] = contextvars.ContextVar("gotham_llm_cache_bypass", default=False)
+
+
+@contextmanager
+def bypass_llm_cache(active: bool = True) -> Iterator[None]:
+    """Skip cache lookups in this context (fresh answers are still stored), e.g. for refresh=True missions."""
+    token = _bypass.set(active)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def llm_cache_bypassed() -> bool:
+    """Whether this context asked for fresh answers (see `bypass_llm_cache`)."""
+    return _bypass.get()
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    """
+    Hash of the serialized messages and LangChain's llm_string, which already carries the
+    model name, sampling params and any bound tool schemas.
+    """
+    return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache(BaseCache):
+    """
+    On-disk (SQLite) LangChain cache for chat model calls, with a TTL and LRU eviction.
+
+    Passed as `cache=` to the chat models, so a repeated turn with identical inputs is
+    answered from disk without an API call. Entries older than `ttl` seconds are ignored and
+    pruned; past `max_entries` the least recently used rows are evicted.
+    """
+
+    def __init__(self, path: str | Path, ttl: float, max_entries: int):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_last_used ON llm_cache (last_used)")
+        self._conn.commit()
+
+    def lookup(self, prompt: str, llm_string: str) -> Sequence[Any] | None:
+        if _bypass.get():
+            metrics.inc("gotham_llm_cache_total", help="LLM cache lookups by result.", result="bypass")
+            return None
+        key = cache_key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+            if row is None:
+                metrics.inc("gotham_llm_cache_total", help="LLM cache lookups by result.", result="miss")
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        metrics.inc("gotham_llm_cache_total", help="LLM cache lookups by result.", result="hit")
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", LangChainBetaWarning)
+                return loads(row[0])
+        except Exception as e:
+            logger.warning(f"Dropping unreadable cache entry: {e}")
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Any]) -> None:
+        key = cache_key(prompt, llm_string)
+        now = time.time()
+        value = dumps(list(return_val))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,))
+        self._conn.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            " SELECT key FROM llm_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    # Not __len__: LangChain tests `model.cache or ...`, and an empty cache must stay truthy.
+    def size(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM llm_cache").fetchone()[0]
+
+
+_cache: LLMResponseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache | None:
+    """Process-wide cache from Config, or None when LLM_CACHE is off."""
+    global _cache
+    if not Config.LLM_CACHE:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMResponseCache(Config.LLM_CACHE_PATH, Config.LLM_CACHE_TTL, Config.LLM_CACHE_MAX_ENTRIES)
+        return _cache
+
+
+__all__ = ["LLMResponseCache", "bypass_llm_cache", "cache_key", "get_llm_cache", "llm_cache_bypassed"]
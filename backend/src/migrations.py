@@ -0,0 +1,181 @@
+import argparse
+import logging
+from collections import defaultdict
+from typing import Callable
+
+from src.constants import EDGE_SOURCE_URLS_MAX, MIGRATION_BATCH_SIZE
+from src.graph_db import GraphManager
+from src.relationships import FALLBACK_TYPE, SEMANTIC_PATTERN, SYMMETRIC_TYPES, native_type, normalize_rel_type
+
+logger = logging.getLogger("migrations")
+
+_ENTITY_LABELS = ("Person", "Organization", "Location", "Topic")
+
+
+def _fold_related(var: str) -> str:
+    """
+    Copy RELATED edge `r` onto the merged native edge `var`. A native edge that already
+    existed keeps its own values; missing properties come from `r` and source_urls are unioned.
+    """
+    return f"""
+        WITH r, {var}, properties({var}) AS existing
+        SET {var} += properties(r)
+        SET {var} += existing
+        WITH r, {var}, reduce(urls = [], u IN coalesce(existing.source_urls, []) + coalesce(r.source_urls, []) |
+            CASE WHEN u IN urls THEN urls ELSE urls + u END)[-{EDGE_SOURCE_URLS_MAX}..] AS urls
+        SET {var}.source_urls = CASE WHEN size(urls) = 0 THEN null ELSE urls END
+        REMOVE {var}.type
+    """
+
+
+def _nativize_related(session, batch: int):
+    """Move RELATED {type} edges whose type is whitelisted onto native relationship types."""
+    raw_types = [rec["type"] for rec in session.run("MATCH ()-[r:RELATED]->() RETURN DISTINCT r.type AS type")]
+    by_native: dict[str, list[str]] = defaultdict(list)
+    for raw in raw_types:
+        rel_type = native_type(raw)
+        if rel_type != FALLBACK_TYPE:
+            by_native[rel_type].append(raw)
+    for rel_type, raws in sorted(by_native.items()):
+        arrow = "-" if rel_type in SYMMETRIC_TYPES else "->"
+        summary = session.run(
+            f"""
+            MATCH (s)-[r:RELATED]->(t) WHERE r.type IN $raws
+            CALL (s, r, t) {{
+                MERGE (s)-[n:{rel_type}]{arrow}(t)
+                {_fold_related("n")}
+                DELETE r
+            }} IN TRANSACTIONS OF $batch ROWS
+            """,
+            raws=raws,
+            batch=batch,
+        ).consume()
+        moved = summary.counters.relationships_deleted if summary is not None else "?"
+        logger.info(f"  RELATED {raws} -> :{rel_type} ({moved} edges)")
+    # Non-whitelisted types stay on RELATED but get the normalized spelling used at ingest.
+    session.run(
+        """
+        MATCH ()-[r:RELATED]->() WHERE r.type IS NOT NULL
+        CALL (r) { SET r.type = $normalize[r.type] } IN TRANSACTIONS OF $batch ROWS
+        """,
+        normalize={raw: normalize_rel_type(raw) for raw in raw_types if raw is not None},
+        batch=batch,
+    ).consume()
+
+
+def _backfill_created_at(session, batch: int):
+    """
+    Date entities and edges written before ingest stamped created_at, so created_at-ordered
+    exports (a range seek on created_at) include them: entities by their earliest mention,
+    edges by the later of their endpoints (an edge cannot predate either), else the epoch.
+    """
+    for label in _ENTITY_LABELS:
+        session.run(
+            f"""
+            MATCH (n:{label}) WHERE n.created_at IS NULL
+            CALL (n) {{
+                OPTIONAL MATCH (:Document)-[m:MENTIONS]->(n)
+                WITH n, min(m.created_at) AS first_seen
+                SET n.created_at = coalesce(first_seen, 0)
+            }} IN TRANSACTIONS OF $batch ROWS
+            """,
+            batch=batch,
+        ).consume()
+    return session.run(
+        f"""
+        MATCH (s)-[r:{SEMANTIC_PATTERN}|MENTIONS]->(t) WHERE r.created_at IS NULL
+        CALL (s, r, t) {{
+            WITH r, coalesce(s.created_at, 0) AS s_at, coalesce(t.created_at, 0) AS t_at
+            SET r.created_at = CASE WHEN s_at > t_at THEN s_at ELSE t_at END
+        }} IN TRANSACTIONS OF $batch ROWS
+        """,
+        batch=batch,
+    ).consume()
+
+
+# Each migration is an idempotent auto-commit statement (or a function of (session, batch));
+# `batch` sizes the inner transactions.
+MIGRATIONS: list[tuple[str, str | Callable]] = [
+    (
+        "0001_materialize_competes_with",
+        f"""
+        MATCH (s:Organization)-[r:RELATED {{type: 'COMPETES_WITH'}}]->(t:Organization)
+        CALL (s, r, t) {{
+            MERGE (s)-[c:COMPETES_WITH]-(t)
+            {_fold_related("c")}
+        }} IN TRANSACTIONS OF $batch ROWS
+        """,
+    ),
+    ("0002_native_relationship_types", _nativize_related),
+    (
+        "0003_edge_source_urls",
+        f"""
+        MATCH (s)-[r:{SEMANTIC_PATTERN}]->(t) WHERE r.source_urls IS NULL
+        CALL (s, r, t) {{
+            OPTIONAL MATCH (d:Document)-[:MENTIONS]->(s) WHERE (d)-[:MENTIONS]->(t)
+            WITH r, collect(d.url) AS urls
+            SET r.source_urls = urls[-{EDGE_SOURCE_URLS_MAX}..]
+        }} IN TRANSACTIONS OF $batch ROWS
+        """,
+    ),
+    (
+        # Documents written before created_at was set on every ingest fall off the timeline;
+        # date them by their earliest mention (or the epoch) so they sort last, not first.
+        "0004_document_created_at",
+        """
+        MATCH (d:Document) WHERE d.created_at IS NULL
+        CALL (d) {
+            OPTIONAL MATCH (d)-[m:MENTIONS]->()
+            WITH d, min(m.created_at) AS first_seen
+            SET d.created_at = coalesce(first_seen, 0)
+        } IN TRANSACTIONS OF $batch ROWS
+        """,
+    ),
+    ("0005_entity_edge_created_at", _backfill_created_at),
+]
+
+
+def applied_migrations(session) -> set[str]:
+    return {rec["name"] for rec in session.run("MATCH (m:Migration) RETURN m.name AS name")}
+
+
+def run_migrations(batch_size: int = MIGRATION_BATCH_SIZE, only: str | None = None) -> list[str]:
+    """Apply pending migrations in order; returns the names that ran."""
+    db = GraphManager()
+    ran = []
+    with db.session() as session:
+        done = applied_migrations(session)
+    for name, statement in MIGRATIONS:
+        if name in done or (only and name != only):
+            continue
+        logger.info(f"🛠️ Applying migration {name}")
+        with db.session() as session:
+            if callable(statement):
+                summary = statement(session, batch_size)
+            else:
+                summary = session.run(statement, batch=batch_size).consume()
+            session.run("MERGE (m:Migration {name: $name}) SET m.applied_at = timestamp()", name=name)
+        counters = summary.counters if summary is not None else None
+        if counters is not None:
+            logger.info(
+                f"✅ {name}: {counters.relationships_created} relationships created, "
+                f"{counters.relationships_deleted} deleted"
+            )
+        ran.append(name)
+    return ran
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Apply pending graph migrations.")
+    parser.add_argument("--batch", type=int, default=MIGRATION_BATCH_SIZE, help="Rows per inner transaction.")
+    parser.add_argument("--only", help="Apply a single migration by name.")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    ran = run_migrations(args.batch, args.only)
+    print(f"Applied {len(ran)} migration(s): {', '.join(ran) or 'none pending'}")
+
+
+__all__ = ["MIGRATIONS", "run_migrations"]
+
+if __name__ == "__main__":
+    main()
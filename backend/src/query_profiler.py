@@ -0,0 +1,218 @@
+import logging
+import random
+import re
+import threading
+import time
+from typing import Any
+
+from src.config import Config
+from src.telemetry import record_span
+
+logger = logging.getLogger("query_profiler")
+
+_SCAN_OPERATORS = ("AllNodesScan", "NodeByLabelScan", "DirectedAllRelationshipsScan", "UndirectedAllRelationshipsScan")
+_NOT_PROFILABLE = re.compile(r"^\s*(CREATE|DROP|SHOW)\s+(CONSTRAINT|INDEX|FULLTEXT|RANGE)|IN TRANSACTIONS|^\s*(PROFILE|EXPLAIN)\b", re.I)
+
+
+def normalize_shape(text: str) -> str:
+    """Collapse whitespace and inline literals so the same statement groups into one shape."""
+    shape = re.sub(r"\s+", " ", text).strip()
+    shape = re.sub(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"", "?", shape)
+    return re.sub(r"(?<![\w$])-?\d+(?:\.\d+)?\b", "?", shape)
+
+
+def _plan_stats(profile: dict | None) -> dict[str, Any] | None:
+    if not profile:
+        return None
+    db_hits = 0
+    operators: list[str] = []
+    stack = [profile]
+    while stack:
+        op = stack.pop()
+        db_hits += op.get("dbHits", 0) or 0
+        op_type = op.get("operatorType", "")
+        operators.append(op_type)
+        stack.extend(op.get("children", []) or [])
+    return {
+        "db_hits": db_hits,
+        "rows": profile.get("rows"),
+        "operators": operators,
+        "full_scan": any(o.startswith(_SCAN_OPERATORS) for o in operators),
+    }
+
+
+def _counters(summary) -> dict[str, int]:
+    counters = getattr(summary, "counters", None)
+    if counters is None:
+        return {}
+    names = ("nodes_created", "nodes_deleted", "relationships_created", "relationships_deleted",
+             "properties_set", "labels_added", "indexes_added", "constraints_added")
+    return {name: getattr(counters, name) for name in names if getattr(counters, name, 0)}
+
+
+def _short_params(params: dict | None, limit: int = 300) -> str:
+    text = repr(params or {})
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+class QueryProfiler:
+    """
+    Aggregates Cypher timings per query shape, writes a slow-query log and samples PROFILE plans.
+
+    Timings cover the full round trip (run + record streaming), measured when the result is
+    exhausted or consumed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict[str, Any]] = {}
+        self.slow_ms = Config.SLOW_QUERY_MS
+        self.sample_rate = Config.QUERY_PROFILE_SAMPLE_RATE
+        self._profile_budget = 0
+
+    def enable_profiling(self, rate: float = 1.0, count: int | None = None) -> None:
+        """Profile queries at `rate`; with `count`, stop after that many profiled queries."""
+        with self._lock:
+            self.sample_rate = max(0.0, min(1.0, rate))
+            self._profile_budget = count or 0
+
+    def should_profile(self, text: str) -> bool:
+        if self.sample_rate <= 0 or _NOT_PROFILABLE.search(text):
+            return False
+        with self._lock:
+            if random.random() >= self.sample_rate:
+                return False
+            if self._profile_budget:
+                self._profile_budget -= 1
+                if self._profile_budget == 0:
+                    self.sample_rate = 0.0
+            return True
+
+    def record(self, text: str, elapsed_ms: float, params: dict | None, summary=None, status: str = "ok") -> None:
+        shape = normalize_shape(text)
+        counters = _counters(summary)
+        plan = _plan_stats(getattr(summary, "profile", None))
+        server_ms = None
+        if summary is not None and getattr(summary, "result_available_after", None) is not None:
+            server_ms = (summary.result_available_after or 0) + (summary.result_consumed_after or 0)
+
+        with self._lock:
+            entry = self._stats.setdefault(
+                shape,
+                {"shape": shape, "count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0, "slow": 0, "plan": None},
+            )
+            entry["count"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            if status != "ok":
+                entry["errors"] += 1
+            if elapsed_ms >= self.slow_ms:
+                entry["slow"] += 1
+            if plan:
+                entry["plan"] = plan
+
+        record_span("neo4j.query", elapsed_ms / 1000, status, query=shape[:200])
+        if elapsed_ms >= self.slow_ms:
+            logger.warning(
+                f"🐢 Slow query {elapsed_ms:.0f}ms (server {server_ms}ms) counters={counters} "
+                f"plan={plan and {k: plan[k] for k in ('db_hits', 'rows', 'full_scan')}} "
+                f"params={_short_params(params)} :: {shape[:500]}"
+            )
+
+    def top(self, n: int = 20, sort: str = "max_ms") -> list[dict[str, Any]]:
+        with self._lock:
+            rows = [
+                {**entry, "mean_ms": round(entry["total_ms"] / entry["count"], 3) if entry["count"] else 0.0}
+                for entry in self._stats.values()
+            ]
+        rows.sort(key=lambda r: r.get(sort, 0) or 0, reverse=True)
+        for row in rows:
+            row["total_ms"] = round(row["total_ms"], 3)
+            row["max_ms"] = round(row["max_ms"], 3)
+        return rows[:n]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+class ProfiledResult:
+    """Proxy over a neo4j Result that reports timing and summary once the records are drained."""
+
+    def __init__(self, inner, profiler: QueryProfiler, text: str, params: dict | None, started: float):
+        self._inner = inner
+        self._profiler = profiler
+        self._text = text
+        self._params = params
+        self._started = started
+        self._done = False
+
+    def finish(self, status: str = "ok") -> None:
+        if self._done:
+            return
+        self._done = True
+        summary = None
+        if status == "ok":
+            try:
+                summary = self._inner.consume()
+            except Exception:
+                status = "error"
+        self._profiler.record(
+            self._text, (time.perf_counter() - self._started) * 1000, self._params, summary, status
+        )
+
+    def buffer(self) -> None:
+        """
+        Pull unread records into the driver's client-side buffer, where they stay readable, and
+        report the timing. No summary: `consume()` would discard those records.
+        """
+        if self._done:
+            return
+        buffer_all = getattr(self._inner, "_buffer_all", None)
+        try:
+            if buffer_all is not None:
+                buffer_all()
+        except Exception:
+            self.finish("error")
+            raise
+        self._done = True
+        self._profiler.record(self._text, (time.perf_counter() - self._started) * 1000, self._params)
+
+    def __iter__(self):
+        try:
+            for record in self._inner:
+                yield record
+        except Exception:
+            self.finish("error")
+            raise
+        self.finish()
+
+    def single(self, *args, **kwargs):
+        try:
+            return self._inner.single(*args, **kwargs)
+        finally:
+            self.finish()
+
+    def data(self, *args, **kwargs):
+        try:
+            return self._inner.data(*args, **kwargs)
+        finally:
+            self.finish()
+
+    def consume(self):
+        summary = self._inner.consume()
+        if not self._done:
+            self._done = True
+            self._profiler.record(
+                self._text, (time.perf_counter() - self._started) * 1000, self._params, summary
+            )
+        return summary
+
+    def __getattr__(self, name):
+        return getattr(self._inner, name)
+
+
+query_profiler = QueryProfiler()
+
+
+__all__ = ["ProfiledResult", "QueryProfiler", "normalize_shape", "query_profiler"]
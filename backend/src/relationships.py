@@ -0,0 +1,98 @@
+import re
+
+# Relationship types written as native Neo4j types. Anything else is stored as the
+# generic fallback `RELATED {type: ...}` so no information is lost.
+RELATIONSHIP_TYPES = (
+    "WORKS_FOR",
+    "CEO_OF",
+    "FOUNDED",
+    "BOARD_MEMBER_OF",
+    "ADVISES",
+    "OWNS",
+    "ACQUIRED",
+    "INVESTED_IN",
+    "SUBSIDIARY_OF",
+    "PARTNERS_WITH",
+    "COMPETES_WITH",
+    "SUPPLIES",
+    "CUSTOMER_OF",
+    "PRODUCES",
+    "LOCATED_IN",
+    "HEADQUARTERED_IN",
+    "OPERATES_IN",
+    "MEMBER_OF",
+    "RELATED_TO",
+)
+FALLBACK_TYPE = "RELATED"
+SEMANTIC_TYPES = RELATIONSHIP_TYPES + (FALLBACK_TYPE,)
+# Every entity-to-entity relationship; MENTIONS (document provenance) is excluded.
+SEMANTIC_PATTERN = "|".join(SEMANTIC_TYPES)
+# Written and matched without direction so A->B and B->A collapse into one edge.
+SYMMETRIC_TYPES = frozenset({"COMPETES_WITH", "PARTNERS_WITH"})
+
+_ALIASES = {
+    "EMPLOYED_BY": "WORKS_FOR",
+    "WORKS_AT": "WORKS_FOR",
+    "EMPLOYEE_OF": "WORKS_FOR",
+    "CEO": "CEO_OF",
+    "LEADS": "CEO_OF",
+    "FOUNDER_OF": "FOUNDED",
+    "CO_FOUNDED": "FOUNDED",
+    "COFOUNDED": "FOUNDED",
+    "OWNER_OF": "OWNS",
+    "ACQUIRES": "ACQUIRED",
+    "INVESTOR_IN": "INVESTED_IN",
+    "INVESTS_IN": "INVESTED_IN",
+    "PARENT_OF": "OWNS",
+    "PARTNER_OF": "PARTNERS_WITH",
+    "PARTNERED_WITH": "PARTNERS_WITH",
+    "COMPETITOR_OF": "COMPETES_WITH",
+    "COMPETES": "COMPETES_WITH",
+    "RIVAL_OF": "COMPETES_WITH",
+    "SUPPLIER_OF": "SUPPLIES",
+    "HQ_IN": "HEADQUARTERED_IN",
+    "BASED_IN": "HEADQUARTERED_IN",
+    "MEMBER": "MEMBER_OF",
+    "RELATED": "RELATED_TO",
+}
+
+
+def normalize_rel_type(raw: str | None) -> str:
+    """Upper snake case with common synonyms folded onto the whitelist (e.g. 'rival of' -> COMPETES_WITH)."""
+    cleaned = re.sub(r"[^A-Z0-9]+", "_", (raw or "").upper()).strip("_")
+    if not cleaned:
+        return "RELATED_TO"
+    return _ALIASES.get(cleaned, cleaned)
+
+
+def native_type(raw: str | None) -> str:
+    """Relationship type to write: the whitelisted type, or FALLBACK_TYPE."""
+    rel_type = normalize_rel_type(raw)
+    return rel_type if rel_type in RELATIONSHIP_TYPES else FALLBACK_TYPE
+
+
+def type_filter(types: list[str] | None) -> tuple[str, list[str] | None]:
+    """
+    Relationship pattern and fallback filter for reading the given semantic types.
+
+    Whitelisted types become part of the pattern (a typed expansion); other values can only
+    live on the fallback edge, so they are matched via `r.type IN $fallback_types`.
+    """
+    if not types:
+        return SEMANTIC_PATTERN, None
+    native = sorted({native_type(t) for t in types} - {FALLBACK_TYPE})
+    fallback = sorted({normalize_rel_type(t) for t in types if native_type(t) == FALLBACK_TYPE})
+    pattern = "|".join(native + ([FALLBACK_TYPE] if fallback else []))
+    return pattern, fallback or None
+
+
+__all__ = [
+    "FALLBACK_TYPE",
+    "RELATIONSHIP_TYPES",
+    "SEMANTIC_PATTERN",
+    "SEMANTIC_TYPES",
+    "SYMMETRIC_TYPES",
+    "native_type",
+    "normalize_rel_type",
+    "type_filter",
+]
@@ -1,18 +1,29 @@
 import asyncio
+import json
 import logging
+import math
 import uuid
-from fastapi import APIRouter, HTTPException
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+from src.admission import AdmissionRejected, admission
 from src.agent import run_agent
 from src.config import Config
+from src.constants import MOOD_BATCH_MAX_COMPANIES
+from src.deadline import Deadline, deadline_scope
+from src.services.extraction import Mode
 from src.services.insight import (
     build_profile_prompt,
     run_company_insight,
     run_competitor_flow,
+    run_mission,
 )
-from src.services.mood import get_company_mood
+from src.services.mood import get_company_mood, stream_company_moods
 
 logger = logging.getLogger("agents")
 router = APIRouter()
@@ -23,6 +34,40 @@ def _require_company(company: str | None) -> str:
     return company
 
 
+def _client_id(request: Request) -> str:
+    return request.headers.get("x-client-id") or (request.client.host if request.client else "anonymous")
+
+
+@asynccontextmanager
+async def _admitted(request: Request, weight: int = 1) -> AsyncIterator[Deadline]:
+    deadline = Deadline.after(Config.RUN_MISSION_TIMEOUT)
+    try:
+        ticket = await admission.acquire(_client_id(request), timeout=deadline.remaining(), weight=weight)
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=429, detail=e.reason, headers={"Retry-After": str(e.retry_after)})
+    except asyncio.TimeoutError:
+        retry_after = max(1, math.ceil(admission.predicted_wait()))
+        raise HTTPException(
+            status_code=429, detail="timed out waiting for a mission slot", headers={"Retry-After": str(retry_after)}
+        )
+    try:
+        yield deadline
+    finally:
+        admission.release(ticket)
+
+
+async def admit_mission(request: Request) -> AsyncIterator[Deadline]:
+    """
+    Admit a mission or shed it with 429 + Retry-After, then yield its deadline.
+
+    The deadline is the request budget shared by every stage, starting at arrival so queue
+    time counts against it. Worker threads check it between agent steps, searches and Cypher
+    statements, so work behind a 504 stops instead of running on in the threadpool.
+    """
+    async with _admitted(request) as deadline:
+        yield deadline
+
+
 class MissionRequest(BaseModel):
     task: str
     thread_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -31,6 +76,14 @@ class MissionRequest(BaseModel):
 class CompanyRequest(BaseModel):
     company: str
     thread_id: str | None = None
+    # "extract": searches up front + one structured-output call instead of the tool loop.
+    mode: Mode = Field(default_factory=lambda: Config.MISSION_MODE)
+
+
+class InsightRequest(CompanyRequest):
+    include_mood: bool = False
+    refresh: bool = False
+    timeframe: str | None = "90d"
 
 
 class MoodRequest(BaseModel):
@@ -38,14 +91,27 @@ class MoodRequest(BaseModel):
     timeframe: str | None = "90d"
 
 
+class MoodBatchRequest(BaseModel):
+    companies: list[str]
+    timeframe: str | None = "90d"
+
+
+async def admit_mood_batch(req: MoodBatchRequest, request: Request) -> AsyncIterator[Deadline]:
+    """Admit a mood batch holding one slot per LLM call it can run at once; the slots are kept until the stream ends."""
+    calls = math.ceil(len(req.companies) / max(1, Config.MOOD_BATCH_MAX_PER_CALL))
+    async with _admitted(request, weight=min(calls, Config.MOOD_BATCH_LLM_CONCURRENCY)) as deadline:
+        yield deadline
+
+
 @router.post("/run-mission")
-async def run_mission(req: MissionRequest):
+async def run_mission(req: MissionRequest, deadline: Deadline = Depends(admit_mission)):
     logger.info(f"Task: {req.task} | Thread: {req.thread_id}")
     try:
-        content = await asyncio.wait_for(
-            run_in_threadpool(run_agent, req.task, req.thread_id),
-            timeout=Config.RUN_MISSION_TIMEOUT,
-        )
+        with deadline_scope(deadline):
+            content = await asyncio.wait_for(
+                run_in_threadpool(run_agent, req.task, req.thread_id),
+                timeout=deadline.timeout(),
+            )
         return {"result": content, "thread_id": req.thread_id, "status": "success"}
     except asyncio.TimeoutError:
         raise HTTPException(status_code=504, detail="Mission timed out")
@@ -55,15 +121,13 @@ async def run_mission(req: MissionRequest):
 
 
 @router.post("/agents/profile-company")
-async def profile_company(req: CompanyRequest):
+async def profile_company(req: CompanyRequest, deadline: Deadline = Depends(admit_mission)):
     company = _require_company(req.company)
     task = build_profile_prompt(company)
 
     try:
-        content = await asyncio.wait_for(
-            run_in_threadpool(run_agent, task, req.thread_id or str(uuid.uuid4())),
-            timeout=Config.RUN_MISSION_TIMEOUT,
-        )
+        with deadline_scope(deadline):
+            content = await run_mission(task, company, "profile", req.thread_id or str(uuid.uuid4()), req.mode)
         return {"result": content, "status": "success"}
     except asyncio.TimeoutError:
         raise HTTPException(status_code=504, detail="Profiler timed out")
@@ -73,11 +137,12 @@ async def profile_company(req: CompanyRequest):
 
 
 @router.post("/agents/competitors")
-async def competitor_scout(req: CompanyRequest):
+async def competitor_scout(req: CompanyRequest, deadline: Deadline = Depends(admit_mission)):
     company = _require_company(req.company)
 
     try:
-        result, competitors = await run_competitor_flow(company, req.thread_id)
+        with deadline_scope(deadline):
+            result, competitors = await run_competitor_flow(company, req.thread_id, req.mode)
         return {"result": result, "status": "success", "competitors": competitors}
     except asyncio.TimeoutError:
         raise HTTPException(status_code=504, detail="Competitor scout timed out")
@@ -87,14 +152,20 @@ async def competitor_scout(req: CompanyRequest):
 
 
 @router.post("/agents/company-insight")
-async def company_insight(req: CompanyRequest):
+async def company_insight(req: InsightRequest, deadline: Deadline = Depends(admit_mission)):
     """
     One-shot company insight: profile + competitors, then return current graph view.
+
+    Sub-tasks already answered by the graph (or a recent mood result) are skipped unless
+    `refresh` is set; the response's `plan` lists what ran.
     """
     company = _require_company(req.company)
 
     try:
-        data = await run_company_insight(company, req.thread_id)
+        with deadline_scope(deadline):
+            data = await run_company_insight(
+                company, req.thread_id, req.include_mood, req.refresh, req.timeframe or "90d", req.mode
+            )
         return {"status": "success", **data}
     except asyncio.TimeoutError:
         raise HTTPException(status_code=504, detail="Company insight timed out")
@@ -104,18 +175,42 @@ async def company_insight(req: CompanyRequest):
 
 
 @router.post("/agents/company-mood")
-async def company_mood(req: MoodRequest):
+async def company_mood(req: MoodRequest, deadline: Deadline = Depends(admit_mission)):
     company = _require_company(req.company)
     timeframe = req.timeframe or "90d"
 
     try:
-        data = await asyncio.wait_for(
-            run_in_threadpool(get_company_mood, company, timeframe),
-            timeout=Config.RUN_MISSION_TIMEOUT,
-        )
+        with deadline_scope(deadline):
+            data = await asyncio.wait_for(
+                run_in_threadpool(get_company_mood, company, timeframe),
+                timeout=deadline.timeout(),
+            )
         return {"status": "success", **data}
     except asyncio.TimeoutError:
         raise HTTPException(status_code=504, detail="Company mood timed out")
     except Exception as e:
         logger.error(f"Company mood error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/agents/company-mood/batch")
+async def company_mood_batch(req: MoodBatchRequest, deadline: Deadline = Depends(admit_mood_batch)):
+    """
+    Stream one NDJSON line per company as each mood result completes. Companies not scored
+    before the deadline get a `timeout` line.
+    """
+    companies = list(dict.fromkeys(c.strip() for c in req.companies if c and c.strip()))
+    if not companies:
+        raise HTTPException(status_code=400, detail="companies is required")
+    if len(companies) > MOOD_BATCH_MAX_COMPANIES:
+        raise HTTPException(
+            status_code=400, detail=f"at most {MOOD_BATCH_MAX_COMPANIES} companies per batch"
+        )
+    timeframe = req.timeframe or "90d"
+
+    async def lines():
+        with deadline_scope(deadline):
+            async for item in stream_company_moods(companies, timeframe):
+                yield json.dumps({"status": "success", **item}) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
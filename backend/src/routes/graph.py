@@ -1,11 +1,39 @@
 import asyncio
+import json
 import logging
-from fastapi import APIRouter, HTTPException
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Query, Request
 from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
 from src.graph_db import GraphManager
-from src.constants import SAMPLE_DOC_LIMIT
-from src.services.graph_queries import fetch_competitors, fetch_entity_profile
+from src.serialization import FastJSONResponse, compact_graph
+from src.constants import (
+    CHANGES_KEEPALIVE_SECONDS,
+    EXPORT_PAGE_SIZE,
+    EXPORT_PAGE_SIZE_MAX,
+    LANDSCAPE_LIMIT,
+    LANDSCAPE_LIMIT_MAX,
+    NEIGHBORHOOD_MAX_DEPTH,
+    NEIGHBORHOOD_MAX_PER_HOP,
+    RECENT_DOCS_LIMIT,
+    RECENT_DOCS_LIMIT_MAX,
+    SAMPLE_DOC_LIMIT,
+)
+from src.services.changes import change_feed, read_write_seq
+from src.services.graph_queries import (
+    EXPORT_LABELS,
+    EXPORT_REL_TYPES,
+    fetch_competitors,
+    fetch_entity_profile,
+    fetch_graph_sample,
+    fetch_neighborhood,
+    fetch_recent_documents,
+    iter_graph_export,
+    parse_export_cursor,
+    parse_timeline_cursor,
+)
 
 logger = logging.getLogger("graph")
 router = APIRouter()
@@ -18,42 +46,25 @@ def _require_param(value: str | None, label: str) -> str:
 
 
 @router.get("/graph/sample")
-async def graph_sample(doc_limit: int = SAMPLE_DOC_LIMIT):
-    db = GraphManager()
+async def graph_sample(
+    doc_limit: int = SAMPLE_DOC_LIMIT,
+    format: Literal["full", "compact"] = "full",
+    props: bool | None = None,
+):
+    """
+    Recent documents and their neighborhood. `format=compact` returns columnar node/edge arrays
+    with interned labels and types; property maps are included by default only in `full`.
+    """
+    include_props = format == "full" if props is None else props
 
     def query():
-        cypher = """
-        MATCH (d:Document)
-        WITH d ORDER BY coalesce(d.created_at, 0) DESC LIMIT $doc_limit
-        OPTIONAL MATCH (d)-[:MENTIONS]->(e)
-        OPTIONAL MATCH (e)-[r:RELATED]->(t)
-        WITH collect(distinct d) AS docs, collect(distinct e) AS ent_nodes, collect(distinct t) AS target_nodes, collect(distinct r) AS rels
-        WITH docs, ent_nodes, target_nodes, rels
-        UNWIND ent_nodes + target_nodes AS n
-        WITH docs, rels, collect(distinct n) AS uniq_nodes
-        WITH docs,
-             [n IN uniq_nodes | {id: elementId(n), labels: labels(n), name: coalesce(n.name, n.url), props: properties(n)}] AS nodes,
-             [r IN rels WHERE r IS NOT NULL | {id: elementId(r), type: type(r), source: elementId(startNode(r)), target: elementId(endNode(r)), props: properties(r)}] AS edges
-        RETURN nodes,
-               edges,
-               size(nodes) AS node_count,
-               size(edges) AS edge_count,
-               [d IN docs | {id: elementId(d), url: d.url, created_at: d.created_at}] AS documents
-        """
-        with db.session() as session:
-            record = session.run(cypher, {"doc_limit": doc_limit}).single()
-            if not record:
-                return {"nodes": [], "edges": [], "node_count": 0, "edge_count": 0, "documents": []}
-            return {
-                "nodes": record["nodes"],
-                "edges": record["edges"],
-                "node_count": record["node_count"],
-                "edge_count": record["edge_count"],
-                "documents": record["documents"],
-            }
+        # Read the sequence first so clients can follow up with /graph/changes?since=<seq>.
+        seq = read_write_seq()
+        sample = {**fetch_graph_sample(doc_limit, include_props=include_props), "seq": seq}
+        return compact_graph(sample, include_props) if format == "compact" else sample
 
     try:
-        return await asyncio.wait_for(run_in_threadpool(query), timeout=10)
+        return FastJSONResponse(await asyncio.wait_for(run_in_threadpool(query), timeout=10))
     except asyncio.TimeoutError:
         raise HTTPException(status_code=504, detail="Graph sample timed out")
     except Exception as e:
@@ -75,6 +86,29 @@ async def get_competitors(company: str):
         raise HTTPException(status_code=500, detail="Competitors query failed")
 
 
+@router.get("/graph/landscape")
+async def competitive_landscape(company: str, limit: int = LANDSCAPE_LIMIT):
+    """Competitors, competitor-of-competitor clusters and degree/PageRank rankings from the in-memory projection."""
+    company = _require_param(company, "company")
+    if not 1 <= limit <= LANDSCAPE_LIMIT_MAX:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {LANDSCAPE_LIMIT_MAX}")
+    # Imported on first use (or by the warm-up) so numpy stays off the app import path.
+    from src.services.landscape import org_projection
+
+    try:
+        data = await asyncio.wait_for(run_in_threadpool(org_projection.landscape, company, limit), timeout=8)
+        if data is None:
+            raise HTTPException(status_code=404, detail="Company not found")
+        return data
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Landscape timed out")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Landscape error: {e}")
+        raise HTTPException(status_code=500, detail="Landscape failed")
+
+
 @router.get("/graph/stats")
 async def graph_stats():
     db = GraphManager()
@@ -112,22 +146,25 @@ async def graph_stats():
 
 
 @router.get("/graph/recent-docs")
-async def recent_docs(limit: int = 15):
-    db = GraphManager()
-
-    def query():
-        cypher = """
-        MATCH (d:Document)
-        RETURN d.url AS url, d.created_at AS created_at
-        ORDER BY coalesce(d.created_at,0) DESC
-        LIMIT $limit
-        """
-        with db.session() as session:
-            return [{"url": rec["url"], "created_at": rec["created_at"]} for rec in session.run(cypher, {"limit": limit})]
+async def recent_docs(
+    limit: int = RECENT_DOCS_LIMIT,
+    before: str | None = None,
+    since: int | None = None,
+    until: int | None = None,
+):
+    """Document timeline, newest first; pass the returned `next_before` as `before` for the next page."""
+    if not 1 <= limit <= RECENT_DOCS_LIMIT_MAX:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {RECENT_DOCS_LIMIT_MAX}")
+    if before:
+        try:
+            parse_timeline_cursor(before)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="invalid before cursor")
 
     try:
-        docs = await asyncio.wait_for(run_in_threadpool(query), timeout=8)
-        return {"documents": docs}
+        return await asyncio.wait_for(
+            run_in_threadpool(fetch_recent_documents, limit, before, since, until), timeout=8
+        )
     except asyncio.TimeoutError:
         raise HTTPException(status_code=504, detail="Recent docs timed out")
     except Exception as e:
@@ -151,3 +188,128 @@ async def entity_profile(name: str):
     except Exception as e:
         logger.error(f"Entity profile error: {e}")
         raise HTTPException(status_code=500, detail="Entity profile failed")
+
+
+@router.get("/graph/neighborhood")
+async def entity_neighborhood(
+    name: str,
+    depth: int = 1,
+    max_per_hop: int = 10,
+    types: list[str] | None = Query(None),
+):
+    name = _require_param(name, "name")
+    if not 1 <= depth <= NEIGHBORHOOD_MAX_DEPTH:
+        raise HTTPException(status_code=400, detail=f"depth must be between 1 and {NEIGHBORHOOD_MAX_DEPTH}")
+    if not 1 <= max_per_hop <= NEIGHBORHOOD_MAX_PER_HOP:
+        raise HTTPException(
+            status_code=400, detail=f"max_per_hop must be between 1 and {NEIGHBORHOOD_MAX_PER_HOP}"
+        )
+
+    try:
+        data = await asyncio.wait_for(
+            run_in_threadpool(fetch_neighborhood, name, depth, max_per_hop, types),
+            timeout=8,
+        )
+        if data is None:
+            raise HTTPException(status_code=404, detail="Entity not found")
+        return FastJSONResponse(data)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Neighborhood query timed out")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Neighborhood query error: {e}")
+        raise HTTPException(status_code=500, detail="Neighborhood query failed")
+
+
+@router.get("/graph/export")
+def graph_export(
+    section: Literal["all", "nodes", "edges"] = "all",
+    order: Literal["id", "created_at"] = "id",
+    after: str | None = None,
+    labels: list[str] | None = Query(None),
+    since: int | None = None,
+    until: int | None = None,
+    page_size: int = EXPORT_PAGE_SIZE,
+):
+    """Stream the graph as NDJSON (nodes, then edges) with keyset pagination."""
+    if labels:
+        unknown = sorted(set(labels) - set(EXPORT_LABELS))
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"unknown labels: {', '.join(unknown)}")
+    if after:
+        try:
+            group, _, _, _ = parse_export_cursor(order, after, section)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="invalid cursor for order")
+        if group not in EXPORT_LABELS and group not in EXPORT_REL_TYPES:
+            raise HTTPException(status_code=400, detail="invalid cursor for order")
+    page_size = max(1, min(page_size, EXPORT_PAGE_SIZE_MAX))
+
+    def lines():
+        try:
+            for item in iter_graph_export(section, order, after, labels, since, until, page_size):
+                yield json.dumps(item) + "\n"
+        except Exception as e:
+            logger.error(f"Graph export error: {e}")
+            yield json.dumps({"type": "error", "detail": "Graph export failed"}) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get("/graph/changes")
+async def graph_changes(since: int = 0):
+    """Nodes/edges/documents written after write sequence `since`; follow up with the returned seq."""
+    if since < 0:
+        raise HTTPException(status_code=400, detail="since must be >= 0")
+
+    try:
+        return await asyncio.wait_for(run_in_threadpool(change_feed.changes, since), timeout=8)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Graph changes timed out")
+    except Exception as e:
+        logger.error(f"Graph changes error: {e}")
+        raise HTTPException(status_code=500, detail="Graph changes failed")
+
+
+def _sse(event: str, data: dict, event_id: int | None = None) -> str:
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.get("/graph/changes/stream")
+async def graph_changes_stream(request: Request, since: int | None = None):
+    """Server-sent events variant of /graph/changes; resumes from Last-Event-ID."""
+    cursor = since
+    last_event_id = request.headers.get("last-event-id")
+    if cursor is None and last_event_id and last_event_id.isdigit():
+        cursor = int(last_event_id)
+    if cursor is None:
+        try:
+            cursor = await run_in_threadpool(change_feed.current_seq)
+        except Exception as e:
+            logger.error(f"Graph changes stream error: {e}")
+            raise HTTPException(status_code=500, detail="Graph changes failed")
+
+    async def events():
+        nonlocal cursor
+        yield _sse("ready", {"seq": cursor}, cursor)
+        while not await request.is_disconnected():
+            latest = await change_feed.wait_for(cursor, timeout=CHANGES_KEEPALIVE_SECONDS)
+            if latest == cursor:
+                yield ": keepalive\n\n"
+                continue
+            try:
+                delta = await run_in_threadpool(change_feed.changes, cursor)
+            except Exception as e:
+                logger.error(f"Graph changes stream error: {e}")
+                yield _sse("error", {"detail": "Graph changes failed"})
+                return
+            cursor = delta["seq"]
+            yield _sse("reset" if delta["reset"] else "changes", delta, cursor)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
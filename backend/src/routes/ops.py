@@ -0,0 +1,54 @@
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from src.config import Config
+from src.query_profiler import query_profiler
+from src.startup import warmup_state
+from src.telemetry import metrics
+
+router = APIRouter()
+
+
+def _require_debug() -> None:
+    if not Config.DEBUG_ENDPOINTS:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Latency histograms and counters in Prometheus text exposition format."""
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@router.get("/ready")
+def readiness():
+    """503 until the startup warm-up has built the graph driver, agent and LLM clients."""
+    return JSONResponse(warmup_state.view(), status_code=200 if warmup_state.ready else 503)
+
+
+@router.get("/debug/queries")
+def slowest_queries(top: int = 20, sort: Literal["max_ms", "mean_ms", "total_ms", "count", "slow"] = "max_ms"):
+    """Top-N Cypher query shapes with timings and the last sampled PROFILE summary."""
+    _require_debug()
+    return {
+        "slow_query_ms": query_profiler.slow_ms,
+        "profile_sample_rate": query_profiler.sample_rate,
+        "queries": query_profiler.top(max(1, min(top, 200)), sort),
+    }
+
+
+@router.post("/debug/queries/profile")
+def sample_profiles(rate: float = 1.0, count: int | None = 50):
+    """PROFILE the next `count` queries (sampled at `rate`); rate=0 turns sampling off."""
+    _require_debug()
+    query_profiler.enable_profiling(rate, count)
+    return {"profile_sample_rate": query_profiler.sample_rate, "count": count}
+
+
+@router.delete("/debug/queries")
+def reset_queries():
+    _require_debug()
+    query_profiler.reset()
+    return {"status": "reset"}
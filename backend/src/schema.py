@@ -2,6 +2,8 @@ from typing import Literal, List
 
 from pydantic import BaseModel, Field
 
+from src.relationships import RELATIONSHIP_TYPES
+
 class Entity(BaseModel):
     name: str = Field(..., description="The unique name of the entity.")
     label: Literal["Person", "Organization", "Location", "Topic"] = Field(..., description="The type of entity.")
@@ -10,7 +12,13 @@ class Entity(BaseModel):
 class Relationship(BaseModel):
     source: str = Field(..., description="Name of the source entity.")
     target: str = Field(..., description="Name of the target entity.")
-    type: str = Field(..., description="The relationship type (e.g., WORKS_FOR, LOCATED_IN).")
+    type: str = Field(
+        ...,
+        description=(
+            "The relationship type, preferably one of: " + ", ".join(RELATIONSHIP_TYPES)
+            + ". Other values are stored as a generic RELATED edge."
+        ),
+    )
     properties: dict = Field(default_factory=dict, description="Edge attributes.")
 
 class KnowledgeGraphUpdate(BaseModel):
@@ -18,3 +26,7 @@ class KnowledgeGraphUpdate(BaseModel):
     source_url: str = Field(..., description="The URL where this information was found.")
     entities: List[Entity] = Field(default_factory=list)
     relationships: List[Relationship] = Field(default_factory=list)
+
+class ExtractedKnowledge(BaseModel):
+    """Structured-output envelope: one update per source document."""
+    updates: List[KnowledgeGraphUpdate] = Field(default_factory=list)
@@ -0,0 +1,96 @@
+import logging
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger("serialization")
+
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    """Values orjson cannot encode natively: Neo4j temporal/spatial types, sets, anything else as str."""
+    if hasattr(value, "iso_format"):
+        return value.iso_format()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson. The app's default response class; routes with large
+    payloads return it directly so FastAPI's jsonable_encoder pass is skipped as well.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class CompressionMiddleware:
+    """GZip bodies of at least `minimum_size` bytes, except on progressive streams (`exclude_paths`)."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int, compresslevel: int, exclude_paths: tuple[str, ...] = ()):
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+        else:
+            await self.gzip(scope, receive, send)
+
+
+def compact_graph(sample: dict[str, Any], include_props: bool = False) -> dict[str, Any]:
+    """
+    Columnar form of a {nodes, edges} graph payload.
+
+    Nodes and edges become parallel arrays; label sets and relationship types are interned
+    into lookup tables and referenced by index, and edge endpoints are node positions rather
+    than repeated elementId strings. Property maps are only included with `include_props`.
+    """
+    label_sets: dict[tuple[str, ...], int] = {}
+    types: dict[str, int] = {}
+    position: dict[str, int] = {}
+    nodes: dict[str, list] = {"id": [], "name": [], "labels": []}
+    for node in sample.get("nodes", []):
+        position[node["id"]] = len(nodes["id"])
+        nodes["id"].append(node["id"])
+        nodes["name"].append(node.get("name"))
+        nodes["labels"].append(label_sets.setdefault(tuple(node.get("labels") or ()), len(label_sets)))
+    edges: dict[str, list] = {"id": [], "source": [], "target": [], "type": []}
+    for edge in sample.get("edges", []):
+        if edge["source"] not in position or edge["target"] not in position:
+            continue
+        edges["id"].append(edge["id"])
+        edges["source"].append(position[edge["source"]])
+        edges["target"].append(position[edge["target"]])
+        edges["type"].append(types.setdefault(edge.get("type") or "", len(types)))
+    if include_props:
+        nodes["props"] = [node.get("props") or {} for node in sample.get("nodes", [])]
+        edges["props"] = [
+            edge.get("props") or {}
+            for edge in sample.get("edges", [])
+            if edge["source"] in position and edge["target"] in position
+        ]
+
+    rest = {k: v for k, v in sample.items() if k not in ("nodes", "edges")}
+    return {
+        **rest,
+        "format": "compact",
+        "label_sets": [list(labels) for labels in label_sets],
+        "types": list(types),
+        "nodes": nodes,
+        "edges": edges,
+    }
+
+
+__all__ = ["CompressionMiddleware", "FastJSONResponse", "compact_graph", "dumps"]
@@ -1,30 +1,78 @@
+import argparse
+import asyncio
 import logging
 
 from mcp.server.fastmcp import FastMCP
 
+from src.config import Config
+from src.constants import MCP_BATCH_MAX_QUERIES, MCP_BATCH_MAX_UPDATES
 from src.schema import KnowledgeGraphUpdate
-from src.tools.graph import insert_knowledge
+from src.tools.graph import insert_knowledge, insert_knowledge_batch
 from src.tools.search import perform_search
 logging.basicConfig(level=logging.INFO)
-mcp = FastMCP("Gotham Knowledge Graph")
+mcp = FastMCP("Gotham Knowledge Graph", host=Config.MCP_HOST, port=Config.MCP_PORT)
 
-@mcp.tool()
-def add_knowledge(data: KnowledgeGraphUpdate) -> str:
-    """Ingests extracted knowledge into the Neo4j Graph."""
-    return insert_knowledge(data)
+# Graph writes and Tavily calls are blocking; tools hand them to worker threads
+# (asyncio.to_thread keeps contextvars) so one slow call never stalls the other clients.
+_search_slots = asyncio.Semaphore(Config.MCP_SEARCH_CONCURRENCY)
 
-@mcp.tool()
-def search_web(query: str) -> str:
-    """Searches the web for information using Tavily."""
-    results = perform_search(query)
-    
+
+def _format_results(query: str, results: list[dict]) -> str:
     formatted_output = f"--- Search Results for '{query}' ---\n"
     for r in results:
         formatted_output += f"Source: {r['title']} ({r['url']})\n"
         formatted_output += f"Content: {r['content']}\n"
         formatted_output += "-" * 20 + "\n"
-        
     return formatted_output
 
+
+async def _search(query: str) -> str:
+    async with _search_slots:
+        results = await asyncio.to_thread(perform_search, query)
+    return _format_results(query, results)
+
+
+@mcp.tool()
+async def add_knowledge(data: KnowledgeGraphUpdate) -> str:
+    """Ingests extracted knowledge into the Neo4j Graph."""
+    return await asyncio.to_thread(insert_knowledge, data)
+
+
+@mcp.tool()
+async def add_knowledge_batch(updates: list[KnowledgeGraphUpdate]) -> str:
+    """Ingests several knowledge updates in one transaction (all or nothing)."""
+    if len(updates) > MCP_BATCH_MAX_UPDATES:
+        raise ValueError(f"at most {MCP_BATCH_MAX_UPDATES} updates per batch")
+    return await asyncio.to_thread(insert_knowledge_batch, updates)
+
+
+@mcp.tool()
+async def search_web(query: str) -> str:
+    """Searches the web for information using Tavily."""
+    return await _search(query)
+
+
+@mcp.tool()
+async def search_web_many(queries: list[str]) -> str:
+    """Runs several Tavily searches concurrently; results come back in query order."""
+    if len(queries) > MCP_BATCH_MAX_QUERIES:
+        raise ValueError(f"at most {MCP_BATCH_MAX_QUERIES} queries per call")
+    return "".join(await asyncio.gather(*(_search(q) for q in queries)))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the Gotham MCP server.")
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "sse", "streamable-http"],
+        default=Config.MCP_TRANSPORT,
+        help="streamable-http serves many clients from one process at http://MCP_HOST:MCP_PORT/mcp.",
+    )
+    args = parser.parse_args(argv)
+    mcp.run(transport=args.transport)
+
+
+__all__ = ["add_knowledge", "add_knowledge_batch", "main", "mcp", "search_web", "search_web_many"]
+
 if __name__ == "__main__":
-    mcp.run()
+    main()
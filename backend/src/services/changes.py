@@ -0,0 +1,242 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from src.config import Config
+from src.constants import CHANGES_MAX_SEQS
+from src.graph_db import GraphManager
+from src.relationships import SEMANTIC_TYPES
+from src.schema import KnowledgeGraphUpdate
+from src.telemetry import metrics
+from src.tools.graph import add_commit_listener
+
+logger = logging.getLogger("graph_changes")
+
+_ENTITY_LABELS = ("Person", "Organization", "Location", "Topic")
+
+# One indexed range scan per label / relationship type instead of a full scan.
+_NODE_CHANGES = "\nUNION\n".join(
+    f"MATCH (n:{label}) WHERE n.write_seq > $since AND n.write_seq <= $upto RETURN n" for label in _ENTITY_LABELS
+)
+_EDGE_CHANGES = "\nUNION\n".join(
+    f"MATCH (a)-[r:{rel_type}]->(b) WHERE r.write_seq > $since AND r.write_seq <= $upto RETURN a, r, b"
+    for rel_type in SEMANTIC_TYPES
+)
+
+
+def read_write_seq() -> int:
+    """Current value of the graph write sequence (0 for an empty graph)."""
+    db = GraphManager()
+    with db.session() as session:
+        rec = session.run("MATCH (s:WriteSequence {name: 'graph'}) RETURN s.value AS seq").single()
+        return rec["seq"] if rec and rec["seq"] is not None else 0
+
+
+def fetch_changes(since: int, upto: int) -> dict[str, Any]:
+    """
+    Nodes, entity relationships and documents stamped with since < write_seq <= upto, plus
+    tombstones for nodes and edges deleted in that range (e.g. by duplicate merges).
+    """
+    db = GraphManager()
+    with db.session() as session:
+        nodes = [
+            {
+                "id": rec["id"],
+                "labels": rec["labels"],
+                "name": rec["name"],
+                "props": rec["props"],
+                "seq": rec["seq"],
+            }
+            for rec in session.run(
+                f"""
+                CALL () {{
+                {_NODE_CHANGES}
+                }}
+                RETURN elementId(n) AS id, labels(n) AS labels, n.name AS name,
+                       properties(n) AS props, n.write_seq AS seq
+                ORDER BY seq
+                """,
+                since=since,
+                upto=upto,
+            )
+        ]
+        edges = [
+            {
+                "id": rec["id"],
+                "type": rec["type"],
+                "source": rec["source"],
+                "target": rec["target"],
+                "props": rec["props"],
+                "seq": rec["seq"],
+            }
+            for rec in session.run(
+                f"""
+                CALL () {{
+                {_EDGE_CHANGES}
+                }}
+                RETURN elementId(r) AS id, coalesce(r.type, type(r)) AS type, elementId(a) AS source,
+                       elementId(b) AS target, properties(r) AS props, r.write_seq AS seq
+                ORDER BY seq
+                """,
+                since=since,
+                upto=upto,
+            )
+        ]
+        documents = [
+            {"id": rec["id"], "url": rec["url"], "created_at": rec["created_at"], "seq": rec["seq"]}
+            for rec in session.run(
+                """
+                MATCH (d:Document)
+                WHERE d.write_seq > $since AND d.write_seq <= $upto
+                RETURN elementId(d) AS id, d.url AS url, d.created_at AS created_at, d.write_seq AS seq
+                ORDER BY seq
+                """,
+                since=since,
+                upto=upto,
+            )
+        ]
+        deleted = [
+            {"id": rec["id"], "kind": rec["kind"], "seq": rec["seq"]}
+            for rec in session.run(
+                """
+                MATCH (t:Tombstone)
+                WHERE t.write_seq > $since AND t.write_seq <= $upto
+                RETURN t.id AS id, t.kind AS kind, t.write_seq AS seq
+                ORDER BY seq
+                """,
+                since=since,
+                upto=upto,
+            )
+        ]
+    return {"nodes": nodes, "edges": edges, "documents": documents, "deleted": deleted}
+
+
+def _no_changes() -> dict[str, Any]:
+    return {"nodes": [], "edges": [], "documents": [], "deleted": []}
+
+
+class ChangeFeed:
+    """
+    Shared change feed for all readers.
+
+    A single poller (plus in-process commit notifications) tracks the write sequence, and
+    deltas are cached by (since, upto), so readers parked at the same position cost one
+    query between them. Load therefore follows the write rate, not the reader count.
+    """
+
+    def __init__(self, cache_size: int = 32):
+        self._seq: int | None = None
+        self._seq_read_at = 0.0
+        self._seq_lock = threading.Lock()
+        self._deltas: OrderedDict[tuple[int, int], dict[str, Any]] = OrderedDict()
+        self._deltas_lock = threading.Lock()
+        self._cache_size = cache_size
+        self._cond: asyncio.Condition | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._poller: asyncio.Task | None = None
+        self._subscribers = 0
+
+    def current_seq(self, max_age: float | None = None) -> int:
+        """Return the latest known sequence, re-reading it at most once per max_age seconds."""
+        max_age = Config.CHANGES_POLL_INTERVAL if max_age is None else max_age
+        with self._seq_lock:
+            if self._seq is not None and time.monotonic() - self._seq_read_at < max_age:
+                return self._seq
+            started = time.monotonic()
+        seq = read_write_seq()
+        with self._seq_lock:
+            if self._seq is None or seq >= self._seq:
+                self._seq = seq
+            elif self._seq_read_at < started:
+                # The database reports a lower value than we last saw and no local commit
+                # landed while reading it: the graph was reset. Let readers see the reset.
+                logger.warning(f"Write sequence went backwards ({self._seq} -> {seq}); clients will reload")
+                self._seq = seq
+                with self._deltas_lock:
+                    self._deltas.clear()
+            self._seq_read_at = time.monotonic()
+            return self._seq
+
+    def changes(self, since: int) -> dict[str, Any]:
+        current = self.current_seq()
+        if since > current:
+            # Sequence went backwards (e.g. database reset): client must reload a snapshot.
+            return {"since": since, "seq": current, "has_more": False, "reset": True, **_no_changes()}
+
+        upto = min(current, since + CHANGES_MAX_SEQS)
+        key = (since, upto)
+        with self._deltas_lock:
+            cached = self._deltas.get(key)
+            if cached is not None:
+                self._deltas.move_to_end(key)
+        metrics.inc("gotham_cache_requests_total", cache="graph_changes", result="hit" if cached is not None else "miss")
+        if cached is None:
+            cached = fetch_changes(since, upto) if upto > since else _no_changes()
+            with self._deltas_lock:
+                self._deltas[key] = cached
+                while len(self._deltas) > self._cache_size:
+                    self._deltas.popitem(last=False)
+
+        return {"since": since, "seq": upto, "has_more": upto < current, "reset": False, **cached}
+
+    def publish(self, seq: int, _data: KnowledgeGraphUpdate | None = None, _names: dict | None = None) -> None:
+        """Commit listener: record the new sequence and wake waiting stream readers."""
+        with self._seq_lock:
+            if self._seq is None or seq > self._seq:
+                self._seq = seq
+                self._seq_read_at = time.monotonic()
+        if self._loop and self._cond:
+            self._loop.call_soon_threadsafe(lambda: asyncio.ensure_future(self._notify()))
+
+    async def _notify(self) -> None:
+        if self._cond:
+            async with self._cond:
+                self._cond.notify_all()
+
+    async def _poll(self) -> None:
+        # Picks up writes from other processes (e.g. the MCP server) with one query per interval.
+        last = None
+        while True:
+            try:
+                seq = await asyncio.to_thread(self.current_seq, 0)
+                if seq != last:
+                    last = seq
+                    await self._notify()
+            except Exception as e:
+                logger.warning(f"Change feed poll failed: {e}")
+            await asyncio.sleep(Config.CHANGES_POLL_INTERVAL)
+
+    async def wait_for(self, since: int, timeout: float) -> int:
+        """Wait until the sequence moves past `since` (or timeout); return the latest sequence."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._cond = asyncio.Condition()
+            self._poller = None
+        self._subscribers += 1
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.ensure_future(self._poll())
+        try:
+            async with self._cond:
+                await asyncio.wait_for(
+                    self._cond.wait_for(lambda: (self._seq or 0) != since),
+                    timeout=timeout,
+                )
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._subscribers -= 1
+            if self._subscribers == 0 and self._poller is not None:
+                self._poller.cancel()
+                self._poller = None
+        return self._seq or 0
+
+
+change_feed = ChangeFeed()
+add_commit_listener(change_feed.publish)
+
+
+__all__ = ["ChangeFeed", "change_feed", "fetch_changes", "read_write_seq"]
@@ -0,0 +1,396 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.config import Config
+from src.constants import DEDUPE_MAX_BLOCK_SIZE
+from src.graph_db import GraphManager
+from src.relationships import FALLBACK_TYPE, SEMANTIC_PATTERN, SEMANTIC_TYPES, SYMMETRIC_TYPES
+from src.services.changes import change_feed
+from src.services.entity_index import HashingEmbedder, get_entity_index
+from src.services.graph_queries import _canonical_company_name
+from src.services.landscape import org_projection
+from src.tools.graph import _next_write_seq, _normalize_name
+
+logger = logging.getLogger("dedupe")
+
+_ENTITY_LABELS = ("Person", "Organization", "Location", "Topic")
+
+_SNAPSHOT = f"""
+UNWIND $pairs AS p
+MATCH (keep) WHERE elementId(keep) = p.keep
+MATCH (dup) WHERE elementId(dup) = p.dup
+RETURN p.dup AS dup_id, p.score AS score, keep.name AS keep_name, labels(dup) AS labels, properties(dup) AS props,
+       COLLECT {{
+         MATCH (dup)-[r:{SEMANTIC_PATTERN}]->(t)
+         RETURN {{dir: 'out', rel: type(r), props: properties(r), other: t.name, other_label: head(labels(t)),
+                 existed: t = keep OR EXISTS {{
+                   MATCH (keep)-[x]-(t)
+                   WHERE type(x) = type(r) AND coalesce(x.type, '') = coalesce(r.type, '')
+                     AND (startNode(x) = keep OR type(r) IN $symmetric)
+                 }}}}
+       }} + COLLECT {{
+         MATCH (dup)<-[r:{SEMANTIC_PATTERN}]-(s) WHERE s <> dup
+         RETURN {{dir: 'in', rel: type(r), props: properties(r), other: s.name, other_label: head(labels(s)),
+                 existed: s = keep OR EXISTS {{
+                   MATCH (s)-[x]-(keep)
+                   WHERE type(x) = type(r) AND coalesce(x.type, '') = coalesce(r.type, '')
+                     AND (endNode(x) = keep OR type(r) IN $symmetric)
+                 }}}}
+       }} AS edges,
+       COLLECT {{
+         MATCH (d:Document)-[m:MENTIONS]->(dup)
+         RETURN {{url: d.url, props: properties(m), existed: EXISTS {{ (d)-[:MENTIONS]->(keep) }}}}
+       }} AS mentions
+"""
+
+
+def _move_edges_query() -> str:
+    # Relationship types cannot be parameterized, so each semantic type gets its own subqueries.
+    blocks = []
+    for i, rel_type in enumerate(SEMANTIC_TYPES):
+        key = " {type: r.type}" if rel_type == FALLBACK_TYPE else ""
+        arrow = "-" if rel_type in SYMMETRIC_TYPES else "->"
+        blocks.append(f"""
+CALL (keep, dup) {{
+  MATCH (dup)-[r:{rel_type}]->(t) WHERE t <> keep
+  MERGE (keep)-[nr:{rel_type}{key}]{arrow}(t)
+  ON CREATE SET nr += properties(r)
+  SET nr.write_seq = $seq
+  RETURN count(*) AS out_{i}
+}}
+CALL (keep, dup) {{
+  MATCH (dup)<-[r:{rel_type}]-(s) WHERE s <> keep AND s <> dup
+  MERGE (s)-[nr:{rel_type}{key}]{arrow}(keep)
+  ON CREATE SET nr += properties(r)
+  SET nr.write_seq = $seq
+  RETURN count(*) AS in_{i}
+}}""")
+    return f"""
+UNWIND $pairs AS p
+MATCH (keep) WHERE elementId(keep) = p.keep
+MATCH (dup) WHERE elementId(dup) = p.dup
+{"".join(blocks)}
+CALL (keep, dup) {{
+  MATCH (d:Document)-[m:MENTIONS]->(dup)
+  MERGE (d)-[nm:MENTIONS]->(keep)
+  ON CREATE SET nm += properties(m)
+  RETURN count(*) AS moved_mentions
+}}
+SET keep.aliases = [a IN coalesce(keep.aliases, []) WHERE a <> dup.name] + dup.name,
+    keep.write_seq = $seq
+CREATE (:Tombstone {{id: elementId(dup), kind: 'node', write_seq: $seq}})
+DETACH DELETE dup
+RETURN count(*) AS merged
+"""
+
+
+_MERGE = _move_edges_query()
+
+
+def _blocking_keys(name: str, label: str) -> set[str]:
+    norm = _normalize_name(name)
+    keys = {f"n:{norm}", f"p:{norm[:4]}"} if norm else set()
+    if label == "Organization":
+        canonical = _normalize_name(_canonical_company_name(name))
+        if canonical:
+            keys.add(f"n:{canonical}")
+    return keys
+
+
+def _load_entities(session, label: str, page_size: int = 5000) -> list[dict[str, Any]]:
+    # Keyset pages on the unique (constraint-indexed) name.
+    rows: list[dict[str, Any]] = []
+    after = ""
+    while True:
+        page = session.run(
+            f"""
+            MATCH (n:{label}) WHERE n.name > $after
+            WITH n ORDER BY n.name LIMIT $limit
+            RETURN elementId(n) AS id, n.name AS name, n.created_at AS created_at, COUNT {{ (n)--() }} AS degree
+            """,
+            after=after,
+            limit=page_size,
+        ).data()
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        after = page[-1]["name"]
+
+
+def candidate_pairs(entities: list[dict[str, Any]], label: str) -> np.ndarray:
+    """Index pairs (i, j), i < j, sharing a blocking key; oversized blocks are skipped."""
+    blocks: dict[str, list[int]] = defaultdict(list)
+    for i, entity in enumerate(entities):
+        for key in _blocking_keys(entity["name"], label):
+            blocks[key].append(i)
+    pairs: set[tuple[int, int]] = set()
+    for key, members in blocks.items():
+        if len(members) < 2:
+            continue
+        if len(members) > DEDUPE_MAX_BLOCK_SIZE:
+            logger.info(f"Skipping oversized block {key!r} ({len(members)} members)")
+            continue
+        for a in range(len(members)):
+            for b in range(a + 1, len(members)):
+                pairs.add((members[a], members[b]))
+    return np.array(sorted(pairs), dtype=np.int64).reshape(-1, 2)
+
+
+def score_pairs(entities: list[dict[str, Any]], pairs: np.ndarray, label: str, embedder=None) -> np.ndarray:
+    """Cosine of hashed n-gram vectors per pair; identical normalized/canonical keys score 1.0."""
+    if not len(pairs):
+        return np.zeros(0, dtype=np.float32)
+    embedder = embedder or HashingEmbedder()
+    names = [e["name"] for e in entities]
+    if label == "Organization":
+        names = [_canonical_company_name(n) for n in names]
+    vecs = embedder.embed(names)
+    scores = np.einsum("ij,ij->i", vecs[pairs[:, 0]], vecs[pairs[:, 1]])
+    keys = np.array([_normalize_name(n) for n in names], dtype=object)
+    scores[keys[pairs[:, 0]] == keys[pairs[:, 1]]] = 1.0
+    return scores
+
+
+def _plan_merges(entities: list[dict[str, Any]], pairs: np.ndarray, scores: np.ndarray, threshold: float) -> list[dict]:
+    """Union-find over confirmed pairs; each cluster keeps its best-connected, oldest node."""
+    parent = list(range(len(entities)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    best: dict[int, float] = {}
+    for (a, b), score in zip(pairs[scores >= threshold].tolist(), scores[scores >= threshold].tolist()):
+        parent[find(a)] = find(b)
+        best[a] = max(best.get(a, 0.0), score)
+        best[b] = max(best.get(b, 0.0), score)
+
+    clusters: dict[int, list[int]] = defaultdict(list)
+    for i in best:
+        clusters[find(i)].append(i)
+
+    merges = []
+    for members in clusters.values():
+        members.sort(key=lambda i: (-entities[i]["degree"], entities[i]["created_at"] or 0, len(entities[i]["name"])))
+        keep = members[0]
+        for dup in members[1:]:
+            merges.append({"keep": entities[keep]["id"], "dup": entities[dup]["id"], "score": round(best[dup], 4),
+                           "keep_name": entities[keep]["name"], "dup_name": entities[dup]["name"]})
+    return merges
+
+
+def _merge_batch(tx, pairs: list[dict], log_path: Path, log_offset: int) -> tuple[int, list[dict]]:
+    params = [{"keep": p["keep"], "dup": p["dup"], "score": p["score"]} for p in pairs]
+    snapshot = tx.run(_SNAPSHOT, pairs=params, symmetric=list(SYMMETRIC_TYPES)).data()
+    seq = _next_write_seq(tx)
+    tx.run(_MERGE, pairs=params, seq=seq).consume()
+    # Logged before the commit, so a crash cannot leave merges without an undo entry. A retried
+    # attempt rewrites the entries from the same offset; entries whose merge never committed
+    # are skipped by undo (the duplicate still exists).
+    _append_log(log_path, snapshot, seq, log_offset)
+    return seq, snapshot
+
+
+def _log_size(path: Path) -> int:
+    return path.stat().st_size if path.exists() else 0
+
+
+def _append_log(path: Path, snapshot: list[dict], seq: int, offset: int | None = None) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    merged_at = int(time.time() * 1000)
+    with path.open("a", encoding="utf-8") as fh:
+        if offset is not None:
+            fh.truncate(offset)
+        for row in snapshot:
+            fh.write(json.dumps({"merged_at": merged_at, "write_seq": seq, **row}, default=str) + "\n")
+        fh.flush()
+        os.fsync(fh.fileno())
+
+
+def run_dedupe(
+    threshold: float | None = None,
+    dry_run: bool = False,
+    labels: tuple[str, ...] = _ENTITY_LABELS,
+    log_path: str | Path | None = None,
+) -> dict[str, Any]:
+    """Find and merge duplicate entities; returns counts and throughput."""
+    threshold = Config.DEDUPE_THRESHOLD if threshold is None else threshold
+    log_path = Path(log_path or Config.DEDUPE_LOG_PATH)
+    db = GraphManager()
+    embedder = HashingEmbedder()
+    report = {"entities": 0, "pairs_scored": 0, "merged": 0, "planned": [], "dry_run": dry_run}
+    score_time = 0.0
+    started = time.perf_counter()
+
+    for label in labels:
+        with db.session() as session:
+            entities = _load_entities(session, label)
+        report["entities"] += len(entities)
+
+        t0 = time.perf_counter()
+        pairs = candidate_pairs(entities, label)
+        scores = score_pairs(entities, pairs, label, embedder)
+        merges = _plan_merges(entities, pairs, scores, threshold)
+        score_time += time.perf_counter() - t0
+        report["pairs_scored"] += len(pairs)
+
+        if dry_run:
+            report["planned"].extend({**m, "label": label} for m in merges)
+            continue
+
+        for start in range(0, len(merges), Config.DEDUPE_BATCH_SIZE):
+            batch = merges[start:start + Config.DEDUPE_BATCH_SIZE]
+            with db.session() as session:
+                seq, snapshot = session.execute_write(_merge_batch, batch, log_path, _log_size(log_path))
+            report["merged"] += len(snapshot)
+            change_feed.publish(seq)
+            if label == "Organization":
+                org_projection.mark_stale()
+            if Config.SEMANTIC_RESOLUTION:
+                get_entity_index().add_many([(m["dup_name"], m["keep_name"], label, "") for m in batch])
+            for m in batch:
+                logger.info(f"🔗 Merged {label} '{m['dup_name']}' -> '{m['keep_name']}' ({m['score']:.2f})")
+
+    elapsed = time.perf_counter() - started
+    report["elapsed_s"] = round(elapsed, 3)
+    report["pairs_per_sec"] = round(report["pairs_scored"] / score_time, 1) if score_time > 0 else 0.0
+    logger.info(
+        f"Dedupe: {report['entities']} entities, {report['pairs_scored']} pairs "
+        f"({report['pairs_per_sec']}/s), {report['merged']} merged in {elapsed:.2f}s"
+    )
+    return report
+
+
+def _undo_one(tx, entry: dict) -> int | None:
+    """
+    Restore one merged node with its edges and mentions, stamped with a new write sequence
+    (edges re-pointed at the kept node are removed with tombstones). Returns the sequence, or
+    None when the logged merge never committed.
+    """
+    label = entry["labels"][0] if entry["labels"] and entry["labels"][0] in _ENTITY_LABELS else None
+    if label is None:
+        raise ValueError(f"Cannot restore node with labels {entry['labels']}")
+    if tx.run(f"MATCH (n:{label} {{name: $dup}}) RETURN count(n) AS n", dup=entry["props"]["name"]).single()["n"]:
+        return None
+    seq = _next_write_seq(tx)
+    tx.run(f"CREATE (n:{label}) SET n = $props, n.write_seq = $seq", props=entry["props"], seq=seq)
+    tx.run(
+        f"""
+        MATCH (k:{label} {{name: $keep}})
+        SET k.aliases = [a IN coalesce(k.aliases, []) WHERE a <> $dup], k.write_seq = $seq
+        """,
+        keep=entry["keep_name"],
+        dup=entry["props"]["name"],
+        seq=seq,
+    )
+    for edge in entry["edges"]:
+        rel = edge.get("rel", FALLBACK_TYPE)
+        if rel not in SEMANTIC_TYPES:
+            raise ValueError(f"Cannot restore relationship type {rel!r}")
+        other_label = edge["other_label"] if edge["other_label"] in _ENTITY_LABELS else label
+        pattern = f"(n)-[r:{rel}]->(o)" if edge["dir"] == "out" else f"(o)-[r:{rel}]->(n)"
+        moved = f"(k)-[x:{rel}]->(o)" if edge["dir"] == "out" else f"(o)-[x:{rel}]->(k)"
+        tx.run(
+            f"""
+            MATCH (n:{label} {{name: $dup}}), (o:{other_label} {{name: $other}}), (k:{label} {{name: $keep}})
+            CREATE {pattern} SET r = $props, r.write_seq = $seq
+            WITH k, o
+            OPTIONAL MATCH {moved}
+            WITH x WHERE x IS NOT NULL AND coalesce(x.type, '') = coalesce($type, '') AND NOT $existed
+            CREATE (:Tombstone {{id: elementId(x), kind: 'edge', write_seq: $seq}})
+            DELETE x
+            """,
+            dup=entry["props"]["name"],
+            other=edge["other"],
+            keep=entry["keep_name"],
+            type=edge["props"].get("type"),
+            props=edge["props"],
+            existed=edge["existed"],
+            seq=seq,
+        )
+    for mention in entry["mentions"]:
+        tx.run(
+            f"""
+            MATCH (d:Document {{url: $url}}), (n:{label} {{name: $dup}}), (k:{label} {{name: $keep}})
+            CREATE (d)-[m:MENTIONS]->(n) SET m = $props
+            WITH d, k
+            OPTIONAL MATCH (d)-[x:MENTIONS]->(k)
+            WITH x WHERE x IS NOT NULL AND NOT $existed
+            CREATE (:Tombstone {{id: elementId(x), kind: 'edge', write_seq: $seq}})
+            DELETE x
+            """,
+            url=mention["url"],
+            dup=entry["props"]["name"],
+            keep=entry["keep_name"],
+            props=mention["props"],
+            existed=mention["existed"],
+            seq=seq,
+        )
+    return seq
+
+
+def undo_merges(count: int = 1, log_path: str | Path | None = None) -> int:
+    """Reverse the last `count` merges from the log (newest first) and trim them from it."""
+    log_path = Path(log_path or Config.DEDUPE_LOG_PATH)
+    if not log_path.exists():
+        return 0
+    lines = log_path.read_text(encoding="utf-8").splitlines()
+    undone = 0
+    db = GraphManager()
+    while lines and undone < count:
+        entry = json.loads(lines[-1])
+        with db.session() as session:
+            seq = session.execute_write(_undo_one, entry)
+        lines.pop()
+        if seq is None:
+            logger.info(f"Skipping logged merge of '{entry['props']['name']}' that never committed")
+        else:
+            change_feed.publish(seq)
+            org_projection.mark_stale()
+            logger.info(f"↩️ Restored '{entry['props']['name']}' from '{entry['keep_name']}'")
+            undone += 1
+        log_path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+    return undone
+
+
+async def dedupe_loop(interval: float) -> None:
+    """Periodic consolidation for the API process (enabled with DEDUPE_INTERVAL_SECONDS)."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(run_dedupe)
+        except Exception as e:
+            logger.warning(f"Scheduled dedupe failed: {e}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Merge duplicate entities in the knowledge graph.")
+    parser.add_argument("--threshold", type=float, default=None)
+    parser.add_argument("--dry-run", action="store_true", help="Report planned merges without writing.")
+    parser.add_argument("--label", action="append", choices=_ENTITY_LABELS, help="Restrict to a label (repeatable).")
+    parser.add_argument("--undo", type=int, metavar="N", help="Reverse the last N logged merges.")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    if args.undo:
+        print(f"Restored {undo_merges(args.undo)} merge(s).")
+        return
+    report = run_dedupe(args.threshold, args.dry_run, tuple(args.label or _ENTITY_LABELS))
+    print(json.dumps(report, indent=2, default=str))
+
+
+__all__ = ["candidate_pairs", "dedupe_loop", "run_dedupe", "score_pairs", "undo_merges"]
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from src.config import Config
+from src.graph_db import GraphManager
+
+logger = logging.getLogger("entity_index")
+
+_ENTITY_LABELS = ("Person", "Organization", "Location", "Topic")
+_CONTEXT_SKIP = {"name", "created_at", "write_seq"}
+
+
+def context_text(props: dict | None) -> str:
+    """Flatten descriptive entity properties (industry, role, country, ...) into one string."""
+    if not props:
+        return ""
+    parts = []
+    for key in sorted(props):
+        if key in _CONTEXT_SKIP:
+            continue
+        value = props[key]
+        if isinstance(value, list):
+            value = " ".join(str(v) for v in value)
+        if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+            parts.append(f"{key} {value}")
+    return " ".join(parts)
+
+
+class HashingEmbedder:
+    """
+    Dependency-free fallback: signed feature hashing of word tokens and character trigrams.
+
+    Catches spelling, punctuation and suffix variants; real aliases ("Meta" vs "Facebook")
+    need a semantic model via ENTITY_EMBEDDING_MODEL.
+    """
+
+    name = "hashing"
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def _features(self, text: str) -> list[str]:
+        norm = re.sub(r"[^a-z0-9 ]+", " ", text.lower())
+        words = norm.split()
+        joined = f" {' '.join(words)} "
+        return words + [joined[i:i + 3] for i in range(len(joined) - 2)]
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feat in self._features(text):
+                digest = int.from_bytes(hashlib.blake2b(feat.encode(), digest_size=8).digest(), "little")
+                out[row, digest % self.dim] += 1.0 if (digest >> 63) & 1 else -1.0
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return out / np.where(norms == 0, 1.0, norms)
+
+
+class SentenceTransformerEmbedder:
+    """Local CPU sentence-embedding model (requires the optional `sentence-transformers` package)."""
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+
+        self.name = model_name
+        self._model = SentenceTransformer(model_name, device="cpu")
+        self.dim = self._model.get_sentence_embedding_dimension()
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        vecs = self._model.encode(texts, batch_size=64, normalize_embeddings=True, show_progress_bar=False)
+        return np.asarray(vecs, dtype=np.float32)
+
+
+def load_embedder():
+    model = Config.ENTITY_EMBEDDING_MODEL
+    if model and model != "hashing":
+        try:
+            return SentenceTransformerEmbedder(model)
+        except Exception as e:
+            logger.warning(f"Embedding model '{model}' unavailable ({e}); falling back to hashing embedder.")
+    return HashingEmbedder()
+
+
+class _LabelIndex:
+    """Growable row-major matrices of name and context vectors for one label."""
+
+    def __init__(self, dim: int, capacity: int = 256):
+        self.keys: list[str] = []
+        self.canonical: list[str] = []
+        self.name_vecs = np.zeros((capacity, dim), dtype=np.float32)
+        self.ctx_vecs = np.zeros((capacity, dim), dtype=np.float32)
+        self.has_ctx = np.zeros(capacity, dtype=bool)
+        self.positions: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _grow(self) -> None:
+        cap = self.name_vecs.shape[0] * 2
+        for attr in ("name_vecs", "ctx_vecs"):
+            old = getattr(self, attr)
+            new = np.zeros((cap, old.shape[1]), dtype=np.float32)
+            new[: len(self)] = old[: len(self)]
+            setattr(self, attr, new)
+        has_ctx = np.zeros(cap, dtype=bool)
+        has_ctx[: len(self)] = self.has_ctx[: len(self)]
+        self.has_ctx = has_ctx
+
+    def upsert(self, key: str, canonical: str, name_vec: np.ndarray, ctx_vec: np.ndarray | None) -> None:
+        pos = self.positions.get(key.lower())
+        if pos is None:
+            if len(self) == self.name_vecs.shape[0]:
+                self._grow()
+            pos = len(self)
+            self.keys.append(key)
+            self.canonical.append(canonical)
+            self.positions[key.lower()] = pos
+        else:
+            self.canonical[pos] = canonical
+        self.name_vecs[pos] = name_vec
+        if ctx_vec is not None:
+            self.ctx_vecs[pos] = ctx_vec
+            self.has_ctx[pos] = True
+
+
+class EntityIndex:
+    """
+    In-process nearest-neighbor index over entity names (and optional context), per label.
+
+    Entries map a surface form to the canonical node name, so aliases learned during ingest
+    resolve directly. Scoring is one vectorized matrix-vector product per query; the index
+    is persisted to disk as .npz + JSON and updated after each committed ingest. Loading (or
+    bootstrapping from the graph) runs at startup or in a background thread; rows added while
+    it runs are buffered and applied once it finishes, or kept for the next attempt if it fails.
+    """
+
+    def __init__(self, embedder=None, path: str | Path | None = None, context_weight: float = 0.3):
+        self.embedder = embedder or load_embedder()
+        self.path = Path(path or Config.ENTITY_INDEX_PATH)
+        self.context_weight = context_weight
+        self._labels: dict[str, _LabelIndex] = {}
+        self._lock = threading.RLock()
+        self._dirty = 0
+        self._loaded = False
+        self._loading = False
+        self._load_lock = threading.Lock()
+        self._pending: list[tuple[str, str, str, str]] = []
+
+    def __len__(self) -> int:
+        return sum(len(idx) for idx in self._labels.values())
+
+    @property
+    def ready(self) -> bool:
+        return self._loaded
+
+    def _label(self, label: str) -> _LabelIndex:
+        if label not in self._labels:
+            self._labels[label] = _LabelIndex(self.embedder.dim)
+        return self._labels[label]
+
+    def add_many(self, items: list[tuple[str, str, str, str]]) -> None:
+        """Insert (key, canonical, label, context) rows, embedding them in one batch."""
+        if not items:
+            return
+        with self._lock:
+            if self._loading:
+                self._pending.extend(items)
+                return
+        self._insert(items)
+
+    def _insert(self, items: list[tuple[str, str, str, str]]) -> None:
+        name_vecs = self.embedder.embed([key for key, _, _, _ in items])
+        contexts = [ctx for _, _, _, ctx in items]
+        with_ctx = [i for i, ctx in enumerate(contexts) if ctx]
+        ctx_vecs = self.embedder.embed([contexts[i] for i in with_ctx]) if with_ctx else None
+        ctx_by_row = {row: ctx_vecs[pos] for pos, row in enumerate(with_ctx)} if ctx_vecs is not None else {}
+        with self._lock:
+            for row, (key, canonical, label, _ctx) in enumerate(items):
+                self._label(label).upsert(key, canonical, name_vecs[row], ctx_by_row.get(row))
+            self._dirty += len(items)
+            if self._dirty >= Config.ENTITY_INDEX_SAVE_EVERY:
+                self.save()
+
+    def add(self, key: str, canonical: str, label: str, context: str = "") -> None:
+        self.add_many([(key, canonical, label, context)])
+
+    def query(self, name: str, label: str, context: str = "", k: int = 5) -> list[tuple[str, float]]:
+        """Top-k (canonical name, score) candidates for `name` within `label`."""
+        with self._lock:
+            idx = self._labels.get(label)
+            if not idx or not len(idx):
+                return []
+            n = len(idx)
+            qvec = self.embedder.embed([name])[0]
+            scores = idx.name_vecs[:n] @ qvec
+            if context:
+                cvec = self.embedder.embed([context])[0]
+                ctx_scores = idx.ctx_vecs[:n] @ cvec
+                blended = (1 - self.context_weight) * scores + self.context_weight * ctx_scores
+                scores = np.where(idx.has_ctx[:n], blended, scores)
+            k = min(k, n)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            seen: dict[str, float] = {}
+            for pos in top:
+                canonical = idx.canonical[pos]
+                if canonical not in seen:
+                    seen[canonical] = float(scores[pos])
+            return list(seen.items())
+
+    def save(self) -> None:
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            arrays = {}
+            meta = {"embedder": self.embedder.name, "dim": self.embedder.dim, "labels": {}}
+            for label, idx in self._labels.items():
+                n = len(idx)
+                arrays[f"{label}__name"] = idx.name_vecs[:n]
+                arrays[f"{label}__ctx"] = idx.ctx_vecs[:n]
+                arrays[f"{label}__has_ctx"] = idx.has_ctx[:n]
+                meta["labels"][label] = {"keys": idx.keys, "canonical": idx.canonical}
+            tmp = self.path.with_suffix(".tmp.npz")
+            np.savez(tmp, **arrays)
+            os.replace(tmp, self.path)
+            self.path.with_suffix(".json").write_text(json.dumps(meta))
+            self._dirty = 0
+
+    def load(self) -> bool:
+        meta_path = self.path.with_suffix(".json")
+        if not self.path.exists() or not meta_path.exists():
+            return False
+        meta = json.loads(meta_path.read_text())
+        if meta.get("embedder") != self.embedder.name or meta.get("dim") != self.embedder.dim:
+            logger.info("Entity index on disk was built with a different embedder; rebuilding.")
+            return False
+        with np.load(self.path) as arrays, self._lock:
+            self._labels = {}
+            for label, rows in meta["labels"].items():
+                n = len(rows["keys"])
+                idx = _LabelIndex(self.embedder.dim, capacity=max(256, n))
+                idx.keys = list(rows["keys"])
+                idx.canonical = list(rows["canonical"])
+                idx.positions = {k.lower(): i for i, k in enumerate(idx.keys)}
+                idx.name_vecs[:n] = arrays[f"{label}__name"]
+                idx.ctx_vecs[:n] = arrays[f"{label}__ctx"]
+                idx.has_ctx[:n] = arrays[f"{label}__has_ctx"]
+                self._labels[label] = idx
+        return True
+
+    def bootstrap_from_graph(self, page_size: int = 2000) -> None:
+        """Build the index from existing entity nodes, paging on the unique (indexed) name."""
+        db = GraphManager()
+        for label in _ENTITY_LABELS:
+            after = ""
+            while True:
+                with db.session() as session:
+                    rows = list(
+                        session.run(
+                            f"""
+                            MATCH (n:{label}) WHERE n.name > $after
+                            WITH n ORDER BY n.name LIMIT $limit
+                            RETURN n.name AS name, properties(n) AS props
+                            """,
+                            after=after,
+                            limit=page_size,
+                        )
+                    )
+                self._insert([(r["name"], r["name"], label, context_text(r["props"])) for r in rows])
+                if len(rows) < page_size:
+                    break
+                after = rows[-1]["name"]
+        self.save()
+
+    def ensure_loaded(self) -> None:
+        """Load from disk or bootstrap from the graph; blocks until the index is ready."""
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            with self._lock:
+                self._loading = True
+            # If this raises, _loading stays set: rows ingested meanwhile (and after) remain
+            # buffered for the next attempt instead of landing in a half-built index.
+            if not self.load():
+                self.bootstrap_from_graph()
+            while True:
+                with self._lock:
+                    pending, self._pending = self._pending, []
+                    if not pending:
+                        self._loading = False
+                        self._loaded = True
+                        break
+                try:
+                    self._insert(pending)
+                except BaseException:
+                    with self._lock:
+                        self._pending[:0] = pending
+                    raise
+        logger.info(f"🧭 Entity index ready: {len(self)} entries")
+
+    def load_in_background(self) -> None:
+        """Start `ensure_loaded` on a daemon thread unless it is loaded or already loading."""
+        if self._loaded or self._load_lock.locked():
+            return
+
+        def run():
+            try:
+                self.ensure_loaded()
+            except Exception as e:
+                logger.warning(f"Entity index build failed: {e}")
+
+        threading.Thread(target=run, name="entity-index-load", daemon=True).start()
+
+
+_index: EntityIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_entity_index(wait: bool = True) -> EntityIndex:
+    """
+    The process-wide index. With `wait=False` it is returned immediately, possibly not yet
+    `ready`, and a background build is started; callers on the ingest path use this so a
+    missing .npz never stalls a write transaction.
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = EntityIndex()
+    if wait:
+        _index.ensure_loaded()
+    else:
+        _index.load_in_background()
+    return _index
+
+
+__all__ = ["EntityIndex", "HashingEmbedder", "context_text", "get_entity_index", "load_embedder"]
@@ -0,0 +1,118 @@
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Literal
+
+from src.agent import invoke_llm
+from src.config import Config
+from src.deadline import check_deadline
+from src.llm import build_chat_model
+from src.schema import ExtractedKnowledge, KnowledgeGraphUpdate
+from src.telemetry import bind_thread_id, metrics, span
+from src.tools.graph import insert_knowledge_batch
+from src.tools.search import perform_search
+from src.tools.sources import bind_mission, screen_known_sources
+
+logger = logging.getLogger("extraction")
+
+# "agent" runs the tool-calling loop; "extract" is the search-then-one-call pipeline below.
+Mode = Literal["agent", "extract"]
+
+# Searches issued up front per mission kind; the single LLM call only sees their results.
+_QUERIES = {
+    "profile": (
+        "{company} company overview headquarters founded",
+        "{company} CEO leadership executives",
+        "{company} products industry recent news",
+    ),
+    "profile_facts": ("{company} headquarters location founded year",),
+    "executives": ("{company} CEO leadership team executives",),
+    "competitors": ("{company} competitors", "{company} alternatives market rivals"),
+}
+
+_structured_llm = None
+
+
+def _get_structured_llm():
+    global _structured_llm
+    if _structured_llm is None:
+        _structured_llm = build_chat_model(temperature=0).with_structured_output(ExtractedKnowledge)
+    return _structured_llm
+
+
+def gather_sources(company: str, kind: str) -> list[dict[str, str]]:
+    """
+    Run the mission's searches concurrently and return unique results by URL, without the
+    sources this mission kind has already read. When that leaves nothing, the known sources
+    are kept: re-reading them beats extracting from an empty prompt.
+    """
+    queries = [q.format(company=company) for q in _QUERIES.get(kind, _QUERIES["profile"])]
+    with span("extraction.search", queries=len(queries)) as attrs:
+        # Each search runs in a copy of this context so it sees the request deadline.
+        contexts = [contextvars.copy_context() for _ in queries]
+        with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+            batches = list(
+                pool.map(
+                    lambda ctx, q: ctx.run(perform_search, q, max_results=Config.MAX_SEARCH_RESULTS, focus=company),
+                    contexts,
+                    queries,
+                )
+            )
+        sources: dict[str, dict[str, str]] = {}
+        for results in batches:
+            for r in results:
+                if r.get("url"):
+                    sources.setdefault(r["url"], r)
+        found = list(sources.values())
+        fresh = screen_known_sources(found, "filter", mission=kind)
+        attrs["sources"], attrs["known_sources"] = len(found), len(found) - len(fresh)
+    if not fresh and found:
+        logger.info(f"All {len(found)} sources for '{company}' ({kind}) were already read; re-reading them")
+        return found
+    return fresh
+
+
+def build_extraction_prompt(task: str, sources: list[dict[str, str]]) -> str:
+    source_block = "\n\n".join(
+        f"{idx+1}. {s.get('title','')} ({s.get('url','')})\n{s.get('content','')}"
+        for idx, s in enumerate(sources)
+    )
+    return (
+        "You are a Knowledge Graph Populator. Extract the entities and relationships the task asks for "
+        "from the sources below. Where the task mentions saving or graph tools, return that data as "
+        "structured output instead. Emit one update per source URL you relied on, using that URL as "
+        "source_url; use 'Internal Knowledge' only for facts not found in any source.\n\n"
+        f"TASK:\n{task}\n\nSOURCES:\n{source_block or 'None found.'}"
+    )
+
+
+def _as_updates(result: Any) -> list[KnowledgeGraphUpdate]:
+    if isinstance(result, dict):
+        result = ExtractedKnowledge(**result)
+    if isinstance(result, KnowledgeGraphUpdate):
+        return [result]
+    return [u for u in getattr(result, "updates", []) if u.entities or u.relationships]
+
+
+def run_extraction(task: str, company: str, kind: str, thread_id: str | None = None) -> str:
+    """
+    Extraction-mode mission: search up front, one structured-output call, batched ingest.
+
+    Replaces the agent's search/check/save turns with a single LLM round trip and one write
+    transaction; entity resolution at ingest takes the place of `check_graph`.
+    """
+    with bind_thread_id(thread_id), bind_mission(kind), span("extraction.run", kind=kind):
+        sources = gather_sources(company, kind)
+        with span("extraction.llm"):
+            result = invoke_llm(_get_structured_llm(), build_extraction_prompt(task, sources), thread_id)
+        updates = _as_updates(result)
+        check_deadline("extraction.ingest")
+        insert_knowledge_batch(updates)
+    metrics.inc("gotham_extraction_runs_total", help="Extraction-mode missions by kind.", kind=kind)
+    entities = sum(len(u.entities) for u in updates)
+    relationships = sum(len(u.relationships) for u in updates)
+    logger.info(f"Extracted {entities} entities, {relationships} relationships for '{company}' ({kind})")
+    return f"Saved to graph: {entities} entities, {relationships} relationships from {len(updates)} source(s)."
+
+
+__all__ = ["Mode", "build_extraction_prompt", "gather_sources", "run_extraction"]
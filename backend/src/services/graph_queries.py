@@ -1,6 +1,17 @@
 import re
+from typing import Iterator
 
+from src.constants import (
+    NEIGHBORHOOD_MAX_NODES,
+    NEIGHBORHOOD_MAX_PER_HOP,
+    PROFILE_RELATED_LIMIT,
+    PROFILE_SOURCES_LIMIT,
+    SAMPLE_MAX_EDGES_PER_ENTITY,
+    SAMPLE_MAX_ENTITIES_PER_DOC,
+    SAMPLE_MAX_NODES,
+)
 from src.graph_db import GraphManager
+from src.relationships import SEMANTIC_PATTERN, SEMANTIC_TYPES, type_filter
 
 _CORP_SUFFIXES = re.compile(
     r"\b(inc|inc\.|ltd|ltd\.|corp|corp\.|co|co\.|company|companies|group|ag|sa|plc|nv)\b",
@@ -53,9 +64,10 @@ def fetch_competitors(company: str) -> list[dict]:
         if not node:
             return []
 
+        # Competition is symmetric: expand the typed edge in both directions.
         cypher = """
-        MATCH (c:Organization {name: $name})
-        MATCH (c)-[r:RELATED {type:'COMPETES_WITH'}]->(o:Organization)
+        MATCH (c:Organization {name: $name})-[r:COMPETES_WITH]-(o:Organization)
+        WITH o, head(collect(r)) AS r
         RETURN o.name AS competitor, r.reason AS reason, r.source_url AS source
         ORDER BY o.name
         """
@@ -65,41 +77,450 @@ def fetch_competitors(company: str) -> list[dict]:
         ]
 
 
-def fetch_entity_profile(name: str) -> dict | None:
+# Entity labels only: bookkeeping nodes (:WriteSequence, :Migration) also carry a name.
+_FIND_ENTITY = """
+CALL () {
+    WITH $name AS q
+    MATCH (e:Person|Organization|Location|Topic) WHERE toLower(e.name) = toLower(q)
+    RETURN e, 1.0 AS score
+    UNION
+    WITH $name AS q
+    CALL db.index.fulltext.queryNodes("entity_name_index", q + "~") YIELD node, score
+    RETURN node AS e, score
+}
+WITH e, score ORDER BY score DESC LIMIT 1
+"""
+
+
+def fetch_entity_profile(name: str, related_limit: int = PROFILE_RELATED_LIMIT) -> dict | None:
     db = GraphManager()
-    cypher = """
-    CALL () {
-        WITH $name AS q
-        MATCH (e) WHERE toLower(e.name) = toLower(q)
-        RETURN e, 1.0 AS score
-        UNION
-        WITH $name AS q
-        CALL db.index.fulltext.queryNodes("entity_name_index", q + "~") YIELD node, score
-        RETURN node AS e, score
-    } 
-    WITH e, score ORDER BY score DESC LIMIT 1
-    OPTIONAL MATCH (e)<-[:MENTIONS]-(d:Document)
-    OPTIONAL MATCH (e)-[r:RELATED]-(n)
-    RETURN e,
-           collect(distinct {url: d.url, created_at: d.created_at}) AS sources,
-           collect(distinct {id: elementId(n), name: n.name, labels: labels(n), type: type(r)}) AS related
+    # Separate subqueries keep sources and neighbors from multiplying each other;
+    # both are capped before they are collected. Per-edge evidence comes from r.source_urls.
+    cypher = _FIND_ENTITY + f"""
+    CALL (e) {{
+        OPTIONAL MATCH (e)<-[:MENTIONS]-(d:Document)
+        WITH d ORDER BY d.created_at DESC LIMIT $sources_limit
+        RETURN collect(distinct {{url: d.url, created_at: d.created_at}}) AS sources
+    }}
+    CALL (e) {{
+        OPTIONAL MATCH (e)-[r:{SEMANTIC_PATTERN}]-(n)
+        WITH r, n LIMIT $related_limit
+        RETURN collect(distinct {{
+            id: elementId(n), name: n.name, labels: labels(n), type: coalesce(r.type, type(r)),
+            sources: r.source_urls
+        }}) AS related
+    }}
+    RETURN e, sources, related
     LIMIT 1
     """
     with db.session() as session:
-        rec = session.run(cypher, {"name": name}).single()
+        rec = session.run(
+            cypher, {"name": name, "related_limit": related_limit, "sources_limit": PROFILE_SOURCES_LIMIT}
+        ).single()
         if not rec:
             return None
         node = rec["e"]
         props = dict(node)
-        related = rec["related"]
+        related = [item for item in rec["related"] if item.get("id")]
 
         return {
             "name": node.get("name"),
             "labels": list(node.labels),
             "properties": props,
-            "sources": rec["sources"],
+            "sources": [item for item in rec["sources"] if item.get("url")],
             "related": related,
         }
 
 
-__all__ = ["fetch_competitors", "fetch_entity_profile"]
+def fetch_neighborhood(
+    name: str,
+    depth: int = 1,
+    max_per_hop: int = NEIGHBORHOOD_MAX_PER_HOP,
+    rel_types: list[str] | None = None,
+    max_nodes: int = NEIGHBORHOOD_MAX_NODES,
+) -> dict | None:
+    """
+    Bounded BFS ego-graph around an entity.
+
+    Each hop is one query over the current frontier; every frontier node expands at most
+    `max_per_hop` relationships (optionally filtered by type), and expansion stops once
+    `max_nodes` nodes are known. Returns a compact nodes/edges payload without properties.
+    """
+    db = GraphManager()
+    with db.session() as session:
+        root = session.run(
+            _FIND_ENTITY + "RETURN elementId(e) AS id, e.name AS name, labels(e) AS labels",
+            name=name,
+        ).single()
+        if not root:
+            return None
+
+        pattern, fallback_types = type_filter(rel_types)
+        nodes: dict[str, dict] = {root["id"]: {"id": root["id"], "name": root["name"], "labels": root["labels"], "depth": 0}}
+        edges: dict[str, dict] = {}
+        frontier = [root["id"]]
+        truncated = False
+
+        for hop in range(1, depth + 1):
+            if not frontier:
+                break
+            next_frontier: list[str] = []
+            for rec in session.run(
+                f"""
+                UNWIND $frontier AS node_id
+                MATCH (n) WHERE elementId(n) = node_id
+                CALL (n) {{
+                    MATCH (n)-[r:{pattern}]-(m)
+                    WHERE $fallback_types IS NULL OR type(r) <> 'RELATED' OR r.type IN $fallback_types
+                    RETURN r, m LIMIT $max_per_hop
+                }}
+                RETURN elementId(r) AS rel_id, coalesce(r.type, type(r)) AS type,
+                       elementId(startNode(r)) AS source, elementId(endNode(r)) AS target,
+                       elementId(m) AS id, m.name AS name, labels(m) AS labels
+                """,
+                frontier=frontier,
+                fallback_types=fallback_types,
+                max_per_hop=max_per_hop,
+            ):
+                if rec["id"] not in nodes:
+                    if len(nodes) >= max_nodes:
+                        truncated = True
+                        continue
+                    nodes[rec["id"]] = {"id": rec["id"], "name": rec["name"], "labels": rec["labels"], "depth": hop}
+                    next_frontier.append(rec["id"])
+                edges[rec["rel_id"]] = {
+                    "id": rec["rel_id"],
+                    "source": rec["source"],
+                    "target": rec["target"],
+                    "type": rec["type"],
+                }
+            frontier = next_frontier
+
+    return {
+        "root": root["id"],
+        "nodes": list(nodes.values()),
+        "edges": list(edges.values()),
+        "node_count": len(nodes),
+        "edge_count": len(edges),
+        "truncated": truncated,
+    }
+
+
+def _node_view(rec) -> dict:
+    return {"id": rec["id"], "labels": rec["labels"], "name": rec["name"], "props": rec["props"]}
+
+
+def fetch_graph_sample(
+    doc_limit: int,
+    max_entities_per_doc: int = SAMPLE_MAX_ENTITIES_PER_DOC,
+    max_edges_per_entity: int = SAMPLE_MAX_EDGES_PER_ENTITY,
+    max_nodes: int = SAMPLE_MAX_NODES,
+    include_props: bool = True,
+) -> dict:
+    """
+    Recent documents with a degree-bounded neighborhood.
+
+    Built from three bounded queries (documents, mentioned entities, outgoing edges) whose
+    row counts are capped per document and per entity, so hub entities cannot multiply
+    intermediate rows the way a chained OPTIONAL MATCH + collect/UNWIND does. Without
+    `include_props`, property maps are neither read nor shipped (props are null).
+    """
+    db = GraphManager()
+    with db.session() as session:
+        documents = [
+            {"id": rec["id"], "url": rec["url"], "created_at": rec["created_at"]}
+            for rec in session.run(
+                """
+                MATCH (d:Document) WHERE d.created_at IS NOT NULL
+                WITH d ORDER BY d.created_at DESC LIMIT $doc_limit
+                RETURN elementId(d) AS id, d.url AS url, d.created_at AS created_at
+                """,
+                doc_limit=doc_limit,
+            )
+        ]
+        if not documents:
+            return {"nodes": [], "edges": [], "node_count": 0, "edge_count": 0, "documents": []}
+
+        nodes: dict[str, dict] = {}
+        for rec in session.run(
+            """
+            UNWIND $doc_ids AS doc_id
+            MATCH (d:Document) WHERE elementId(d) = doc_id
+            CALL (d) {
+                MATCH (d)-[:MENTIONS]->(e)
+                RETURN e LIMIT $per_doc
+            }
+            WITH DISTINCT e LIMIT $max_nodes
+            RETURN elementId(e) AS id, labels(e) AS labels, coalesce(e.name, e.url) AS name,
+                   CASE WHEN $include_props THEN properties(e) END AS props
+            """,
+            doc_ids=[d["id"] for d in documents],
+            per_doc=max_entities_per_doc,
+            max_nodes=max_nodes,
+            include_props=include_props,
+        ):
+            nodes[rec["id"]] = _node_view(rec)
+
+        edges: dict[str, dict] = {}
+        for rec in session.run(
+            f"""
+            UNWIND $entity_ids AS entity_id
+            MATCH (e) WHERE elementId(e) = entity_id
+            CALL (e) {{
+                MATCH (e)-[r:{SEMANTIC_PATTERN}]->(t)
+                RETURN r, t LIMIT $fanout
+            }}
+            RETURN elementId(r) AS rel_id, coalesce(r.type, type(r)) AS type, elementId(e) AS source,
+                   CASE WHEN $include_props THEN properties(r) END AS rel_props,
+                   elementId(t) AS id, labels(t) AS labels, coalesce(t.name, t.url) AS name,
+                   CASE WHEN $include_props THEN properties(t) END AS props
+            """,
+            entity_ids=list(nodes),
+            fanout=max_edges_per_entity,
+            include_props=include_props,
+        ):
+            if rec["id"] not in nodes:
+                if len(nodes) >= max_nodes:
+                    continue
+                nodes[rec["id"]] = _node_view(rec)
+            edges[rec["rel_id"]] = {
+                "id": rec["rel_id"],
+                "type": rec["type"],
+                "source": rec["source"],
+                "target": rec["id"],
+                "props": rec["rel_props"],
+            }
+
+    return {
+        "nodes": list(nodes.values()),
+        "edges": list(edges.values()),
+        "node_count": len(nodes),
+        "edge_count": len(edges),
+        "documents": documents,
+    }
+
+
+def parse_timeline_cursor(cursor: str | None) -> tuple[int | None, str | None]:
+    """Split a `before` cursor into (created_at, elementId); a bare timestamp has no tie-breaker."""
+    if not cursor:
+        return None, None
+    ts, _, element_id = cursor.partition(":")
+    return int(ts), element_id or None
+
+
+def fetch_recent_documents(
+    limit: int = 15,
+    before: str | None = None,
+    since: int | None = None,
+    until: int | None = None,
+) -> dict:
+    """
+    One page of the document timeline, newest first, with keyset pagination.
+
+    Predicates are only emitted for the bounds that are set, so every page is a backward
+    range seek on the `document_created_at` index that stops after `limit` rows: the cost
+    does not grow with how deep the client has paged. `elementId` breaks ties between
+    documents written in the same millisecond. `next_before` resumes after the last row.
+    """
+    before_ts, before_id = parse_timeline_cursor(before)
+    where = ["d.created_at IS NOT NULL"]
+    if since is not None:
+        where.append("d.created_at >= $since")
+    if until is not None:
+        where.append("d.created_at < $until")
+    if before_ts is not None and before_id is None:
+        where.append("d.created_at < $before_ts")
+    elif before_ts is not None:
+        where.append("d.created_at <= $before_ts")
+        where.append("(d.created_at < $before_ts OR elementId(d) < $before_id)")
+    cypher = f"""
+    MATCH (d:Document)
+    WHERE {" AND ".join(where)}
+    RETURN elementId(d) AS id, d.url AS url, d.created_at AS created_at
+    ORDER BY d.created_at DESC, elementId(d) DESC
+    LIMIT $limit
+    """
+    params = {"limit": limit, "since": since, "until": until, "before_ts": before_ts, "before_id": before_id}
+    with GraphManager().session() as session:
+        documents = [
+            {"id": rec["id"], "url": rec["url"], "created_at": rec["created_at"]} for rec in session.run(cypher, params)
+        ]
+    next_before = None
+    if len(documents) == limit:
+        last = documents[-1]
+        next_before = f"{last['created_at']}:{last['id']}"
+    return {"documents": documents, "next_before": next_before}
+
+
+EXPORT_LABELS = ("Document", "Person", "Organization", "Location", "Topic")
+
+EXPORT_REL_TYPES = (*SEMANTIC_TYPES, "MENTIONS")
+
+# Unique (constraint-indexed) key per label: the keyset for id-ordered pages.
+_EXPORT_KEY = {"Document": "url"}
+
+_TIME_FILTER = "($since IS NULL OR {v}.created_at >= $since) AND ($until IS NULL OR {v}.created_at < $until)"
+
+
+def _export_node_query(label: str, order: str) -> str:
+    key = _EXPORT_KEY.get(label, "name")
+    if order == "id":
+        where, order_by = f"n.{key} > $after_key", f"n.{key}"
+    else:
+        # Range seek on the created_at index; the unique key breaks ties.
+        where = f"n.created_at >= $after_ts AND (n.created_at > $after_ts OR n.{key} > $after_key)"
+        order_by = f"n.created_at, n.{key}"
+    return f"""
+    MATCH (n:{label})
+    WHERE {where} AND {_TIME_FILTER.format(v="n")}
+    WITH n ORDER BY {order_by} LIMIT $page_size
+    RETURN n.{key} AS key, n.created_at AS created_at, elementId(n) AS id, labels(n) AS labels, properties(n) AS props
+    """
+
+
+_EDGE_VIEW = "{id: elementId(r), type: type(r), source: elementId(a), target: elementId(b), props: properties(r)}"
+
+
+def _export_edge_query(group: str, order: str) -> str:
+    if order == "id":
+        # Source nodes by their unique key, and each source's edges by elementId, so a hub
+        # node's edges are split across pages like any other rows.
+        key = _EXPORT_KEY.get(group, "name")
+        return f"""
+        MATCH (a:{group})
+        WHERE a.{key} >= $after_key
+        WITH a ORDER BY a.{key}
+        CALL (a) {{
+            MATCH (a)-[r]->(b)
+            WHERE (a.{key} > $after_key OR elementId(r) > $after_edge)
+              AND any(l IN labels(b) WHERE l IN $labels) AND {_TIME_FILTER.format(v="r")}
+            WITH r, b ORDER BY elementId(r) LIMIT $page_size
+            RETURN r, b
+        }}
+        WITH a, r, b ORDER BY a.{key}, elementId(r) LIMIT $page_size
+        RETURN a.{key} AS key, null AS created_at, elementId(r) AS edge_id, {_EDGE_VIEW} AS edge
+        """
+    return f"""
+    MATCH (a)-[r:{group}]->(b)
+    WHERE r.created_at >= $after_ts AND (r.created_at > $after_ts OR elementId(r) > $after_key)
+      AND any(l IN labels(a) WHERE l IN $labels)
+      AND any(l IN labels(b) WHERE l IN $labels)
+      AND {_TIME_FILTER.format(v="r")}
+    WITH a, r, b ORDER BY r.created_at, elementId(r) LIMIT $page_size
+    RETURN elementId(r) AS key, r.created_at AS created_at, elementId(r) AS edge_id, {_EDGE_VIEW} AS edge
+    """
+
+
+def parse_export_cursor(
+    order: str, cursor: str | None, section: str = "nodes"
+) -> tuple[str | None, int | None, str, str]:
+    """
+    Split an export cursor into (group, created_at, key, edge). The group is the label (or, for
+    created_at-ordered edges, the relationship type) being paged; id-ordered cursors carry
+    no timestamp, and id-ordered edge cursors also carry the last edge's elementId within its
+    source node (`Group:<edge>|<key>`; elementIds never contain "|").
+    """
+    if not cursor:
+        return None, (None if order == "id" else -1), "", ""
+    group, sep, rest = cursor.partition(":")
+    if not group or not sep:
+        raise ValueError("cursor has no group")
+    if order == "id":
+        if section == "edges":
+            edge, sep, key = rest.partition("|")
+            if not sep:
+                raise ValueError("edge cursor has no edge id")
+            return group, None, key, edge
+        return group, None, rest, ""
+    ts, _, key = rest.partition(":")
+    return group, int(ts), key, ""
+
+
+def _export_cursor(order: str, section: str, group: str, created_at, key: str, edge: str) -> str:
+    if order != "id":
+        return f"{group}:{created_at}:{key}"
+    return f"{group}:{edge}|{key}" if section == "edges" else f"{group}:{key}"
+
+
+def iter_graph_export(
+    section: str = "all",
+    order: str = "id",
+    after: str | None = None,
+    labels: list[str] | None = None,
+    since: int | None = None,
+    until: int | None = None,
+    page_size: int = 1000,
+) -> Iterator[dict]:
+    """
+    Yield nodes then edges page by page using keyset pagination.
+
+    Nodes are paged per label and edges per source label (order=id) or relationship type
+    (order=created_at), each on an indexed key, so every page is a bounded index seek rather
+    than a scan of the whole graph; memory stays constant on both sides. A cursor item
+    follows every page so clients can resume with ?section=&after=.
+    """
+    db = GraphManager()
+    # An `all` export resumes in the nodes section; edge cursors come with section=edges.
+    after_group, after_ts, after_key, after_edge = parse_export_cursor(order, after, section)
+    selected = [label for label in EXPORT_LABELS if label in (labels or EXPORT_LABELS)]
+    params = {"labels": selected, "since": since, "until": until, "page_size": page_size}
+
+    sections = ["nodes", "edges"] if section == "all" else [section]
+    for current in sections:
+        groups = selected if current == "nodes" or order == "id" else list(EXPORT_REL_TYPES)
+        if after_group in groups:
+            groups = groups[groups.index(after_group):]
+        for group in groups:
+            if group != after_group:
+                _, after_ts, after_key, after_edge = parse_export_cursor(order, None)
+            cypher = _export_node_query(group, order) if current == "nodes" else _export_edge_query(group, order)
+            while True:
+                with db.session() as session:
+                    page = list(
+                        session.run(
+                            cypher,
+                            {**params, "after_ts": after_ts, "after_key": after_key, "after_edge": after_edge},
+                        )
+                    )
+                for rec in page:
+                    if current == "nodes":
+                        yield {"type": "node", "id": rec["id"], "labels": rec["labels"], "props": rec["props"]}
+                    else:
+                        edge = rec["edge"]
+                        yield {
+                            "type": "edge",
+                            "id": edge["id"],
+                            "rel": edge["type"],
+                            "source": edge["source"],
+                            "target": edge["target"],
+                            "props": edge["props"],
+                        }
+                if not page:
+                    break
+                last = page[-1]
+                after_ts, after_key = last["created_at"], last["key"]
+                after_edge = last["edge_id"] if current == "edges" else ""
+                yield {
+                    "type": "cursor",
+                    "section": current,
+                    "after": _export_cursor(order, current, group, after_ts, after_key, after_edge),
+                }
+                if len(page) < page_size:
+                    break
+
+        # next section starts from the beginning of its own keyspace
+        after_group = None
+
+
+__all__ = [
+    "fetch_competitors",
+    "fetch_entity_profile",
+    "fetch_graph_sample",
+    "fetch_neighborhood",
+    "fetch_recent_documents",
+    "iter_graph_export",
+    "parse_export_cursor",
+    "parse_timeline_cursor",
+    "EXPORT_LABELS",
+    "EXPORT_REL_TYPES",
+]
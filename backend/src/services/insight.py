@@ -6,8 +6,24 @@ from fastapi.concurrency import run_in_threadpool
 
 from src.agent import run_agent
 from src.config import Config
+from src.deadline import call_timeout
+from src.llm_cache import bypass_llm_cache
+from src.services.extraction import Mode, run_extraction
 from src.services.graph_queries import fetch_competitors, fetch_entity_profile
+from src.services.mood import get_company_mood
+from src.services.planner import (
+    COMPETITORS,
+    EXECUTIVES,
+    MOOD,
+    PROFILE,
+    PROFILE_FACTS,
+    mood_cache,
+    plan_company_insight,
+    run_subtasks,
+)
 from src.constants import COMPETITOR_DISPLAY_CAP
+from src.telemetry import span
+from src.tools.sources import bind_mission
 
 def build_profile_prompt(company: str) -> str:
     return (
@@ -17,6 +33,28 @@ def build_profile_prompt(company: str) -> str:
     )
 
 
+def build_profile_facts_prompt(company: str) -> str:
+    return (
+        f"Find where '{company}' is headquartered (city and country) and the year it was founded. "
+        "Cite at least 2 recent sources. Save to the graph: the Organization node "
+        f"'{company}' with properties headquarters, country, founded_year, plus a HEADQUARTERED_IN "
+        "relationship to a Location node for the city."
+    )
+
+
+def build_full_profile_prompt(company: str) -> str:
+    """Headquarters, founding year and executives in one mission, for companies the graph lacks."""
+    return f"{build_profile_facts_prompt(company)} Then: {build_executives_prompt(company)}"
+
+
+def build_executives_prompt(company: str) -> str:
+    return (
+        f"Identify 3 key current executives of '{company}' with their roles, citing a source for each. "
+        "Save Person nodes (property role) and relationships from each person to the Organization "
+        f"'{company}' using CEO_OF, FOUNDED or WORKS_FOR."
+    )
+
+
 def build_competitor_prompt(company: str) -> str:
     return (
         f"Find 4-6 close competitors for '{company}' (direct/adjacent peers only). "
@@ -53,68 +91,146 @@ def filter_competitors(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
     return cleaned
 
 
-async def run_competitor_flow(company: str, thread_id: str | None) -> tuple[Any, list[dict[str, Any]]]:
+def _run_agent_mission(prompt: str, kind: str, thread_id: str | None) -> str:
+    # Bound in the worker thread; the agent's tool calls copy it, so searches screen per kind.
+    with bind_mission(kind):
+        return run_agent(prompt, thread_id)
+
+
+async def run_mission(prompt: str, company: str, kind: str, thread_id: str | None, mode: Mode = "agent") -> str:
+    """Run one mission prompt through the agent loop or the single-call extraction pipeline."""
+    if mode == "extract":
+        call = run_in_threadpool(run_extraction, prompt, company, kind, thread_id)
+    else:
+        call = run_in_threadpool(_run_agent_mission, prompt, kind, thread_id)
+    return await asyncio.wait_for(call, timeout=call_timeout(Config.RUN_MISSION_TIMEOUT))
+
+
+async def run_competitor_flow(
+    company: str, thread_id: str | None, mode: Mode = "agent"
+) -> tuple[Any, list[dict[str, Any]]]:
     """Run competitor agent with a retry and return (agent_result, competitors_from_graph)."""
     run_id = thread_id or str(uuid.uuid4())
     comp_prompt = build_competitor_prompt(company)
     fallback_prompt = build_competitor_fallback_prompt(company)
 
-    result = await asyncio.wait_for(
-        run_in_threadpool(run_agent, comp_prompt, run_id),
-        timeout=Config.RUN_MISSION_TIMEOUT,
-    )
+    result = await run_mission(comp_prompt, company, "competitors", run_id, mode)
     competitors = await asyncio.wait_for(
         run_in_threadpool(fetch_competitors, company),
-        timeout=8,
+        timeout=call_timeout(8),
     )
     competitors_list = filter_competitors(competitors)[:COMPETITOR_DISPLAY_CAP]
 
     if not competitors_list:
-        await asyncio.wait_for(
-            run_in_threadpool(run_agent, fallback_prompt, run_id),
-            timeout=Config.RUN_MISSION_TIMEOUT,
-        )
+        await run_mission(fallback_prompt, company, "competitors", run_id, mode)
         competitors = await asyncio.wait_for(
             run_in_threadpool(fetch_competitors, company),
-            timeout=8,
+            timeout=call_timeout(8),
         )
         competitors_list = filter_competitors(competitors)[:COMPETITOR_DISPLAY_CAP]
 
     return result, competitors_list
 
 
-async def run_company_insight(company: str, thread_id: str | None):
-    """End-to-end: profile + competitors + graph views."""
-    run_id = thread_id or str(uuid.uuid4())
-    profile_prompt = build_profile_prompt(company)
+async def _fetch_graph_state(company: str) -> tuple[dict | None, list[dict[str, Any]]]:
+    async def guarded(fn, default):
+        try:
+            return await asyncio.wait_for(run_in_threadpool(fn, company), timeout=call_timeout(8))
+        except Exception:
+            return default
 
-    profile_result = await asyncio.wait_for(
-        run_in_threadpool(run_agent, profile_prompt, run_id),
-        timeout=Config.RUN_MISSION_TIMEOUT,
+    profile, competitors = await asyncio.gather(
+        guarded(fetch_entity_profile, None), guarded(fetch_competitors, [])
     )
-    competitor_result, competitors_list = await run_competitor_flow(company, run_id)
+    return profile, filter_competitors(competitors)[:COMPETITOR_DISPLAY_CAP]
+
+
+async def run_company_insight(
+    company: str,
+    thread_id: str | None,
+    include_mood: bool = False,
+    refresh: bool = False,
+    timeframe: str = "90d",
+    mode: Mode = "agent",
+):
+    """
+    End-to-end: profile + competitors (+ mood) and the resulting graph views.
+
+    The planner checks the graph and caches first; only missing sub-tasks are sent to the
+    agent, each with a narrow prompt and its own thread, in parallel.
+    """
+    run_id = thread_id or str(uuid.uuid4())
+
+    with span("planner.check"):
+        profile_view, competitors_list = await _fetch_graph_state(company)
+    tasks = plan_company_insight(company, profile_view, competitors_list, include_mood, timeframe, refresh)
 
-    try:
-        profile_view = await asyncio.wait_for(
-            run_in_threadpool(fetch_entity_profile, company),
-            timeout=8,
+    async def run_mood(task):
+        data = await asyncio.wait_for(
+            run_in_threadpool(get_company_mood, task.company, timeframe),
+            timeout=call_timeout(Config.RUN_MISSION_TIMEOUT),
         )
-    except Exception:
-        profile_view = None
+        mood_cache.put(task.company, timeframe, data)
+        return data
+
+    runners = {
+        PROFILE: lambda task: run_mission(
+            build_full_profile_prompt(task.company), task.company, PROFILE, f"{run_id}:{PROFILE}", mode
+        ),
+        PROFILE_FACTS: lambda task: run_mission(
+            build_profile_facts_prompt(task.company), task.company, PROFILE_FACTS, f"{run_id}:{PROFILE_FACTS}", mode
+        ),
+        EXECUTIVES: lambda task: run_mission(
+            build_executives_prompt(task.company), task.company, EXECUTIVES, f"{run_id}:{EXECUTIVES}", mode
+        ),
+        COMPETITORS: lambda task: run_competitor_flow(task.company, f"{run_id}:{COMPETITORS}", mode),
+        MOOD: run_mood,
+    }
+    # Sub-task coroutines copy this context, so a refresh also skips cached LLM answers.
+    with bypass_llm_cache(refresh):
+        await run_subtasks(tasks, runners)
+    by_kind = {task.kind: task for task in tasks}
+
+    ran = [task for task in tasks if task.status == "ran"]
+    failed = [task for task in tasks if task.status == "failed"]
+    if failed and not ran and not any(task.status == "cached" for task in tasks):
+        raise asyncio.TimeoutError() if all(t.error == "timed out" for t in failed) else RuntimeError(failed[0].error)
+
+    profile_tasks = [by_kind[k] for k in (PROFILE, PROFILE_FACTS, EXECUTIVES) if k in by_kind]
+    if any(task.status == "ran" for task in profile_tasks):
+        try:
+            profile_view = await asyncio.wait_for(
+                run_in_threadpool(fetch_entity_profile, company), timeout=call_timeout(8)
+            )
+        except Exception:
+            pass
+
+    competitor_result = None
+    if by_kind[COMPETITORS].status == "ran":
+        competitor_result, competitors_list = by_kind[COMPETITORS].result
 
-    return {
-        "profile_result": profile_result,
+    profile_texts = [task.result for task in profile_tasks if task.status == "ran"]
+    data = {
+        "profile_result": "\n\n".join(str(t) for t in profile_texts) or None,
         "competitor_result": competitor_result,
         "profile": profile_view,
         "competitors": competitors_list,
+        "plan": [task.view() for task in tasks],
     }
+    if MOOD in by_kind:
+        data["mood"] = by_kind[MOOD].result
+    return data
 
 
 __all__ = [
+    "build_executives_prompt",
+    "build_full_profile_prompt",
+    "build_profile_facts_prompt",
     "build_profile_prompt",
     "build_competitor_prompt",
     "build_competitor_fallback_prompt",
     "filter_competitors",
     "run_competitor_flow",
     "run_company_insight",
+    "run_mission",
 ]
@@ -0,0 +1,284 @@
+import logging
+import threading
+import time
+from typing import Any
+
+import numpy as np
+
+from src.graph_db import GraphManager
+from src.relationships import SEMANTIC_PATTERN, SEMANTIC_TYPES, native_type
+from src.schema import KnowledgeGraphUpdate
+from src.services.changes import change_feed, read_write_seq
+from src.telemetry import metrics, span
+from src.tools.graph import add_commit_listener
+
+logger = logging.getLogger("landscape")
+
+_TYPE_CODES = {rel_type: code for code, rel_type in enumerate(SEMANTIC_TYPES)}
+_COMPETES = _TYPE_CODES["COMPETES_WITH"]
+
+_LOAD_ORGS = "MATCH (o:Organization) RETURN o.name AS name"
+_LOAD_EDGES = f"""
+MATCH (a:Organization)-[r:{SEMANTIC_PATTERN}]->(b:Organization)
+WHERE a <> b
+RETURN a.name AS source, b.name AS target, type(r) AS type
+"""
+
+
+def pagerank(
+    indptr: np.ndarray, indices: np.ndarray, damping: float = 0.85, iterations: int = 50, tol: float = 1e-9
+) -> np.ndarray:
+    """Power-iteration PageRank over a CSR adjacency; dangling mass is spread uniformly."""
+    n = len(indptr) - 1
+    if n == 0:
+        return np.zeros(0)
+    out_degree = np.diff(indptr)
+    sources = np.repeat(np.arange(n), out_degree)
+    dangling = out_degree == 0
+    rank = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        share = np.where(dangling, 0.0, rank / np.maximum(out_degree, 1))
+        spread = np.bincount(indices, weights=share[sources], minlength=n)
+        updated = (1 - damping) / n + damping * (spread + rank[dangling].sum() / n)
+        if np.abs(updated - rank).sum() < tol:
+            return updated
+        rank = updated
+    return rank
+
+
+class OrgProjection:
+    """
+    In-process read model of the Organization-to-Organization subgraph.
+
+    Organizations get dense integer ids; edges (every semantic type, treated as undirected)
+    live as CSR arrays (`indptr`, `indices`, `types`), so neighbor sets, 2-hop expansions,
+    degrees and PageRank are array operations instead of Cypher traversals. The projection is
+    bulk-loaded once (startup warm-up or first use) and then fed by the `insert_knowledge`
+    commit listener: new edges are appended to a pending buffer and folded into the CSR on the
+    next read. Entity merges rewrite the graph, so `dedupe` marks the projection stale and the
+    next read reloads it.
+
+    Writes from other processes (the MCP server, other replicas, the dedupe CLI) never reach the
+    listener, so reads also compare the graph write sequence with the last one applied here:
+    a sequence number that no local commit accounts for means the projection is reloaded.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._load_lock = threading.Lock()
+        self._names: list[str] = []
+        self._ids: dict[str, int] = {}
+        self._lower: dict[str, int] = {}
+        self._src = np.zeros(0, dtype=np.int64)
+        self._dst = np.zeros(0, dtype=np.int64)
+        self._typ = np.zeros(0, dtype=np.int16)
+        self._pending: list[tuple[int, int, int]] = []
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.zeros(0, dtype=np.int64)
+        self._types = np.zeros(0, dtype=np.int16)
+        self._pagerank: np.ndarray | None = None
+        self._rank_order = np.zeros(0, dtype=np.int64)
+        self._degree_order = np.zeros(0, dtype=np.int64)
+        self._loaded = False
+        self._stale = False
+        self._applied_seq = 0
+        self._local_seqs: set[int] = set()
+        self.version = 0
+        self.loaded_at: float | None = None
+
+    def _intern(self, name: str) -> int:
+        idx = self._ids.get(name)
+        if idx is None:
+            idx = self._ids[name] = len(self._names)
+            self._names.append(name)
+            self._lower.setdefault(name.lower(), idx)
+        return idx
+
+    def load(self) -> None:
+        """Bulk-load all organizations and their edges, replacing the current projection."""
+        # Read first: commits racing the load are either in the scan or in _local_seqs.
+        seq = read_write_seq()
+        with span("landscape.load") as attrs, GraphManager().session() as session:
+            names = [rec["name"] for rec in session.run(_LOAD_ORGS) if rec["name"]]
+            edges = [(rec["source"], rec["target"], rec["type"]) for rec in session.run(_LOAD_EDGES)]
+            attrs["organizations"], attrs["edges"] = len(names), len(edges)
+        with self._lock:
+            # Commits that landed while loading stay in _pending and are merged (deduplicated) below.
+            self._names, self._ids, self._lower = [], {}, {}
+            self._src = self._dst = np.zeros(0, dtype=np.int64)
+            self._typ = np.zeros(0, dtype=np.int16)
+            pending, self._pending = self._pending, []
+            for name in names:
+                self._intern(name)
+            for source, target, rel_type in edges:
+                self._add_edge(source, target, rel_type)
+            self._pending.extend(pending)
+            self._loaded, self._stale = True, False
+            self._applied_seq = seq
+            self._local_seqs = {s for s in self._local_seqs if s > seq}
+            self._advance()
+            self.loaded_at = time.time()
+            self._rebuild()
+        logger.info(f"🗺️ Landscape projection loaded: {len(names)} organizations, {len(edges)} edges")
+
+    def mark_stale(self) -> None:
+        with self._lock:
+            self._stale = True
+
+    def _advance(self) -> None:
+        """Move the applied sequence over contiguous local commits (caller holds the lock)."""
+        while self._applied_seq + 1 in self._local_seqs:
+            self._applied_seq += 1
+            self._local_seqs.discard(self._applied_seq)
+
+    def _check_external_writes(self) -> None:
+        """Mark the projection stale if the graph moved in a way no local commit explains."""
+        try:
+            current = change_feed.current_seq()
+        except Exception as e:
+            logger.warning(f"Write sequence unavailable, serving the projection as is: {e}")
+            return
+        with self._lock:
+            self._advance()
+            if current != self._applied_seq:
+                logger.info(f"🗺️ Graph at seq {current}, projection at {self._applied_seq}; reloading")
+                self._stale = True
+
+    def _add_edge(self, source: str, target: str, rel_type: str) -> None:
+        if source == target:
+            return
+        code = _TYPE_CODES.get(rel_type, _TYPE_CODES["RELATED"])
+        self._pending.append((self._intern(source), self._intern(target), code))
+
+    def apply_update(self, seq: int, data: KnowledgeGraphUpdate, name_map: dict[str, str]) -> None:
+        """Commit listener: add organizations and organization-to-organization edges from one ingest."""
+        with self._lock:
+            if seq > self._applied_seq:
+                self._local_seqs.add(seq)
+            orgs = {name_map.get(e.name, e.name) for e in data.entities if e.label == "Organization"}
+            for name in orgs:
+                self._intern(name)
+            for rel in data.relationships:
+                source = name_map.get(rel.source, rel.source)
+                target = name_map.get(rel.target, rel.target)
+                # Endpoints not in this update count only if they are already known organizations.
+                if (source in orgs or source in self._ids) and (target in orgs or target in self._ids):
+                    self._add_edge(source, target, native_type(rel.type))
+
+    def _rebuild(self) -> None:
+        """Fold pending edges into the edge list and rebuild the CSR arrays (caller holds the lock)."""
+        if self._pending:
+            added = np.array(self._pending, dtype=np.int64).reshape(-1, 3)
+            self._pending = []
+            self._src = np.concatenate([self._src, added[:, 0]])
+            self._dst = np.concatenate([self._dst, added[:, 1]])
+            self._typ = np.concatenate([self._typ, added[:, 2].astype(np.int16)])
+        n = len(self._names)
+        n_types = len(SEMANTIC_TYPES)
+        # Both directions, then one edge per (source, target, type): MERGE semantics.
+        src = np.concatenate([self._src, self._dst])
+        dst = np.concatenate([self._dst, self._src])
+        typ = np.concatenate([self._typ, self._typ]).astype(np.int64)
+        keys = np.unique((src * n + dst) * n_types + typ)
+        typ, pair = keys % n_types, keys // n_types
+        src, dst = pair // max(n, 1), pair % max(n, 1)
+        one_way = src < dst
+        self._src, self._dst, self._typ = src[one_way], dst[one_way], typ[one_way].astype(np.int16)
+        self._indptr = np.concatenate([[0], np.cumsum(np.bincount(src, minlength=n))]).astype(np.int64)
+        self._indices = dst
+        self._types = typ.astype(np.int16)
+        self._pagerank = None
+        self.version += 1
+
+    def _snapshot(self):
+        """Current CSR arrays, loading or folding in pending edges first."""
+        if self._loaded and not self._stale:
+            self._check_external_writes()
+        if not self._loaded or self._stale:
+            with self._load_lock:
+                if not self._loaded or self._stale:
+                    self.load()
+        with self._lock:
+            if self._pending or len(self._indptr) != len(self._names) + 1:
+                self._rebuild()
+            if self._pagerank is None:
+                # Global rankings change only when the projection does; computed once per version.
+                with span("landscape.pagerank", organizations=len(self._names)):
+                    self._pagerank = pagerank(self._indptr, self._indices)
+                    self._rank_order = np.argsort(-self._pagerank, kind="stable")
+                    self._degree_order = np.argsort(-np.diff(self._indptr), kind="stable")
+            # names/lower are append-only, so handing out the live objects is safe for readers.
+            return (
+                self._names,
+                self._lower,
+                self._indptr,
+                self._indices,
+                self._types,
+                self._pagerank,
+                self._rank_order,
+                self._degree_order,
+            )
+
+    def landscape(self, company: str, limit: int = 10) -> dict[str, Any] | None:
+        """
+        Competitive landscape around `company`: direct competitors, competitor-of-competitor
+        candidates ranked by how many competitors they share, and global degree / PageRank
+        rankings. None when the company is not a known organization.
+        """
+        started = time.perf_counter()
+        names, lower, indptr, indices, types, ranks, rank_order, degree_order = self._snapshot()
+        idx = lower.get(company.strip().lower())
+        if idx is None or idx >= len(ranks):
+            return None
+
+        degree = np.diff(indptr)
+        competes = types == _COMPETES
+
+        def competitors_of(nodes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+            """Competitor ids of each node in `nodes`, with the node each one came from."""
+            starts, ends = indptr[nodes], indptr[nodes + 1]
+            counts = ends - starts
+            positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            mask = competes[positions]
+            return indices[positions][mask], np.repeat(nodes, counts)[mask]
+
+        direct, _ = competitors_of(np.array([idx]))
+        direct = np.unique(direct)
+        hop2, via = competitors_of(direct)
+        keep = (hop2 != idx) & ~np.isin(hop2, direct)
+        hop2, via = hop2[keep], via[keep]
+        shared = np.bincount(hop2, minlength=len(ranks))
+        candidates = np.flatnonzero(shared)
+        candidates = candidates[np.lexsort((-ranks[candidates], -shared[candidates]))][:limit]
+
+        def entry(i: int) -> dict[str, Any]:
+            return {"name": names[i], "degree": int(degree[i]), "pagerank": round(float(ranks[i]), 6)}
+
+        result = {
+            "company": names[idx],
+            "degree": int(degree[idx]),
+            "pagerank": round(float(ranks[idx]), 6),
+            "pagerank_rank": int((ranks > ranks[idx]).sum()) + 1,
+            "competitors": [entry(i) for i in direct[np.argsort(-ranks[direct], kind="stable")]],
+            "second_degree": [
+                {**entry(i), "shared": int(shared[i]), "via": sorted(names[v] for v in np.unique(via[hop2 == i]))}
+                for i in candidates
+            ],
+            "top_by_degree": [entry(i) for i in degree_order[:limit]],
+            "top_by_pagerank": [entry(i) for i in rank_order[:limit]],
+            "projection": {
+                "organizations": len(ranks),
+                "edges": int(len(indices) // 2),
+                "version": self.version,
+                "loaded_at": self.loaded_at,
+            },
+        }
+        metrics.observe("gotham_landscape_seconds", time.perf_counter() - started, help="Landscape computation time.")
+        return result
+
+
+org_projection = OrgProjection()
+add_commit_listener(org_projection.apply_update)
+
+
+__all__ = ["OrgProjection", "org_projection", "pagerank"]
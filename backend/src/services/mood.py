@@ -1,11 +1,16 @@
+import asyncio
 import json
 import logging
 import re
-from typing import Any
+from typing import Any, AsyncIterator
 
-from langchain_google_genai import ChatGoogleGenerativeAI
+from fastapi.concurrency import run_in_threadpool
 
+from src.agent import invoke_llm
 from src.config import Config
+from src.deadline import DeadlineExceeded, call_timeout, check_deadline
+from src.llm import build_chat_model
+from src.telemetry import span
 from src.tools.search import perform_search
 
 logger = logging.getLogger("company_mood")
@@ -20,11 +25,15 @@ def _build_query(company: str, timeframe: str) -> str:
     )
 
 
-def _build_prompt(company: str, timeframe: str, sources: list[dict[str, str]]) -> str:
-    source_block = "\n\n".join(
+def _source_block(sources: list[dict[str, str]]) -> str:
+    return "\n\n".join(
         f"{idx+1}. {s.get('title','')} ({s.get('url','')})\n{s.get('content','')}"
         for idx, s in enumerate(sources)
     )
+
+
+def _build_prompt(company: str, timeframe: str, sources: list[dict[str, str]]) -> str:
+    source_block = _source_block(sources)
     return (
         "You are an analyst summarizing near-term company mood.\n"
         f"Company: {company}\n"
@@ -50,43 +59,60 @@ def _parse_json(text: str) -> dict[str, Any] | None:
         return None
 
 
-def get_company_mood(company: str, timeframe: str = "90d", max_sources: int = 3) -> dict[str, Any]:
-    """Return transient mood summary (no graph writes)."""
-    results = perform_search(_build_query(company, timeframe), max_results=max_sources)
-    sources = [
+def _build_batch_prompt(timeframe: str, pack: list[tuple[str, list[dict[str, str]]]]) -> str:
+    company_blocks = "\n\n".join(
+        f"=== COMPANY: {company} ===\n{_source_block(sources)}" for company, sources in pack
+    )
+    return (
+        "You are an analyst summarizing near-term company mood for several companies.\n"
+        f"Timeframe: last {timeframe}\n"
+        "For each company use ONLY the sources under its heading. Include financial/earnings context.\n"
+        "Return ONLY a valid JSON object keyed by the exact company name; each value has keys:\n"
+        "mood_label: one of [Positive, Neutral, Negative, Mixed, Volatile]\n"
+        "confidence: number 0-1\n"
+        "drivers: 3-5 short bullet strings\n"
+        "sources: 2-3 items with {title, url}\n"
+        "timeframe: string\n\n"
+        f"{company_blocks}"
+    )
+
+
+def _build_llm():
+    return build_chat_model(temperature=0.2)
+
+
+def _search_sources(company: str, timeframe: str, max_sources: int) -> list[dict[str, str]]:
+    results = perform_search(_build_query(company, timeframe), max_results=max_sources, focus=company)
+    return [
         {"title": r.get("title", ""), "url": r.get("url", ""), "content": r.get("content", "")}
         for r in results
         if r.get("url")
     ][:max_sources]
 
-    if not sources:
-        return {
-            "mood_label": "Mixed",
-            "confidence": 0.35,
-            "drivers": ["Insufficient recent sources to assess mood."],
-            "sources": [],
-            "timeframe": timeframe,
-        }
-
-    llm = ChatGoogleGenerativeAI(
-        model=Config.MODEL_NAME,
-        temperature=0.2,
-        max_retries=Config.LLM_MAX_RETRIES,
-        timeout=Config.LLM_TIMEOUT,
-        convert_system_message_to_human=True,
-    )
-    prompt = _build_prompt(company, timeframe, sources)
-    response = llm.invoke(prompt)
-    parsed = _parse_json(response.content if hasattr(response, "content") else str(response))
 
-    if not parsed:
-        return {
-            "mood_label": "Mixed",
-            "confidence": 0.4,
-            "drivers": ["Unable to parse model output; using fallback mood."],
-            "sources": [{"title": s.get("title"), "url": s.get("url")} for s in sources[:2]],
-            "timeframe": timeframe,
-        }
+def _no_sources_mood(timeframe: str) -> dict[str, Any]:
+    return {
+        "mood_label": "Mixed",
+        "confidence": 0.35,
+        "drivers": ["Insufficient recent sources to assess mood."],
+        "sources": [],
+        "timeframe": timeframe,
+    }
+
+
+def _fallback_mood(timeframe: str, sources: list[dict[str, str]]) -> dict[str, Any]:
+    return {
+        "mood_label": "Mixed",
+        "confidence": 0.4,
+        "drivers": ["Unable to parse model output; using fallback mood."],
+        "sources": [{"title": s.get("title"), "url": s.get("url")} for s in sources[:2]],
+        "timeframe": timeframe,
+    }
+
+
+def _shape_mood(parsed: dict[str, Any] | None, timeframe: str, sources: list[dict[str, str]]) -> dict[str, Any]:
+    if not isinstance(parsed, dict) or not parsed:
+        return _fallback_mood(timeframe, sources)
 
     mood_label = parsed.get("mood_label")
     if mood_label not in _MOOD_LABELS:
@@ -100,4 +126,131 @@ def get_company_mood(company: str, timeframe: str = "90d", max_sources: int = 3)
     }
 
 
-__all__ = ["get_company_mood"]
+def get_company_mood(company: str, timeframe: str = "90d", max_sources: int = 3) -> dict[str, Any]:
+    """Return transient mood summary (no graph writes)."""
+    sources = _search_sources(company, timeframe, max_sources)
+    if not sources:
+        return _no_sources_mood(timeframe)
+
+    llm = _build_llm()
+    prompt = _build_prompt(company, timeframe, sources)
+    check_deadline("mood.llm")
+    with span("mood.llm", companies=1):
+        response = invoke_llm(llm, prompt)
+    parsed = _parse_json(response.content if hasattr(response, "content") else str(response))
+    return _shape_mood(parsed, timeframe, sources)
+
+
+def _pack_size(sources: list[dict[str, str]]) -> int:
+    return sum(len(s.get("title", "")) + len(s.get("url", "")) + len(s.get("content", "")) for s in sources)
+
+
+def _score_pack(pack: list[tuple[str, list[dict[str, str]]]], timeframe: str) -> dict[str, dict[str, Any]]:
+    """Score several companies with one LLM call; single-company packs use the regular prompt."""
+    check_deadline("mood.llm")
+    llm = _build_llm()
+    if len(pack) == 1:
+        company, sources = pack[0]
+        with span("mood.llm", companies=1):
+            response = invoke_llm(llm, _build_prompt(company, timeframe, sources))
+        parsed = _parse_json(response.content if hasattr(response, "content") else str(response))
+        return {company: _shape_mood(parsed, timeframe, sources)}
+
+    with span("mood.llm", companies=len(pack)):
+        response = invoke_llm(llm, _build_batch_prompt(timeframe, pack))
+    parsed = _parse_json(response.content if hasattr(response, "content") else str(response)) or {}
+    if not isinstance(parsed, dict):
+        parsed = {}
+    by_lower = {str(k).strip().lower(): v for k, v in parsed.items()}
+    return {
+        company: _shape_mood(by_lower.get(company.strip().lower()), timeframe, sources)
+        for company, sources in pack
+    }
+
+
+async def stream_company_moods(
+    companies: list[str], timeframe: str = "90d", max_sources: int = 3
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    Yield one mood result per company as soon as it is ready.
+
+    Searches run concurrently; companies with sources are packed into shared LLM calls
+    bounded by Config.MOOD_BATCH_CHAR_BUDGET / MOOD_BATCH_MAX_PER_CALL, which queue for the
+    shared LLM slots like any mission. Companies cut off by the request deadline are yielded
+    with status "timeout".
+    """
+    search_sem = asyncio.Semaphore(Config.MOOD_BATCH_SEARCH_CONCURRENCY)
+    llm_sem = asyncio.Semaphore(Config.MOOD_BATCH_LLM_CONCURRENCY)
+
+    async def search(company: str):
+        async with search_sem:
+            try:
+                sources = await run_in_threadpool(_search_sources, company, timeframe, max_sources)
+            except DeadlineExceeded:
+                sources = None
+            except Exception as e:
+                logger.error(f"Mood batch search failed for {company}: {e}")
+                sources = []
+        return "search", (company, sources)
+
+    async def score(pack: list[tuple[str, list[dict[str, str]]]]):
+        async with llm_sem:
+            try:
+                moods = await asyncio.wait_for(
+                    run_in_threadpool(_score_pack, pack, timeframe),
+                    timeout=call_timeout(Config.RUN_MISSION_TIMEOUT),
+                )
+            except (asyncio.TimeoutError, DeadlineExceeded):
+                return "timeout", [company for company, _ in pack]
+            except Exception as e:
+                logger.error(f"Mood batch scoring failed for {[c for c, _ in pack]}: {e}")
+                moods = {company: _fallback_mood(timeframe, sources) for company, sources in pack}
+        return "scored", moods
+
+    tasks = {asyncio.ensure_future(search(c)) for c in companies}
+    searches_left = len(companies)
+    pack: list[tuple[str, list[dict[str, str]]]] = []
+    pack_chars = 0
+
+    try:
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                kind, payload = task.result()
+                if kind == "timeout":
+                    for company in payload:
+                        yield {"company": company, "status": "timeout", "timeframe": timeframe}
+                    continue
+                if kind == "scored":
+                    for company, mood in payload.items():
+                        yield {"company": company, **mood}
+                    continue
+
+                searches_left -= 1
+                company, sources = payload
+                if sources is None:
+                    yield {"company": company, "status": "timeout", "timeframe": timeframe}
+                    continue
+                if not sources:
+                    yield {"company": company, **_no_sources_mood(timeframe)}
+                    continue
+
+                size = _pack_size(sources)
+                if pack and (
+                    pack_chars + size > Config.MOOD_BATCH_CHAR_BUDGET
+                    or len(pack) >= Config.MOOD_BATCH_MAX_PER_CALL
+                ):
+                    tasks.add(asyncio.ensure_future(score(pack)))
+                    pack, pack_chars = [], 0
+                pack.append((company, sources))
+                pack_chars += size
+
+            if searches_left == 0 and pack:
+                tasks.add(asyncio.ensure_future(score(pack)))
+                pack, pack_chars = [], 0
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+__all__ = ["get_company_mood", "stream_company_moods"]
@@ -0,0 +1,176 @@
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from src.config import Config
+from src.telemetry import metrics, span
+
+logger = logging.getLogger("planner")
+
+PROFILE = "profile"  # profile_facts + executives as one mission
+PROFILE_FACTS = "profile_facts"
+EXECUTIVES = "executives"
+COMPETITORS = "competitors"
+MOOD = "mood"
+
+_LOCATION_KEYS = ("headquarters", "hq", "country", "location", "city")
+_FOUNDED_KEYS = ("founded", "founded_year", "year_founded", "founding_year", "founded_in")
+_LOCATION_TYPES = {"HEADQUARTERED_IN", "LOCATED_IN"}
+_EXECUTIVE_TYPES = {"CEO_OF", "FOUNDED", "WORKS_FOR", "BOARD_MEMBER_OF", "ADVISES"}
+
+
+@dataclass
+class SubTask:
+    kind: str
+    company: str
+    status: str = "pending"  # pending -> cached | ran | failed
+    elapsed_ms: float = 0.0
+    result: Any = None
+    error: str | None = None
+    reason: str | None = None
+
+    def view(self) -> dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "status": self.status,
+            "elapsed_ms": round(self.elapsed_ms, 1),
+            "reason": self.reason,
+            "error": self.error,
+        }
+
+
+def has_profile_facts(profile: dict | None) -> bool:
+    """Location and founding year are known, as node properties or location edges."""
+    if not profile:
+        return False
+    props = {k.lower(): v for k, v in (profile.get("properties") or {}).items() if v not in (None, "", [])}
+    has_location = any(k in props for k in _LOCATION_KEYS) or any(
+        r.get("type") in _LOCATION_TYPES for r in profile.get("related") or []
+    )
+    has_founded = any(k in props for k in _FOUNDED_KEYS)
+    return has_location and has_founded
+
+
+def executives_from_profile(profile: dict | None) -> list[dict]:
+    if not profile:
+        return []
+    return [
+        r
+        for r in profile.get("related") or []
+        if "Person" in (r.get("labels") or []) and r.get("type") in _EXECUTIVE_TYPES
+    ]
+
+
+class MoodCache:
+    """Small TTL cache so repeated missions for a company reuse a recent mood result."""
+
+    def __init__(self):
+        self._items: dict[tuple[str, str], tuple[float, dict]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, company: str, timeframe: str) -> dict | None:
+        with self._lock:
+            hit = self._items.get((company.lower(), timeframe))
+            if hit and hit[0] > time.monotonic():
+                return hit[1]
+            return None
+
+    def put(self, company: str, timeframe: str, value: dict) -> None:
+        with self._lock:
+            self._items[(company.lower(), timeframe)] = (time.monotonic() + Config.PLANNER_MOOD_TTL, value)
+
+
+mood_cache = MoodCache()
+
+
+def plan_company_insight(
+    company: str,
+    profile: dict | None,
+    competitors: list[dict],
+    include_mood: bool = False,
+    timeframe: str = "90d",
+    refresh: bool = False,
+) -> list[SubTask]:
+    """
+    Split a company request into typed sub-tasks and mark those the graph or cache already answer.
+
+    When neither profile half is known, they are planned as one PROFILE mission: one agent loop
+    (and one LLM slot) instead of two, each paying for its own searches. They are only split when
+    one half is already cached.
+    """
+    tasks = [SubTask(PROFILE_FACTS, company), SubTask(EXECUTIVES, company), SubTask(COMPETITORS, company)]
+    if include_mood:
+        tasks.append(SubTask(MOOD, company))
+    if refresh:
+        for task in tasks:
+            task.reason = "refresh requested"
+        return _merge_profile(tasks)
+
+    for task in tasks:
+        if task.kind == PROFILE_FACTS and has_profile_facts(profile):
+            task.status, task.reason = "cached", "location and founding year in graph"
+        elif task.kind == EXECUTIVES:
+            found = executives_from_profile(profile)
+            if len(found) >= Config.PLANNER_MIN_EXECUTIVES:
+                task.status, task.reason = "cached", f"{len(found)} executives in graph"
+        elif task.kind == COMPETITORS and len(competitors) >= Config.PLANNER_MIN_COMPETITORS:
+            task.status, task.reason = "cached", f"{len(competitors)} competitors in graph"
+        elif task.kind == MOOD:
+            cached = mood_cache.get(company, timeframe)
+            if cached is not None:
+                task.status, task.reason, task.result = "cached", "recent mood result", cached
+    return _merge_profile(tasks)
+
+
+def _merge_profile(tasks: list[SubTask]) -> list[SubTask]:
+    facts, executives = tasks[0], tasks[1]
+    if facts.status == executives.status == "pending":
+        reason = facts.reason or "no profile facts or executives in graph"
+        return [SubTask(PROFILE, facts.company, reason=reason), *tasks[2:]]
+    return tasks
+
+
+Runner = Callable[[SubTask], Awaitable[Any]]
+
+
+async def run_subtasks(tasks: list[SubTask], runners: dict[str, Runner]) -> list[SubTask]:
+    """Run every pending sub-task concurrently; failures are recorded per task, not raised."""
+
+    async def execute(task: SubTask) -> None:
+        started = time.perf_counter()
+        try:
+            with span("planner.subtask", kind=task.kind):
+                task.result = await runners[task.kind](task)
+            task.status = "ran"
+        except Exception as e:
+            task.status = "failed"
+            task.error = "timed out" if isinstance(e, asyncio.TimeoutError) else str(e)
+            logger.warning(f"Sub-task {task.kind} for '{task.company}' failed: {task.error}")
+        finally:
+            task.elapsed_ms = (time.perf_counter() - started) * 1000
+
+    pending = [task for task in tasks if task.status == "pending"]
+    await asyncio.gather(*(execute(task) for task in pending))
+    for task in tasks:
+        metrics.inc("gotham_planner_subtasks_total", help="Planner sub-tasks by outcome.", kind=task.kind, outcome=task.status)
+    summary = ", ".join(f"{t.kind}={t.status}" for t in tasks)
+    logger.info(f"🧭 Plan for '{tasks[0].company if tasks else '?'}': {summary}")
+    return tasks
+
+
+__all__ = [
+    "COMPETITORS",
+    "EXECUTIVES",
+    "MOOD",
+    "PROFILE",
+    "PROFILE_FACTS",
+    "SubTask",
+    "executives_from_profile",
+    "has_profile_facts",
+    "mood_cache",
+    "plan_company_insight",
+    "run_subtasks",
+]
@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable
+
+from fastapi.concurrency import run_in_threadpool
+
+from src.config import Config
+from src.telemetry import metrics
+
+logger = logging.getLogger("startup")
+
+
+def _warm_graph() -> None:
+    from src.graph_db import GraphManager
+
+    # Driver pool, connectivity check and the constraint/index DDL.
+    GraphManager()
+
+
+def _warm_agent() -> None:
+    from src.agent import get_agent_executor
+
+    get_agent_executor()
+
+
+def _warm_llms() -> None:
+    from src.services.extraction import _get_structured_llm
+    from src.services.mood import _build_llm
+
+    _build_llm()
+    _get_structured_llm()
+
+
+def _warm_landscape() -> None:
+    from src.services.landscape import org_projection
+
+    org_projection.load()
+
+
+def _warm_migrations() -> None:
+    if Config.MIGRATE_ON_STARTUP:
+        from src.migrations import run_migrations
+
+        # Idempotent and batched; e.g. 0004 dates legacy Documents so the timeline shows them.
+        run_migrations()
+
+
+def _warm_entity_index() -> None:
+    if Config.SEMANTIC_RESOLUTION:
+        from src.services.entity_index import get_entity_index
+
+        get_entity_index()
+
+
+# Independent components, warmed concurrently; the agent build pays for the heavy LLM imports.
+WARMUP_STEPS: dict[str, Callable[[], None]] = {
+    "graph": _warm_graph,
+    "migrations": _warm_migrations,
+    "agent": _warm_agent,
+    "llm": _warm_llms,
+    "landscape": _warm_landscape,
+    "entity_index": _warm_entity_index,
+}
+
+
+class WarmupState:
+    """Per-component warm-up status (pending -> ready | failed, or skipped) reported by /ready."""
+
+    def __init__(self):
+        self.started_at: float | None = None
+        self.components: dict[str, dict[str, Any]] = {name: {"status": "pending"} for name in WARMUP_STEPS}
+
+    @property
+    def ready(self) -> bool:
+        return all(c["status"] in ("ready", "skipped") for c in self.components.values())
+
+    def skip(self) -> None:
+        self.components = {name: {"status": "skipped"} for name in WARMUP_STEPS}
+
+    def view(self) -> dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "uptime_s": round(time.monotonic() - self.started_at, 1) if self.started_at else None,
+            "components": self.components,
+        }
+
+
+warmup_state = WarmupState()
+
+
+async def _warm(name: str, step: Callable[[], None], retry: bool = False) -> None:
+    delay, attempts = Config.WARMUP_RETRY_SECONDS, 0
+    while True:
+        attempts += 1
+        started = time.perf_counter()
+        try:
+            await run_in_threadpool(step)
+            warmup_state.components[name] = {"status": "ready", "attempts": attempts}
+        except Exception as e:
+            warmup_state.components[name] = {"status": "failed", "error": str(e), "attempts": attempts}
+            logger.warning(f"Warm-up of {name} failed (attempt {attempts}): {e}")
+        elapsed = time.perf_counter() - started
+        component = warmup_state.components[name]
+        component["elapsed_ms"] = round(elapsed * 1000, 1)
+        metrics.observe("gotham_warmup_seconds", elapsed, help="Startup warm-up time per component.", component=name)
+        if component["status"] == "ready" or not retry:
+            return
+        # A dependency that was down at boot (Neo4j, an API key) should not keep /ready at 503 forever.
+        component["retry_in_s"] = delay
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, Config.WARMUP_RETRY_MAX_SECONDS)
+
+
+async def run_warmup(retry: bool = False) -> WarmupState:
+    """
+    Build the Neo4j driver, agent, LLM clients and in-process indexes before the first request
+    needs them. With `retry`, failed steps are re-run with backoff until they succeed.
+    """
+    warmup_state.started_at = time.monotonic()
+    await asyncio.gather(*(_warm(name, step, retry) for name, step in WARMUP_STEPS.items()))
+    summary = ", ".join(f"{name}={c['status']}" for name, c in warmup_state.components.items())
+    logger.info(f"🔥 Warm-up finished: {summary}")
+    return warmup_state
+
+
+__all__ = ["WARMUP_STEPS", "run_warmup", "warmup_state"]
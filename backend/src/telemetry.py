@@ -0,0 +1,205 @@
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from src.config import Config
+
+logger = logging.getLogger("telemetry")
+
+# Prometheus-style latency buckets (seconds): sub-ms Cypher up to multi-minute missions.
+_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, float("inf"))
+
+_thread_id: contextvars.ContextVar[str | None] = contextvars.ContextVar("gotham_thread_id", default=None)
+
+
+def current_thread_id() -> str | None:
+    return _thread_id.get()
+
+
+@contextmanager
+def bind_thread_id(thread_id: str | None) -> Iterator[None]:
+    """Attach a mission thread_id to every span started in this context (threadpool-safe)."""
+    token = _thread_id.set(thread_id)
+    try:
+        yield
+    finally:
+        _thread_id.reset(token)
+
+
+def _label_key(labels: dict[str, str]) -> tuple[tuple[str, str], ...]:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: tuple[tuple[str, str], ...], extra: tuple[tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class MetricsRegistry:
+    """Thread-safe counters and latency histograms rendered in Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[tuple, float]] = {}
+        self._histograms: dict[str, dict[tuple, list]] = {}
+        self._help: dict[str, str] = {}
+
+    def inc(self, name: str, value: float = 1.0, help: str | None = None, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+            if help:
+                self._help.setdefault(name, help)
+
+    def observe(self, name: str, seconds: float, help: str | None = None, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            # [bucket counts..., sum, count]
+            state = series.setdefault(key, [0] * len(_BUCKETS) + [0.0, 0])
+            for idx, bound in enumerate(_BUCKETS):
+                if seconds <= bound:
+                    state[idx] += 1
+            state[-2] += seconds
+            state[-1] += 1
+            if help:
+                self._help.setdefault(name, help)
+
+    def counter_value(self, name: str, **labels) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_key(labels), 0.0)
+
+    def histogram_count(self, name: str, **labels) -> int:
+        with self._lock:
+            state = self._histograms.get(name, {}).get(_label_key(labels))
+            return state[-1] if state else 0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render_prometheus(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            for name in sorted(self._counters):
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+            for name in sorted(self._histograms):
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, state in sorted(self._histograms[name].items()):
+                    for idx, bound in enumerate(_BUCKETS):
+                        le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                        lines.append(f"{name}_bucket{_format_labels(key, (('le', le),))} {state[idx]}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {state[-2]:.6f}")
+                    lines.append(f"{name}_count{_format_labels(key)} {state[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+_otel_tracer = None
+_otel_checked = False
+_otel_lock = threading.Lock()
+
+
+def _get_otel_tracer():
+    """OpenTelemetry tracer when OTEL_EXPORTER_OTLP_ENDPOINT is set and the SDK is installed."""
+    global _otel_tracer, _otel_checked
+    if _otel_checked:
+        return _otel_tracer
+    with _otel_lock:
+        if _otel_checked:
+            return _otel_tracer
+        _otel_checked = True
+        if not Config.OTEL_EXPORTER_OTLP_ENDPOINT:
+            return None
+        try:
+            from opentelemetry import trace
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        except ImportError:
+            logger.warning("OTEL_EXPORTER_OTLP_ENDPOINT set but opentelemetry-sdk is not installed; spans stay local.")
+            return None
+        provider = TracerProvider(resource=Resource.create({"service.name": Config.OTEL_SERVICE_NAME}))
+        endpoint = Config.OTEL_EXPORTER_OTLP_ENDPOINT.rstrip("/")
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=f"{endpoint}/v1/traces")))
+        trace.set_tracer_provider(provider)
+        _otel_tracer = trace.get_tracer("gotham")
+        return _otel_tracer
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[dict]:
+    """
+    Time a unit of work into `gotham_span_duration_seconds{span=name}`.
+
+    The mission thread_id is attached automatically; the yielded dict can be used to add
+    attributes before the span closes. Mirrored to OpenTelemetry when configured.
+    """
+    attributes = {k: v for k, v in attrs.items() if v is not None}
+    thread_id = current_thread_id()
+    if thread_id:
+        attributes["thread_id"] = thread_id
+
+    tracer = _get_otel_tracer()
+    otel_cm = tracer.start_as_current_span(name) if tracer else None
+    otel_span = otel_cm.__enter__() if otel_cm else None
+
+    status = "ok"
+    start = time.perf_counter()
+    try:
+        yield attributes
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.observe(
+            "gotham_span_duration_seconds", elapsed, help="Latency of traced stages.", span=name, status=status
+        )
+        logger.debug(f"span {name} {elapsed * 1000:.1f}ms status={status} {attributes}")
+        if otel_span is not None:
+            for key, value in attributes.items():
+                otel_span.set_attribute(key, value if isinstance(value, (str, bool, int, float)) else str(value))
+            otel_span.set_attribute("status", status)
+        if otel_cm is not None:
+            otel_cm.__exit__(None, None, None)
+
+
+def record_span(name: str, elapsed: float, status: str = "ok", **attrs) -> None:
+    """Record an already-measured stage (e.g. from a callback or a lazily consumed result)."""
+    metrics.observe("gotham_span_duration_seconds", elapsed, help="Latency of traced stages.", span=name, status=status)
+    tracer = _get_otel_tracer()
+    if tracer is None:
+        return
+    end_ns = time.time_ns()
+    otel_span = tracer.start_span(name, start_time=end_ns - int(elapsed * 1e9))
+    thread_id = current_thread_id()
+    if thread_id:
+        otel_span.set_attribute("thread_id", thread_id)
+    for key, value in attrs.items():
+        if value is not None:
+            otel_span.set_attribute(key, value if isinstance(value, (str, bool, int, float)) else str(value))
+    otel_span.set_attribute("status", status)
+    otel_span.end(end_time=end_ns)
+
+
+__all__ = ["bind_thread_id", "current_thread_id", "metrics", "MetricsRegistry", "record_span", "span"]
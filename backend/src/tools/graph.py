@@ -1,12 +1,19 @@
 import logging
 import re
+from collections import defaultdict
 from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Callable
 
 from langchain_core.tools import tool
 
 from src.config import Config
+from src.constants import EDGE_SOURCE_URLS_MAX
 from src.graph_db import GraphManager
+from src.relationships import FALLBACK_TYPE, SYMMETRIC_TYPES, native_type, normalize_rel_type
 from src.schema import KnowledgeGraphUpdate
+from src.tools.sources import current_mission, source_registry
+from src.telemetry import metrics, span
 
 logger = logging.getLogger("graph_ops")
 
@@ -36,22 +43,76 @@ def _similarity(a: str, b: str) -> float:
     return SequenceMatcher(None, _normalize_name(a), _normalize_name(b)).ratio()
 
 
-def resolve_entity(session, name, label):
-    exact = session.run(f"MATCH (n:{label}) WHERE n.name = $name RETURN n.name", name=name).single()
-    if exact:
-        return exact[0]
+def _count_resolution(outcome: str) -> None:
+    metrics.inc("gotham_entity_resolution_total", help="Entity resolution outcomes.", outcome=outcome)
 
-    fuzzy = _find_fuzzy_match(session, name, label)
-    if fuzzy:
-        candidate = fuzzy["name"]
-        score = fuzzy["score"]
-        similarity = _similarity(name, candidate)
-        if similarity >= 0.85:
-            logger.info(f"🔄 Merging '{name}' -> Existing '{candidate}' ({score:.2f}, sim {similarity:.2f})")
+
+def get_entity_index(wait: bool = True):
+    # numpy and the embedder are imported only once semantic resolution is in use.
+    from src.services.entity_index import get_entity_index as shared_index
+
+    return shared_index(wait)
+
+
+def _semantic_context(props: dict | None) -> str:
+    if not Config.SEMANTIC_RESOLUTION:
+        return ""
+    from src.services.entity_index import context_text
+
+    return context_text(props)
+
+
+def _find_semantic_match(session, name, label, context=""):
+    """
+    Nearest alias in the local embedding index, confirmed to still exist in the graph. None
+    while the index is still loading, so resolution never waits on its build.
+    """
+    try:
+        index = get_entity_index(wait=False)
+        if not index.ready:
+            return None
+        candidates = index.query(name, label, context, k=3)
+    except Exception as e:
+        logger.warning(f"Semantic resolution unavailable: {e}")
+        return None
+    for candidate, score in candidates:
+        if score < Config.SEMANTIC_RESOLUTION_THRESHOLD:
+            break
+        if candidate == name:
+            continue
+        exists = session.run(f"MATCH (n:{label}) WHERE n.name = $name RETURN n.name", name=candidate).single()
+        if exists:
+            logger.info(f"🧭 Merging '{name}' -> Existing '{candidate}' (semantic {score:.2f})")
             return candidate
-        logger.info(f"⚠️ Skipping fuzzy match '{name}' -> '{candidate}' ({score:.2f}, sim {similarity:.2f})")
+    return None
 
-    return name
+
+def resolve_entity(session, name, label, context=""):
+    with span("graph.resolve_entity", label=label):
+        exact = session.run(f"MATCH (n:{label}) WHERE n.name = $name RETURN n.name", name=name).single()
+        if exact:
+            _count_resolution("exact")
+            return exact[0]
+
+        fuzzy = _find_fuzzy_match(session, name, label)
+        if fuzzy:
+            candidate = fuzzy["name"]
+            score = fuzzy["score"]
+            similarity = _similarity(name, candidate)
+            if similarity >= 0.85:
+                logger.info(f"🔄 Merging '{name}' -> Existing '{candidate}' ({score:.2f}, sim {similarity:.2f})")
+                _count_resolution("fuzzy")
+                return candidate
+            logger.info(f"⚠️ Skipping fuzzy match '{name}' -> '{candidate}' ({score:.2f}, sim {similarity:.2f})")
+
+        if Config.SEMANTIC_RESOLUTION:
+            semantic = _find_semantic_match(session, name, label, context)
+            if semantic:
+                _count_resolution("semantic")
+                return semantic
+
+        _count_resolution("new")
+        return name
 
 
 def _is_primitive(val) -> bool:
@@ -75,55 +136,258 @@ def _sanitize_props(props: dict | None) -> dict:
     return safe
 
 
-def insert_knowledge(data: KnowledgeGraphUpdate) -> str:
-    db = GraphManager()
-    logger.info(f"Ingesting: {data.source_url}")
+CommitListener = Callable[[int, KnowledgeGraphUpdate, dict[str, str]], None]
+_commit_listeners: list[CommitListener] = []
 
-    with db.session() as session:
-        session.run(
-            "MERGE (d:Document {url: $url}) ON CREATE SET d.created_at = timestamp()", url=data.source_url
-        )
 
-        name_map = {}
-        for entity in data.entities:
-            final_name = resolve_entity(session, entity.name, entity.label)
-            name_map[entity.name] = final_name
-            safe_entity_props = _sanitize_props(entity.properties)
-            session.run(
-                f"MERGE (e:{entity.label} {{name: $name}}) ON CREATE SET e += $props ON MATCH SET e += $props",
-                name=final_name,
-                props=safe_entity_props,
+def add_commit_listener(listener: CommitListener) -> None:
+    """Register a callback invoked with (write_seq, update, resolved names) after each committed ingest."""
+    if listener not in _commit_listeners:
+        _commit_listeners.append(listener)
+
+
+def _next_write_seq(tx) -> int:
+    # The MERGE+SET takes a write lock on the sequence node until commit, so sequence
+    # numbers are handed out in commit order.
+    return tx.run(
+        "MERGE (s:WriteSequence {name: 'graph'}) ON CREATE SET s.value = 0 "
+        "SET s.value = s.value + 1 RETURN s.value AS seq"
+    ).single()["seq"]
+
+
+_STAMP_WRITE_SEQ = """
+MERGE (s:WriteSequence {name: 'graph'}) ON CREATE SET s.value = 0
+SET s.value = s.value + 1
+WITH s.value AS seq
+CALL (seq) {
+    UNWIND $node_ids AS id
+    MATCH (n) WHERE elementId(n) = id
+    SET n.write_seq = seq
+}
+CALL (seq) {
+    UNWIND $rel_ids AS id
+    MATCH ()-[r]->() WHERE elementId(r) = id
+    SET r.write_seq = seq
+}
+RETURN seq
+"""
+
+
+def _stamp_write_seq(tx, node_ids: list[str], rel_ids: list[str]) -> int:
+    """
+    Take the next sequence number and stamp it on everything an update wrote.
+
+    Must be the last statement before commit: the sequence node's write lock serializes
+    ingests, so it is only held between this statement and the commit, not across entity
+    resolution. Numbers are still handed out in commit order.
+    """
+    return tx.run(_STAMP_WRITE_SEQ, node_ids=node_ids, rel_ids=rel_ids).single()["seq"]
+
+
+def _collected_ids(result) -> list[str]:
+    rec = result.single() if result is not None else None
+    return list(rec["ids"] or []) if rec else []
+
+
+_ENTITY_LABELS = ("Person", "Organization", "Location", "Topic")
+
+
+def _match_entity(var: str, name_expr: str, label: str | None) -> str:
+    """Index-backed lookup of an entity by name; unknown labels fan out over one seek per label."""
+    if label:
+        return f"MATCH ({var}:{label} {{name: {name_expr}}})"
+    branches = "\n        UNION\n        ".join(
+        f"MATCH (x:{candidate} {{name: {name_expr}}}) RETURN x AS {var}" for candidate in _ENTITY_LABELS
+    )
+    return f"CALL (row) {{\n        {branches}\n    }}"
+
+
+@lru_cache(maxsize=None)
+def _relationship_merge_query(rel_type: str, source_label: str | None, target_label: str | None) -> str:
+    """Batched MERGE for one (type, source label, target label) group; types and labels cannot be parameters."""
+    key = " {type: row.type}" if rel_type == FALLBACK_TYPE else ""
+    arrow = "-" if rel_type in SYMMETRIC_TYPES else "->"
+    return f"""
+    UNWIND $rels AS row
+    {_match_entity("s", "row.s", source_label)}
+    {_match_entity("t", "row.t", target_label)}
+    MERGE (s)-[r:{rel_type}{key}]{arrow}(t)
+    ON CREATE SET r.created_at = timestamp()
+    SET r += row.props,
+        r.source_urls = CASE
+            WHEN $url IN coalesce(r.source_urls, []) THEN r.source_urls
+            ELSE (coalesce(r.source_urls, []) + $url)[-$max_sources..]
+        END
+    RETURN collect(elementId(r)) AS ids
+    """
+
+
+@lru_cache(maxsize=None)
+def _mentions_query(label: str | None) -> str:
+    return f"""
+    MATCH (d:Document {{url: $url}})
+    UNWIND $names AS name
+    WITH d, {{s: name}} AS row
+    {_match_entity("e", "row.s", label)}
+    MERGE (d)-[m:MENTIONS]->(e)
+    ON CREATE SET m.created_at = timestamp()
+    """
+
+
+def _apply_update(tx, data: KnowledgeGraphUpdate) -> tuple[list[str], list[str], int, dict[str, str]]:
+    """Write one update without a sequence number; returns the written node and edge ids."""
+    doc = tx.run(
+        "MERGE (d:Document {url: $url}) "
+        "SET d.created_at = coalesce(d.created_at, timestamp()), "
+        "d.content_hash = coalesce($content_hash, d.content_hash), "
+        "d.missions = CASE WHEN $mission IS NULL OR $mission IN coalesce(d.missions, []) "
+        "THEN d.missions ELSE coalesce(d.missions, []) + $mission END "
+        "RETURN collect(elementId(d)) AS ids",
+        url=data.source_url,
+        content_hash=source_registry.hash_for(data.source_url),
+        mission=current_mission(),
+    )
+    node_ids = _collected_ids(doc)
+    rel_ids: list[str] = []
+
+    name_map: dict[str, str] = {}
+    label_of: dict[str, str] = {}
+    entity_rows: dict[str, dict[str, dict]] = defaultdict(dict)
+    for entity in data.entities:
+        final_name = resolve_entity(tx, entity.name, entity.label, _semantic_context(entity.properties))
+        name_map[entity.name] = final_name
+        label_of[final_name] = entity.label
+        row = entity_rows[entity.label].setdefault(final_name, {"name": final_name, "props": {}})
+        row["props"].update(_sanitize_props(entity.properties))
+
+    for label, rows in entity_rows.items():
+        node_ids += _collected_ids(
+            tx.run(
+                f"UNWIND $entities AS row MERGE (e:{label} {{name: row.name}}) "
+                "ON CREATE SET e += row.props, e.created_at = timestamp() ON MATCH SET e += row.props "
+                "RETURN collect(elementId(e)) AS ids",
+                entities=list(rows.values()),
             )
+        )
 
-        count = 0
-        for rel in data.relationships:
-            s_name = name_map.get(rel.source, rel.source)
-            t_name = name_map.get(rel.target, rel.target)
-
-            safe_props = _sanitize_props(rel.properties)
-
-            session.run(
-                """
-                MATCH (d:Document {url: $url})
-                WITH d
-                MATCH (s {name: $s})
-                WITH d, s
-                MATCH (t {name: $t})
-                MERGE (s)-[r:RELATED {type: $type}]->(t) SET r += $props
-                MERGE (d)-[:MENTIONS]->(s)
-                MERGE (d)-[:MENTIONS]->(t)
-                """,
-                s=s_name,
-                t=t_name,
+    grouped: dict[tuple[str, str | None, str | None], list[dict]] = defaultdict(list)
+    mentioned: dict[str, str | None] = dict(label_of)
+    for rel in data.relationships:
+        props = _sanitize_props(rel.properties)
+        props.pop("type", None)  # the edge type itself is authoritative
+        s_name = name_map.get(rel.source, rel.source)
+        t_name = name_map.get(rel.target, rel.target)
+        mentioned.setdefault(s_name, None)
+        mentioned.setdefault(t_name, None)
+        key = (native_type(rel.type), label_of.get(s_name), label_of.get(t_name))
+        grouped[key].append({"s": s_name, "t": t_name, "type": normalize_rel_type(rel.type), "props": props})
+
+    count = 0
+    for (rel_type, s_label, t_label), rows in grouped.items():
+        rel_ids += _collected_ids(
+            tx.run(
+                _relationship_merge_query(rel_type, s_label, t_label),
+                rels=rows,
                 url=data.source_url,
-                type=rel.type,
-                props=safe_props,
+                max_sources=EDGE_SOURCE_URLS_MAX,
             )
-            count += 1
+        )
+        count += len(rows)
+
+    # Provenance: each (document, entity) mention is written once per update, including
+    # entities that appear without any relationship.
+    by_label: dict[str | None, list[str]] = defaultdict(list)
+    for name, label in mentioned.items():
+        by_label[label].append(name)
+    for label, names in by_label.items():
+        tx.run(_mentions_query(label), names=names, url=data.source_url)
+
+    return node_ids, rel_ids, count, name_map
+
+
+def _write_update(tx, data: KnowledgeGraphUpdate) -> tuple[int, int, dict[str, str]]:
+    node_ids, rel_ids, count, name_map = _apply_update(tx, data)
+    seq = _stamp_write_seq(tx, node_ids, rel_ids)
+    return seq, count, name_map
+
+
+def _notify_listeners(seq: int, data: KnowledgeGraphUpdate, name_map: dict[str, str]) -> None:
+    for listener in _commit_listeners:
+        try:
+            listener(seq, data, name_map)
+        except Exception as e:
+            logger.warning(f"Commit listener failed: {e}")
 
+
+def insert_knowledge(data: KnowledgeGraphUpdate) -> str:
+    db = GraphManager()
+    logger.info(f"Ingesting: {data.source_url}")
+
+    with span("graph.insert_knowledge", entities=len(data.entities), relationships=len(data.relationships)):
+        with db.session() as session:
+            seq, count, name_map = session.execute_write(_write_update, data)
+
+    _notify_listeners(seq, data, name_map)
     return f"Ingested {len(data.entities)} entities, {count} relationships."
 
 
+def _write_updates(tx, updates: list[KnowledgeGraphUpdate]) -> list[tuple[int, int, dict[str, str]]]:
+    # All writes first, then one sequence number per update, so the sequence lock is only
+    # held for the stamping statements and the commit.
+    applied = [_apply_update(tx, data) for data in updates]
+    return [
+        (_stamp_write_seq(tx, node_ids, rel_ids), count, name_map)
+        for node_ids, rel_ids, count, name_map in applied
+    ]
+
+
+def insert_knowledge_batch(updates: list[KnowledgeGraphUpdate]) -> str:
+    """
+    Ingest several updates in one write transaction (one commit round trip instead of one
+    per update). Each update still gets its own write sequence number and listener call;
+    if any update fails, none of the batch is committed.
+    """
+    if not updates:
+        return "Ingested 0 updates."
+    db = GraphManager()
+    logger.info(f"Ingesting batch of {len(updates)} updates")
+
+    with span("graph.insert_knowledge_batch", updates=len(updates)):
+        with db.session() as session:
+            written = session.execute_write(_write_updates, updates)
+
+    for data, (seq, _count, name_map) in zip(updates, written):
+        _notify_listeners(seq, data, name_map)
+    entities = sum(len(data.entities) for data in updates)
+    relationships = sum(count for _seq, count, _map in written)
+    return f"Ingested {len(updates)} updates: {entities} entities, {relationships} relationships."
+
+
+def _update_entity_index(_seq: int, data: KnowledgeGraphUpdate, name_map: dict[str, str]) -> None:
+    """Teach the semantic index each ingested surface form and the node it resolved to."""
+    if not Config.SEMANTIC_RESOLUTION:
+        return
+    items = []
+    for entity in data.entities:
+        canonical = name_map.get(entity.name, entity.name)
+        context = _semantic_context(entity.properties)
+        items.append((canonical, canonical, entity.label, context))
+        if entity.name != canonical:
+            items.append((entity.name, canonical, entity.label, context))
+    get_entity_index(wait=False).add_many(items)
+
+
+add_commit_listener(_update_entity_index)
+
+
+def _record_source(_seq: int, data: KnowledgeGraphUpdate, _name_map: dict[str, str]) -> None:
+    """Later searches should see this document as already ingested."""
+    source_registry.record(data.source_url, source_registry.hash_for(data.source_url), current_mission())
+
+
+add_commit_listener(_record_source)
+
+
 def lookup_entity(name: str) -> str:
     db = GraphManager()
     with db.session() as session:
@@ -142,13 +406,22 @@ def save_to_graph(data: KnowledgeGraphUpdate):
     """Save extracted entities and relationships to the Knowledge Graph."""
     if isinstance(data, dict):
         data = KnowledgeGraphUpdate(**data)
-    return insert_knowledge(data)
+    with span("tool.save_to_graph"):
+        return insert_knowledge(data)
 
 
 @tool
 def check_graph(name: str):
     """Check if an entity already exists (fuzzy) to prevent duplicates."""
-    return lookup_entity(name)
-
-
-__all__ = ["insert_knowledge", "lookup_entity", "save_to_graph", "check_graph"]
+    with span("tool.check_graph"):
+        return lookup_entity(name)
+
+
+__all__ = [
+    "add_commit_listener",
+    "insert_knowledge",
+    "insert_knowledge_batch",
+    "lookup_entity",
+    "save_to_graph",
+    "check_graph",
+]
@@ -4,31 +4,76 @@ from langchain_core.tools import tool
 from tavily import TavilyClient
 
 from src.config import Config
+from src.constants import SEARCH_CONTENT_CHARS
+from src.deadline import call_timeout, check_deadline
+from src.llm_cache import llm_cache_bypassed
+from src.telemetry import metrics, span
+from src.tools.snippets import compact_results, estimate_tokens
+from src.tools.sources import current_mission, screen_known_sources
 
 logger = logging.getLogger("tavily_search")
 
 
-def perform_search(query: str, max_results: int = 3) -> list[dict]:
-    """Plain Tavily search wrapper."""
+def perform_search(
+    query: str,
+    max_results: int = 3,
+    focus: str | None = None,
+    known_sources: str = "off",
+    mission: str | None = None,
+) -> list[dict]:
+    """
+    Tavily search wrapper. Sources already ingested as Document nodes (by `mission`'s kind, when
+    given) are marked or filtered per `known_sources` ("mark" / "filter" / "off"); remaining
+    content is compacted to the passages most relevant to the query (and `focus`, e.g. the
+    company) within SNIPPET_TOKEN_BUDGET.
+    """
     if not Config.TAVILY_API_KEY:
         return [{"error": "API Key Missing"}]
 
-    try:
-        client = TavilyClient(api_key=Config.TAVILY_API_KEY)
-        response = client.search(query=query, search_depth="advanced", max_results=max_results)
-        return [
-            {"url": r["url"], "title": r["title"], "content": r["content"][:2000]}
-            for r in response.get("results", [])
-        ]
-    except Exception as e:
-        logger.error(f"Search failed: {e}")
-        return []
+    check_deadline("search.tavily")
+    with span("search.tavily", max_results=max_results) as attrs:
+        try:
+            client = TavilyClient(api_key=Config.TAVILY_API_KEY)
+            response = client.search(
+                query=query,
+                search_depth="advanced",
+                max_results=max_results,
+                timeout=call_timeout(Config.SEARCH_TIMEOUT),
+            )
+            # The larger raw window is only read when compaction cuts it back to the token budget.
+            raw_chars = Config.SEARCH_RAW_CHARS if Config.SNIPPET_COMPACTION else SEARCH_CONTENT_CHARS
+            results = [
+                {"url": r["url"], "title": r["title"], "content": r["content"][:raw_chars]}
+                for r in response.get("results", [])
+            ]
+            if known_sources != "off":
+                screened = screen_known_sources(results, known_sources, mission)
+                attrs["known_sources"] = len(results) - sum(1 for r in screened if not r.get("known"))
+                results = screened
+            if Config.SNIPPET_COMPACTION:
+                raw_tokens = sum(estimate_tokens(r["content"]) for r in results)
+                fresh = [r for r in results if not r.get("known")]
+                results = compact_results(fresh, query, focus, Config.SNIPPET_TOKEN_BUDGET) + [
+                    r for r in results if r.get("known")
+                ]
+                attrs["tokens_saved"] = raw_tokens - sum(estimate_tokens(r["content"]) for r in results)
+            attrs["results"] = len(results)
+            return results
+        except Exception as e:
+            logger.error(f"Search failed: {e}")
+            metrics.inc("gotham_search_errors_total", help="Failed Tavily searches.")
+            return []
 
 
 @tool
 def search_tavily(query: str):
     """Search the web for information using Tavily."""
-    return perform_search(query, max_results=Config.MAX_SEARCH_RESULTS)
+    # Screen against what this mission kind has read; a refresh re-reads every source.
+    known_sources = "off" if llm_cache_bypassed() else Config.SOURCE_DEDUP
+    with span("tool.search_tavily"):
+        return perform_search(
+            query, max_results=Config.MAX_SEARCH_RESULTS, known_sources=known_sources, mission=current_mission()
+        )
 
 
 __all__ = ["perform_search", "search_tavily"]
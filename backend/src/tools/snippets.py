@@ -0,0 +1,128 @@
+import math
+import re
+from typing import Iterable
+
+import numpy as np
+
+_WORD = re.compile(r"[a-z0-9]+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n{2,}")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 chars/token), the same currency as the mood char budgets."""
+    return math.ceil(len(text) / 4)
+
+
+def tokenize(text: str) -> list[str]:
+    return [w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS]
+
+
+def split_passages(text: str, max_chars: int = 400) -> list[str]:
+    """Sentence-aligned passages of at most ~max_chars (a single long sentence is kept whole)."""
+    passages: list[str] = []
+    current = ""
+    for sentence in _SENTENCE_END.split(text or ""):
+        sentence = " ".join(sentence.split())
+        if not sentence:
+            continue
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            passages.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        passages.append(current)
+    return passages
+
+
+def bm25_scores(docs: list[list[str]], query: list[str], k1: float = 1.5, b: float = 0.75) -> np.ndarray:
+    """BM25 of every passage in the batch against the query terms, as one matrix computation."""
+    terms = list(dict.fromkeys(query))
+    if not docs or not terms:
+        return np.zeros(len(docs))
+    column = {t: j for j, t in enumerate(terms)}
+    tf = np.zeros((len(docs), len(terms)))
+    for i, doc in enumerate(docs):
+        for word in doc:
+            j = column.get(word)
+            if j is not None:
+                tf[i, j] += 1
+    lengths = np.array([len(doc) for doc in docs], dtype=float)
+    avg_len = lengths.mean() or 1.0
+    df = (tf > 0).sum(axis=0)
+    idf = np.log1p((len(docs) - df + 0.5) / (df + 0.5))
+    norm = k1 * (1 - b + b * lengths / avg_len)
+    return (tf * (k1 + 1) / (tf + norm[:, None])) @ idf
+
+
+def _shingles(tokens: list[str], size: int = 3) -> set[int]:
+    if len(tokens) < size:
+        return {hash(tuple(tokens))}
+    return {hash(tuple(tokens[i : i + size])) for i in range(len(tokens) - size + 1)}
+
+
+def _near_duplicate(shingles: set[int], kept: Iterable[set[int]], threshold: float) -> bool:
+    # Containment rather than Jaccard: a syndicated sentence inside a longer passage still counts.
+    for other in kept:
+        smaller = min(len(shingles), len(other))
+        if smaller and len(shingles & other) / smaller >= threshold:
+            return True
+    return False
+
+
+def compact_results(
+    results: list[dict],
+    query: str,
+    focus: str | None = None,
+    token_budget: int = 800,
+    passage_chars: int = 400,
+    dedupe_threshold: float = 0.8,
+) -> list[dict]:
+    """
+    Replace each result's content with its most relevant passages, within a shared budget.
+
+    Passages from all results are ranked together by BM25 against the query (the focus
+    entity, e.g. the company, counts twice), near-identical passages across sources are
+    dropped, and the best are kept until `token_budget` is spent. Passages sharing no term with
+    the query are only used when nothing matches. Kept passages stay in their original order;
+    results left with no passage are dropped.
+    """
+    query_terms = tokenize(query) + 2 * tokenize(focus or "")
+    passages: list[tuple[int, int, str]] = []
+    for r_idx, result in enumerate(results):
+        for p_idx, passage in enumerate(split_passages(result.get("content", ""), passage_chars)):
+            passages.append((r_idx, p_idx, passage))
+    if not passages:
+        return results
+
+    tokens = [tokenize(p[2]) for p in passages]
+    scores = bm25_scores(tokens, query_terms)
+    chosen: dict[int, list[tuple[int, str]]] = {}
+    kept_shingles: list[set[int]] = []
+    spent = 0
+    for i in np.argsort(-scores, kind="stable"):
+        if scores[i] <= 0 and chosen:
+            break  # the rest share no term with the query
+        r_idx, p_idx, passage = passages[i]
+        cost = estimate_tokens(passage)
+        if spent + cost > token_budget and spent > 0:
+            continue
+        shingles = _shingles(tokens[i])
+        if _near_duplicate(shingles, kept_shingles, dedupe_threshold):
+            continue
+        kept_shingles.append(shingles)
+        chosen.setdefault(r_idx, []).append((p_idx, passage))
+        spent += cost
+
+    compacted = []
+    for r_idx, result in enumerate(results):
+        if r_idx in chosen:
+            content = " … ".join(p for _, p in sorted(chosen[r_idx]))
+            compacted.append({**result, "content": content})
+    return compacted
+
+
+__all__ = ["bm25_scores", "compact_results", "estimate_tokens", "split_passages", "tokenize"]
@@ -0,0 +1,233 @@
+import contextvars
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+from src.config import Config
+from src.graph_db import GraphManager
+from src.telemetry import metrics, span
+
+logger = logging.getLogger("sources")
+
+_RECENT_HASHES_MAX = 2048
+
+_KNOWN_QUERY = """
+MATCH (d:Document)
+WHERE (d.url IN $urls OR d.content_hash IN $hashes)
+  AND ($mission IS NULL OR $mission IN coalesce(d.missions, []))
+RETURN d.url AS url, d.content_hash AS hash
+"""
+
+_ALL_DOCUMENTS = "MATCH (d:Document) RETURN d.url AS url, d.content_hash AS hash, d.missions AS missions"
+
+# Documents written since the last catch-up, via the document_write_seq index.
+_DOCUMENTS_SINCE = """
+MATCH (d:Document)
+WHERE d.write_seq > $since AND d.write_seq <= $upto
+RETURN d.url AS url, d.content_hash AS hash, d.missions AS missions
+"""
+
+_mission: contextvars.ContextVar[str | None] = contextvars.ContextVar("gotham_mission", default=None)
+
+
+def current_mission() -> str | None:
+    return _mission.get()
+
+
+@contextmanager
+def bind_mission(kind: str | None) -> Iterator[None]:
+    """Tag Documents ingested in this context with the mission kind that read them."""
+    token = _mission.set(kind)
+    try:
+        yield
+    finally:
+        _mission.reset(token)
+
+
+def normalize_url(url: str) -> str:
+    """Scheme/host case, fragment, trailing slash and utm_* parameters do not make a new source."""
+    parts = urlsplit((url or "").strip())
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query) if not k.lower().startswith("utm_")])
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), query, ""))
+
+
+def content_hash(text: str) -> str:
+    """Whitespace- and case-insensitive hash, so syndicated copies of an article collide."""
+    return hashlib.sha1(" ".join((text or "").lower().split()).encode("utf-8")).hexdigest()
+
+
+class BloomFilter:
+    """Fixed-size bit array with k probes from double hashing of one blake2b digest."""
+
+    def __init__(self, bits: int, hashes: int = 7):
+        self.bits = bits
+        self.hashes = hashes
+        self._array = np.zeros((bits + 7) // 8, dtype=np.uint8)
+
+    def _positions(self, key: str) -> np.ndarray:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return np.array([(h1 + i * h2) % self.bits for i in range(self.hashes)], dtype=np.int64)
+
+    def add(self, key: str) -> None:
+        pos = self._positions(key)
+        np.bitwise_or.at(self._array, pos >> 3, (1 << (pos & 7)).astype(np.uint8))
+
+    def __contains__(self, key: str) -> bool:
+        pos = self._positions(key)
+        return bool(np.all(self._array[pos >> 3] & (1 << (pos & 7)).astype(np.uint8)))
+
+
+class SourceRegistry:
+    """
+    Which search results are already ingested as Document nodes.
+
+    A Bloom filter of known URLs and content hashes (bootstrapped from the graph, then fed by
+    every ingest) answers "definitely new" without touching Neo4j; the few possible hits are
+    confirmed with one batched query. Keys are also recorded per mission kind (`d.missions`),
+    so a source read for one mission is still new to another. Content hashes of recent search
+    results are remembered so `insert_knowledge` can store them on the Document it creates.
+    Documents written by other processes are folded in from the write sequence before each check.
+    """
+
+    def __init__(self, bits: int):
+        self._bloom = BloomFilter(bits)
+        self._bootstrapped = False
+        self._applied_seq = 0
+        self._lock = threading.Lock()
+        self._recent: OrderedDict[str, str] = OrderedDict()
+
+    def _remember(self, url: str | None, digest: str | None, missions: list[str] | None = None) -> None:
+        for prefix in ["", *(f"{mission}|" for mission in missions or ())]:
+            if url:
+                self._bloom.add(f"{prefix}url:{normalize_url(url)}")
+            if digest:
+                self._bloom.add(f"{prefix}hash:{digest}")
+
+    def _ensure_bootstrapped(self) -> None:
+        if self._bootstrapped:
+            return
+        with self._lock:
+            if self._bootstrapped:
+                return
+            from src.services.changes import read_write_seq
+
+            # Taken before the scan, so documents written during it are caught up later.
+            self._applied_seq = read_write_seq()
+            with span("sources.bootstrap") as attrs, GraphManager().session() as session:
+                count = 0
+                for rec in session.run(_ALL_DOCUMENTS):
+                    self._remember(rec["url"], rec["hash"], rec.get("missions"))
+                    count += 1
+                attrs["documents"] = count
+            self._bootstrapped = True
+
+    def _catch_up(self) -> None:
+        """Add Documents stamped after the last applied sequence (e.g. ingested by the MCP server)."""
+        from src.services.changes import change_feed
+
+        current, since = change_feed.current_seq(), self._applied_seq
+        if current == since:
+            return
+        if current > since:
+            with span("sources.catch_up", since=since, upto=current) as attrs, GraphManager().session() as session:
+                rows = list(session.run(_DOCUMENTS_SINCE, since=since, upto=current))
+                attrs["documents"] = len(rows)
+            with self._lock:
+                for rec in rows:
+                    self._remember(rec["url"], rec["hash"], rec.get("missions"))
+        # A lower sequence is a graph reset: stale Bloom bits only cost a confirmation query.
+        self._applied_seq = current
+
+    def hash_for(self, url: str) -> str | None:
+        with self._lock:
+            return self._recent.get(normalize_url(url))
+
+    def record(self, url: str, digest: str | None = None, mission: str | None = None) -> None:
+        """Called after a Document is written."""
+        with self._lock:
+            self._remember(url, digest, [mission] if mission else None)
+
+    def known(self, results: list[dict], mission: str | None = None) -> set[str]:
+        """
+        URLs of results whose URL or content hash already belongs to a Document; with `mission`,
+        only Documents already read by that mission kind count.
+        """
+        keyed = []
+        with self._lock:
+            for r in results:
+                url, digest = r["url"], content_hash(r.get("content", ""))
+                self._recent[normalize_url(url)] = digest
+                self._recent.move_to_end(normalize_url(url))
+                keyed.append((url, digest))
+            while len(self._recent) > _RECENT_HASHES_MAX:
+                self._recent.popitem(last=False)
+        try:
+            self._ensure_bootstrapped()
+            self._catch_up()
+        except Exception as e:
+            logger.warning(f"Source registry unavailable, treating results as new: {e}")
+            return set()
+
+        prefix = f"{mission}|" if mission else ""
+        candidates = [
+            (url, digest)
+            for url, digest in keyed
+            if f"{prefix}url:{normalize_url(url)}" in self._bloom or f"{prefix}hash:{digest}" in self._bloom
+        ]
+        metrics.inc("gotham_source_bloom_total", len(keyed) - len(candidates), help="Search results by source check.", result="new")
+        if not candidates:
+            return set()
+        urls = sorted({u for url, _ in candidates for u in (url, normalize_url(url))})
+        hashes = [digest for _, digest in candidates]
+        with GraphManager().session() as session:
+            rows = list(session.run(_KNOWN_QUERY, urls=urls, hashes=hashes, mission=mission))
+        known_urls = {normalize_url(rec["url"]) for rec in rows if rec["url"]}
+        known_hashes = {rec["hash"] for rec in rows if rec["hash"]}
+        known = {url for url, digest in candidates if normalize_url(url) in known_urls or digest in known_hashes}
+        metrics.inc("gotham_source_bloom_total", len(known), help="Search results by source check.", result="known")
+        metrics.inc(
+            "gotham_source_bloom_total", len(candidates) - len(known), help="Search results by source check.", result="false_positive"
+        )
+        return known
+
+
+source_registry = SourceRegistry(Config.SOURCE_BLOOM_BITS)
+
+
+def screen_known_sources(results: list[dict], mode: str, mission: str | None = None) -> list[dict]:
+    """
+    Apply SOURCE_DEDUP to search results: "filter" drops already-ingested sources, "mark"
+    keeps them as `known: true` with the content elided, "off" leaves results untouched.
+    With `mission`, only sources already read by that mission kind count as ingested.
+    """
+    if mode == "off" or not results:
+        return results
+    known = source_registry.known(results, mission)
+    if not known:
+        return results
+    if mode == "filter":
+        return [r for r in results if r["url"] not in known]
+    return [
+        {**r, "known": True, "content": "[Already ingested; see the graph for its entities.]"} if r["url"] in known else r
+        for r in results
+    ]
+
+
+__all__ = [
+    "BloomFilter",
+    "SourceRegistry",
+    "bind_mission",
+    "content_hash",
+    "current_mission",
+    "normalize_url",
+    "screen_known_sources",
+    "source_registry",
+]
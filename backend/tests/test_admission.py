@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import src.api as api
+import src.routes.agents as agents
+from src.admission import AdmissionController, AdmissionRejected
+
+
+def _controller(**overrides) -> AdmissionController:
+    settings = dict(concurrency=1, max_queue=10, max_per_client=5, budget=100.0, initial_estimate=1.0)
+    settings.update(overrides)
+    return AdmissionController(**settings)
+
+
+def test_slots_are_handed_out_round_robin_across_clients():
+    async def scenario():
+        ctl = _controller()
+        order: list[str] = []
+        first = await ctl.acquire("a")
+
+        async def mission(client: str, tag: str):
+            ticket = await ctl.acquire(client)
+            order.append(tag)
+            await asyncio.sleep(0)
+            ctl.release(ticket)
+
+        tasks = [asyncio.create_task(mission(c, t)) for c, t in (("a", "a2"), ("a", "a3"), ("b", "b1"))]
+        await asyncio.sleep(0)
+        ctl.release(first)
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(scenario()) == ["a2", "b1", "a3"]
+
+
+def test_weighted_ticket_waits_for_all_its_slots():
+    async def scenario():
+        ctl = _controller(concurrency=3)
+        first, second = await ctl.acquire("a"), await ctl.acquire("b")
+        batch = asyncio.create_task(ctl.acquire("c", weight=3))
+        await asyncio.sleep(0)
+        ctl.release(first)
+        await asyncio.sleep(0)
+        started_early = batch.done()
+        ctl.release(second)
+        ticket = await batch
+        return started_early, ctl.running, ticket.weight
+
+    assert asyncio.run(scenario()) == (False, 3, 3)
+
+
+def test_rejects_when_predicted_completion_passes_budget():
+    async def scenario():
+        ctl = _controller(budget=15.0, initial_estimate=10.0)
+        await ctl.acquire("a")
+        with pytest.raises(AdmissionRejected) as exc:
+            await ctl.acquire("b")
+        return exc.value
+
+    rejected = asyncio.run(scenario())
+    assert rejected.retry_after == 5
+
+
+def test_mission_route_sheds_with_retry_after(monkeypatch):
+    ctl = _controller(budget=15.0, initial_estimate=10.0)
+    ctl.running = 1
+    monkeypatch.setattr(agents, "admission", ctl)
+    monkeypatch.setattr(agents, "run_agent", lambda task, thread_id=None: "never")
+
+    resp = TestClient(api.app).post("/run-mission", json={"task": "x"})
+
+    assert resp.status_code == 429
+    assert resp.headers["Retry-After"] == "5"
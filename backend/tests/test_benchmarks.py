@@ -0,0 +1,12 @@
+from benchmarks.run import run_suite
+
+
+def test_offline_benchmark_suite_smoke():
+    report = run_suite(iterations=3, concurrency=2)
+
+    scenarios = report["scenarios"]
+    assert "POST /agents/company-insight" in scenarios
+    for name, stats in scenarios.items():
+        assert stats["errors"] == 0, name
+        assert stats["ops"] == 3, name
+        assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
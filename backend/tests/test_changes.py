@@ -0,0 +1,50 @@
+import src.services.changes as changes
+
+
+def test_change_feed_windows_and_caches(monkeypatch):
+    fetches = []
+    monkeypatch.setattr(changes, "read_write_seq", lambda: 7)
+    monkeypatch.setattr(changes, "CHANGES_MAX_SEQS", 5)
+
+    def fake_fetch(since, upto):
+        fetches.append((since, upto))
+        return {"nodes": [{"id": "n", "seq": upto}], "edges": [], "documents": []}
+
+    monkeypatch.setattr(changes, "fetch_changes", fake_fetch)
+    feed = changes.ChangeFeed()
+
+    first = feed.changes(0)
+    assert (first["seq"], first["has_more"]) == (5, True)
+    second = feed.changes(5)
+    assert (second["seq"], second["has_more"]) == (7, False)
+
+    # many readers at the same position share one delta query
+    for _ in range(10):
+        feed.changes(5)
+    assert fetches == [(0, 5), (5, 7)]
+
+    # nothing new: no query at all
+    assert feed.changes(7)["nodes"] == []
+    assert len(fetches) == 2
+
+
+def test_change_feed_signals_reset_and_publish(monkeypatch):
+    monkeypatch.setattr(changes, "read_write_seq", lambda: 3)
+    feed = changes.ChangeFeed()
+
+    assert feed.changes(10)["reset"] is True
+
+    feed.publish(12)
+    assert feed.current_seq() == 12
+
+
+def test_change_feed_follows_a_database_reset(monkeypatch):
+    seqs = iter([9, 2])
+    monkeypatch.setattr(changes, "read_write_seq", lambda: next(seqs))
+    monkeypatch.setattr(changes, "fetch_changes", lambda since, upto: {"nodes": [], "edges": [], "documents": []})
+    feed = changes.ChangeFeed()
+
+    assert feed.changes(4)["seq"] == 9
+    assert feed.current_seq(max_age=0) == 2
+    reset = feed.changes(9)
+    assert reset["reset"] is True and reset["seq"] == 2
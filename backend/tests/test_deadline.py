@@ -0,0 +1,52 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import src.agent as agent_module
+import src.api as api
+import src.routes.agents as agents
+from src.deadline import Deadline, DeadlineExceeded, current_deadline, deadline_scope
+from src.graph_db import TracedSession
+
+
+def test_backoff_gives_up_instead_of_sleeping_past_the_deadline():
+    calls = []
+
+    class RateLimited:
+        def invoke(self, payload, config=None):
+            calls.append(payload)
+            raise RuntimeError("429 RESOURCE_EXHAUSTED")
+
+    started = time.perf_counter()
+    with pytest.raises(DeadlineExceeded):
+        agent_module._invoke_with_backoff(RateLimited(), {}, "t-1", Deadline.after(0.5))
+    assert len(calls) == 1
+    assert time.perf_counter() - started < 0.5
+
+
+def test_agent_stops_at_next_step_once_expired():
+    tracer = agent_module._AgentStepTracer(Deadline.after(-1))
+    with pytest.raises(DeadlineExceeded):
+        tracer.on_tool_start({"name": "save_to_graph"}, "{}", run_id="r1")
+
+
+def test_route_deadline_reaches_worker_thread_and_maps_to_504(monkeypatch):
+    seen = []
+
+    def fake_agent(task, thread_id=None):
+        seen.append(current_deadline())
+        raise DeadlineExceeded("deadline exceeded before agent.llm")
+
+    monkeypatch.setattr(agents, "run_agent", fake_agent)
+    resp = TestClient(api.app).post("/run-mission", json={"task": "x"})
+
+    assert resp.status_code == 504
+    assert isinstance(seen[0], Deadline) and seen[0].remaining() > 0
+
+
+def test_transactions_get_the_remaining_budget_as_timeout():
+    with deadline_scope(Deadline.after(5)):
+        work = TracedSession._traced_work(lambda tx: None)
+    assert 0 < work.timeout <= 5
+    assert not hasattr(TracedSession._traced_work(lambda tx: None), "timeout")
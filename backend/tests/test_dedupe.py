@@ -0,0 +1,149 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import src.services.dedupe as dedupe
+
+
+def _entities(*names, degrees=None):
+    degrees = degrees or [1] * len(names)
+    return [
+        {"id": f"id-{i}", "name": name, "created_at": i, "degree": degree}
+        for i, (name, degree) in enumerate(zip(names, degrees))
+    ]
+
+
+def test_blocking_and_scoring_find_variants():
+    entities = _entities("SpaceX", "Space-X", "SpaceX Inc.", "Spotify", "Blue Origin")
+    pairs = dedupe.candidate_pairs(entities, "Organization")
+    scores = dedupe.score_pairs(entities, pairs, "Organization")
+
+    matched = {tuple(sorted((entities[a]["name"], entities[b]["name"]))) for (a, b), s in zip(pairs, scores) if s >= 0.9}
+    assert matched == {("Space-X", "SpaceX"), ("SpaceX", "SpaceX Inc."), ("Space-X", "SpaceX Inc.")}
+    # never compared across unrelated blocks
+    names = {entities[i]["name"] for pair in pairs for i in pair}
+    assert "Blue Origin" not in names
+
+
+def test_plan_merges_collapses_clusters_into_best_connected_node():
+    entities = _entities("Space-X", "SpaceX", "SpaceX Inc.", degrees=[2, 9, 1])
+    pairs = dedupe.candidate_pairs(entities, "Organization")
+    scores = dedupe.score_pairs(entities, pairs, "Organization")
+
+    merges = dedupe._plan_merges(entities, pairs, scores, threshold=0.9)
+    assert {m["keep_name"] for m in merges} == {"SpaceX"}
+    assert sorted(m["dup_name"] for m in merges) == ["Space-X", "SpaceX Inc."]
+
+
+def test_run_dedupe_dry_run_reports_without_writing(monkeypatch):
+    class _Session:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def run(self, query, **params):
+            class _Res:
+                def data(self_inner):
+                    return _entities("Acme Corp", "Acme") if "Organization" in query else []
+            return _Res()
+
+        def execute_write(self, *a, **k):
+            raise AssertionError("dry run must not write")
+
+    class _Manager:
+        def session(self):
+            return _Session()
+
+    monkeypatch.setattr(dedupe, "GraphManager", _Manager)
+    report = dedupe.run_dedupe(dry_run=True)
+
+    assert report["merged"] == 0
+    assert report["pairs_scored"] == 1
+    assert [(m["dup_name"], m["keep_name"]) for m in report["planned"]] == [("Acme", "Acme Corp")]
+
+
+class _Tx:
+    def __init__(self, existing=()):
+        self.existing = set(existing)
+        self.queries = []
+
+    def run(self, query, **params):
+        self.queries.append(query)
+        tx = self
+
+        class _Res:
+            def single(self):
+                if "RETURN count(n)" in query:
+                    return {"n": int(params["dup"] in tx.existing)}
+                return {"seq": 7}
+
+            def data(self):
+                return [{"dup_id": "id-1", "score": 1.0, "keep_name": "Acme Corp", "labels": ["Organization"],
+                         "props": {"name": "Acme"}, "edges": [], "mentions": []}]
+
+            def consume(self):
+                return None
+
+        return _Res()
+
+
+def test_merge_log_is_written_inside_the_transaction(tmp_path):
+    log = tmp_path / "merge_log.jsonl"
+    log.write_text('{"earlier": true}\n', encoding="utf-8")
+    offset = log.stat().st_size
+    batch = [{"keep": "id-0", "dup": "id-1", "score": 1.0}]
+
+    # a retried transaction function rewrites its entries instead of duplicating them
+    for _ in range(2):
+        seq, snapshot = dedupe._merge_batch(_Tx(), batch, log, offset)
+
+    lines = log.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2 and json.loads(lines[1])["write_seq"] == seq == 7
+    assert "Tombstone" in dedupe._MERGE
+
+
+def test_undo_skips_uncommitted_merges_and_publishes_the_restore(monkeypatch, tmp_path):
+    entry = {"labels": ["Organization"], "keep_name": "Acme Corp", "edges": [], "mentions": []}
+    log = tmp_path / "merge_log.jsonl"
+    log.write_text(
+        json.dumps({**entry, "props": {"name": "Acme"}}) + "\n" + json.dumps({**entry, "props": {"name": "ACME"}}) + "\n",
+        encoding="utf-8",
+    )
+    tx = _Tx(existing={"ACME"})  # the newest entry's merge never committed
+
+    class _Session:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute_write(self, fn, *args):
+            return fn(tx, *args)
+
+    published = []
+    monkeypatch.setattr(dedupe, "GraphManager", lambda: type("GM", (), {"session": lambda self: _Session()})())
+    monkeypatch.setattr(dedupe.change_feed, "publish", published.append)
+    monkeypatch.setattr(dedupe.org_projection, "mark_stale", lambda: None)
+
+    assert dedupe.undo_merges(1, log) == 1
+    assert published == [7]
+    assert log.read_text(encoding="utf-8") == ""
+    assert any("write_seq = $seq" in q for q in tx.queries)
+
+
+def test_merge_log_defaults_to_the_user_cache_directory(tmp_path):
+    env = {k: v for k, v in os.environ.items() if k != "DEDUPE_LOG_PATH"}
+    out = subprocess.run(
+        [sys.executable, "-c", "from src.config import Config; print(Config.DEDUPE_LOG_PATH)"],
+        cwd=Path(__file__).resolve().parents[1],
+        env={**env, "XDG_CACHE_HOME": str(tmp_path)},
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+    assert Path(out) == tmp_path / "gotham" / "merge_log.jsonl"
@@ -0,0 +1,127 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import src.tools.graph as graph
+from src.config import Config
+from src.services.entity_index import EntityIndex, HashingEmbedder
+
+
+class _Result:
+    def __init__(self, row):
+        self._row = row
+
+    def single(self):
+        return self._row
+
+
+class _Session:
+    def __init__(self, existing):
+        self.existing = existing
+
+    def run(self, query, **params):
+        if "db.index.fulltext" in query:
+            return _Result(None)
+        name = params.get("name")
+        return _Result([name] if name in self.existing else None)
+
+
+def test_index_ranks_variants_and_persists(tmp_path):
+    index = EntityIndex(embedder=HashingEmbedder(), path=tmp_path / "idx.npz")
+    index.add_many([
+        ("SpaceX", "SpaceX", "Organization", "industry Aerospace"),
+        ("Blue Origin", "Blue Origin", "Organization", "industry Aerospace"),
+        ("Google", "Alphabet", "Organization", ""),
+    ])
+
+    name, score = index.query("SpaceX Corp", "Organization")[0]
+    assert name == "SpaceX" and score > 0.6
+    # learned aliases resolve to their canonical node
+    assert index.query("Google", "Organization")[0][0] == "Alphabet"
+    assert index.query("SpaceX", "Person") == []
+
+    index.save()
+    reloaded = EntityIndex(embedder=HashingEmbedder(), path=tmp_path / "idx.npz")
+    assert reloaded.load()
+    assert len(reloaded) == 3
+    assert reloaded.query("SpaceX Corp", "Organization")[0][0] == "SpaceX"
+
+
+def test_resolve_entity_uses_semantic_stage(monkeypatch, tmp_path):
+    index = EntityIndex(embedder=HashingEmbedder(), path=tmp_path / "idx.npz")
+    index.add("Google", "Alphabet", "Organization")
+    index.save()
+    index.ensure_loaded()
+    monkeypatch.setattr(graph, "get_entity_index", lambda wait=True: index)
+    monkeypatch.setattr(Config, "SEMANTIC_RESOLUTION", True)
+
+    assert graph.resolve_entity(_Session({"Alphabet"}), "Google", "Organization") == "Alphabet"
+    # stale index entries are ignored when the node no longer exists
+    assert graph.resolve_entity(_Session(set()), "Google", "Organization") == "Google"
+
+    monkeypatch.setattr(Config, "SEMANTIC_RESOLUTION", False)
+    assert graph.resolve_entity(_Session({"Alphabet"}), "Google", "Organization") == "Google"
+
+
+def test_semantic_stage_skips_an_index_that_is_still_loading(monkeypatch, tmp_path):
+    index = EntityIndex(embedder=HashingEmbedder(), path=tmp_path / "idx.npz")
+    index.add("Google", "Alphabet", "Organization")
+    monkeypatch.setattr(index, "load_in_background", lambda: None)
+    monkeypatch.setattr(graph, "get_entity_index", lambda wait=True: index)
+    monkeypatch.setattr(Config, "SEMANTIC_RESOLUTION", True)
+
+    assert not index.ready
+    assert graph.resolve_entity(_Session({"Alphabet"}), "Google", "Organization") == "Google"
+
+
+def test_rows_added_while_loading_are_applied_afterwards(monkeypatch, tmp_path):
+    index = EntityIndex(embedder=HashingEmbedder(), path=tmp_path / "idx.npz")
+
+    def bootstrap():
+        # an ingest commits while the index is being built
+        index.add("Google", "Alphabet", "Organization")
+        assert index.query("Google", "Organization") == []
+
+    monkeypatch.setattr(index, "bootstrap_from_graph", bootstrap)
+    index.ensure_loaded()
+
+    assert index.ready
+    assert index.query("Google", "Organization")[0][0] == "Alphabet"
+
+
+def test_rows_buffered_during_a_failed_build_survive_the_retry(monkeypatch, tmp_path):
+    index = EntityIndex(embedder=HashingEmbedder(), path=tmp_path / "idx.npz")
+    attempts = []
+
+    def bootstrap():
+        attempts.append(1)
+        if len(attempts) == 1:
+            index.add("Google", "Alphabet", "Organization")
+            raise RuntimeError("graph unavailable")
+
+    monkeypatch.setattr(index, "bootstrap_from_graph", bootstrap)
+    try:
+        index.ensure_loaded()
+    except RuntimeError:
+        pass
+    assert not index.ready
+    # ingests between attempts keep buffering
+    index.add("Meta", "Meta Platforms", "Organization")
+
+    index.ensure_loaded()
+    assert index.query("Google", "Organization")[0][0] == "Alphabet"
+    assert index.query("Meta", "Organization")[0][0] == "Meta Platforms"
+
+
+def test_index_defaults_to_the_user_cache_directory(tmp_path):
+    env = {k: v for k, v in os.environ.items() if k != "ENTITY_INDEX_PATH"}
+    out = subprocess.run(
+        [sys.executable, "-c", "from src.config import Config; print(Config.ENTITY_INDEX_PATH)"],
+        cwd=Path(__file__).resolve().parents[1],
+        env={**env, "XDG_CACHE_HOME": str(tmp_path)},
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+    assert Path(out) == tmp_path / "gotham" / "entity_index.npz"
@@ -0,0 +1,69 @@
+import src.services.extraction as extraction
+from src.schema import ExtractedKnowledge
+
+
+class _StructuredLLM:
+    def __init__(self):
+        self.prompts: list[str] = []
+
+    def invoke(self, prompt, config=None):
+        self.prompts.append(prompt)
+        return ExtractedKnowledge(
+            updates=[
+                {
+                    "source_url": "https://a.example/1",
+                    "entities": [{"name": "Acme", "label": "Organization"}, {"name": "Globex", "label": "Organization"}],
+                    "relationships": [{"source": "Acme", "target": "Globex", "type": "COMPETES_WITH"}],
+                },
+                {"source_url": "https://b.example/2"},
+            ]
+        )
+
+
+def test_extraction_runs_searches_then_one_llm_call(monkeypatch):
+    searched: list[str] = []
+    ingested = []
+    llm = _StructuredLLM()
+
+    def fake_search(query, max_results=3, focus=None, known_sources="off"):
+        searched.append(query)
+        return [{"url": "https://a.example/1", "title": "A", "content": "Acme vs Globex"}]
+
+    monkeypatch.setattr(extraction, "perform_search", fake_search)
+    monkeypatch.setattr(extraction, "screen_known_sources", lambda results, mode, mission=None: results)
+    monkeypatch.setattr(extraction, "_get_structured_llm", lambda: llm)
+    monkeypatch.setattr(extraction, "insert_knowledge_batch", ingested.append)
+
+    summary = extraction.run_extraction("Find competitors for 'Acme'.", "Acme", "competitors", "t-1")
+
+    assert len(searched) == 2
+    assert len(llm.prompts) == 1
+    # duplicate URLs across queries appear once in the prompt
+    assert llm.prompts[0].count("https://a.example/1") == 1
+    # empty updates are not written
+    assert len(ingested) == 1
+    assert [u.source_url for u in ingested[0]] == ["https://a.example/1"]
+    assert summary.startswith("Saved to graph: 2 entities, 1 relationships")
+
+
+def test_gather_sources_skips_what_this_mission_already_read(monkeypatch):
+    results = [
+        {"url": "https://a.example/1", "title": "A", "content": "Acme HQ"},
+        {"url": "https://b.example/2", "title": "B", "content": "Acme founded"},
+    ]
+    screened = []
+
+    def screen(found, mode, mission=None):
+        screened.append((mode, mission))
+        return [r for r in found if r["url"] != known_url]
+
+    monkeypatch.setattr(extraction, "perform_search", lambda query, max_results=3, focus=None: results)
+    monkeypatch.setattr(extraction, "screen_known_sources", screen)
+
+    known_url = "https://a.example/1"
+    assert [r["url"] for r in extraction.gather_sources("Acme", "profile_facts")] == ["https://b.example/2"]
+    assert screened == [("filter", "profile_facts")]
+
+    # everything already read by this mission kind: re-read rather than prompt with no sources
+    results.pop()
+    assert [r["url"] for r in extraction.gather_sources("Acme", "profile_facts")] == [known_url]
@@ -0,0 +1,119 @@
+import json
+import re
+
+from fastapi.testclient import TestClient
+
+import src.api as api
+import src.services.graph_queries as graph_queries
+
+
+class FakeSession:
+    def __init__(self, nodes, edges, calls):
+        self.nodes = nodes
+        self.edges = edges
+        self.calls = calls
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, cypher, params):
+        node_label = re.search(r"MATCH \(n:(\w+)\)", cypher)
+        source_label = re.search(r"MATCH \(a:(\w+)\)", cypher)
+        label = (node_label or source_label).group(1)
+        self.calls.append({**params, "label": label})
+        sources = sorted((n for n in self.nodes if label in n["labels"]), key=lambda n: n["props"]["name"])
+        if node_label:
+            sources = [n for n in sources if n["props"]["name"] > params["after_key"]][: params["page_size"]]
+            return iter({**n, "key": n["props"]["name"]} for n in sources)
+        rows = [
+            (n["props"]["name"], e)
+            for n in sources
+            for e in sorted(self.edges, key=lambda e: e["id"])
+            if e["source"] == n["id"]
+        ]
+        after = (params["after_key"], params["after_edge"])
+        rows = [(key, e) for key, e in rows if (key, e["id"]) > after][: params["page_size"]]
+        return iter({"key": key, "created_at": None, "edge_id": e["id"], "edge": e} for key, e in rows)
+
+
+class FakeManager:
+    def __init__(self, nodes, edges):
+        self.calls = []
+        self.nodes = nodes
+        self.edges = edges
+
+    def session(self):
+        return FakeSession(self.nodes, self.edges, self.calls)
+
+
+def test_graph_export_streams_pages(monkeypatch):
+    nodes = [
+        {"id": f"n{i}", "created_at": i, "labels": ["Organization"], "props": {"name": f"Org{i}"}}
+        for i in range(5)
+    ]
+    nodes.append({"id": "p0", "created_at": 9, "labels": ["Person"], "props": {"name": "Jane"}})
+    edges = [
+        {"id": "r0", "type": "RELATED", "source": "n0", "target": "n1", "props": {}},
+        {"id": "r1", "type": "WORKS_FOR", "source": "p0", "target": "n1", "props": {}},
+    ]
+    manager = FakeManager(nodes, edges)
+    monkeypatch.setattr(graph_queries, "GraphManager", lambda: manager)
+
+    client = TestClient(api.app)
+    response = client.get("/graph/export", params={"page_size": 2})
+
+    assert response.status_code == 200
+    items = [json.loads(line) for line in response.text.splitlines()]
+    # paged per label, in label order
+    assert [i["id"] for i in items if i["type"] == "node"] == ["p0", "n0", "n1", "n2", "n3", "n4"]
+    assert [i["id"] for i in items if i["type"] == "edge"] == ["r1", "r0"]
+    cursors = [i for i in items if i["type"] == "cursor"]
+    assert cursors[0] == {"type": "cursor", "section": "nodes", "after": "Person:Jane"}
+    assert cursors[1] == {"type": "cursor", "section": "nodes", "after": "Organization:Org1"}
+    # every query is bounded by the page size
+    assert all(call["page_size"] == 2 for call in manager.calls)
+
+    # resuming starts at the cursor's label and key
+    manager.calls.clear()
+    response = client.get("/graph/export", params={"section": "nodes", "after": "Organization:Org2", "page_size": 2})
+    items = [json.loads(line) for line in response.text.splitlines()]
+    assert [i["id"] for i in items if i["type"] == "node"] == ["n3", "n4"]
+    assert {call["label"] for call in manager.calls} == {"Organization", "Location", "Topic"}
+
+
+def test_graph_export_rejects_unknown_label_or_cursor():
+    client = TestClient(api.app)
+    assert client.get("/graph/export", params={"labels": "Secret"}).status_code == 400
+    assert client.get("/graph/export", params={"after": "4:abc:12"}).status_code == 400
+
+
+def test_graph_export_pages_edges_within_a_hub_node(monkeypatch):
+    nodes = [
+        {"id": f"n{i}", "created_at": i, "labels": ["Organization"], "props": {"name": f"Org{i}"}}
+        for i in range(3)
+    ]
+    edges = [
+        {"id": f"r{i}", "type": "PARTNERS_WITH", "source": "n0", "target": f"n{1 + i % 2}", "props": {}}
+        for i in range(3)
+    ]
+    manager = FakeManager(nodes, edges)
+    monkeypatch.setattr(graph_queries, "GraphManager", lambda: manager)
+
+    client = TestClient(api.app)
+    response = client.get("/graph/export", params={"section": "edges", "labels": "Organization", "page_size": 2})
+    items = [json.loads(line) for line in response.text.splitlines()]
+    assert [i["id"] for i in items if i["type"] == "edge"] == ["r0", "r1", "r2"]
+    first = next(i for i in items if i["type"] == "cursor")
+    assert first == {"type": "cursor", "section": "edges", "after": "Organization:r1|Org0"}
+
+    # resuming mid-node continues with the same source's remaining edges
+    response = client.get(
+        "/graph/export",
+        params={"section": "edges", "labels": "Organization", "after": first["after"], "page_size": 2},
+    )
+    items = [json.loads(line) for line in response.text.splitlines()]
+    assert [i["id"] for i in items if i["type"] == "edge"] == ["r2"]
+    assert client.get("/graph/export", params={"section": "edges", "after": "Organization:Org0"}).status_code == 400
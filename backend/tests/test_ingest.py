@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 
 from src.schema import KnowledgeGraphUpdate, Entity, Relationship
@@ -18,5 +20,5 @@ def test_ingest_mock_data():
         ]
     )
 
-    result = add_knowledge(mock_data)
+    result = asyncio.run(add_knowledge(mock_data))
     assert "Ingested" in result
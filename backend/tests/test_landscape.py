@@ -0,0 +1,115 @@
+import numpy as np
+
+import src.services.landscape as landscape
+from src.schema import Entity, KnowledgeGraphUpdate, Relationship
+from src.services.landscape import OrgProjection, pagerank
+
+
+class FakeSession:
+    def __init__(self, orgs, edges):
+        self.orgs = orgs
+        self.edges = edges
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, cypher):
+        if "RETURN o.name AS name" in cypher:
+            return [{"name": name} for name in self.orgs]
+        return [{"source": s, "target": t, "type": rel_type} for s, t, rel_type in self.edges]
+
+
+class FakeFeed:
+    def __init__(self):
+        self.seq = 0
+
+    def current_seq(self, max_age=None):
+        return self.seq
+
+
+def _projection(monkeypatch, orgs, edges, feed=None):
+    session = FakeSession(orgs, edges)
+    feed = feed or FakeFeed()
+    monkeypatch.setattr(landscape, "GraphManager", lambda: type("GM", (), {"session": lambda self: session})())
+    monkeypatch.setattr(landscape, "change_feed", feed)
+    monkeypatch.setattr(landscape, "read_write_seq", lambda: feed.seq)
+    return OrgProjection()
+
+
+def test_pagerank_favours_the_hub():
+    # star: 0 is connected to 1..4 (undirected CSR)
+    indptr = np.array([0, 4, 5, 6, 7, 8])
+    indices = np.array([1, 2, 3, 4, 0, 0, 0, 0])
+    ranks = pagerank(indptr, indices)
+    assert ranks.argmax() == 0 and abs(ranks.sum() - 1) < 1e-6
+
+
+def test_landscape_two_hop_competitors_and_rankings(monkeypatch):
+    projection = _projection(
+        monkeypatch,
+        ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark"],
+        [
+            ("Acme", "Globex", "COMPETES_WITH"),
+            ("Initech", "Acme", "COMPETES_WITH"),
+            ("Globex", "Umbrella", "COMPETES_WITH"),
+            ("Initech", "Umbrella", "COMPETES_WITH"),
+            ("Globex", "Hooli", "COMPETES_WITH"),
+            ("Globex", "Acme", "COMPETES_WITH"),  # the same edge stored the other way
+            ("Stark", "Acme", "PARTNERS_WITH"),  # not a competitor, but counts for degree
+        ],
+    )
+
+    data = projection.landscape("acme")
+
+    assert data["company"] == "Acme" and data["degree"] == 3
+    assert sorted(c["name"] for c in data["competitors"]) == ["Globex", "Initech"]
+    second = {c["name"]: c for c in data["second_degree"]}
+    assert second["Umbrella"]["shared"] == 2 and second["Umbrella"]["via"] == ["Globex", "Initech"]
+    assert second["Hooli"]["shared"] == 1 and "Stark" not in second
+    assert data["top_by_degree"][0]["name"] in ("Acme", "Globex")
+    assert projection.landscape("Nobody") is None
+
+
+def test_commits_update_the_projection_without_reload(monkeypatch):
+    feed = FakeFeed()
+    projection = _projection(monkeypatch, ["Acme", "Globex"], [("Acme", "Globex", "COMPETES_WITH")], feed)
+    assert projection.landscape("Acme")["second_degree"] == []
+    loaded_at = projection.loaded_at
+    feed.seq = 1  # the local commit below
+
+    projection.apply_update(
+        1,
+        KnowledgeGraphUpdate(
+            source_url="https://a.example",
+            entities=[Entity(name="Hooli Inc", label="Organization"), Entity(name="Jane", label="Person")],
+            relationships=[
+                Relationship(source="Hooli Inc", target="Globex", type="rival of"),
+                Relationship(source="Jane", target="Acme", type="WORKS_FOR"),
+            ],
+        ),
+        {"Hooli Inc": "Hooli"},
+    )
+
+    data = projection.landscape("Acme")
+    assert [c["name"] for c in data["second_degree"]] == ["Hooli"]
+    assert data["projection"]["organizations"] == 3 and data["projection"]["edges"] == 2
+    assert projection.loaded_at == loaded_at
+
+
+def test_writes_from_other_processes_trigger_a_reload(monkeypatch):
+    feed = FakeFeed()
+    orgs, edges = ["Acme", "Globex"], [("Acme", "Globex", "COMPETES_WITH")]
+    projection = _projection(monkeypatch, orgs, edges, feed)
+    assert projection.landscape("Acme")["projection"]["organizations"] == 2
+
+    # e.g. the MCP server ingested Hooli: the sequence moves with no local commit
+    orgs.append("Hooli")
+    edges.append(("Hooli", "Globex", "COMPETES_WITH"))
+    feed.seq = 3
+
+    data = projection.landscape("Acme")
+    assert [c["name"] for c in data["second_degree"]] == ["Hooli"]
+    assert data["projection"]["organizations"] == 3
@@ -0,0 +1,48 @@
+import time
+
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from src.llm_cache import LLMResponseCache, bypass_llm_cache
+
+_RECORDED = AIMessage(
+    content="",
+    tool_calls=[{"name": "search_tavily", "args": {"query": "Acme"}, "id": "call-1"}],
+)
+
+
+def _model(cache, replies):
+    return GenericFakeChatModel(messages=iter(replies), cache=cache)
+
+
+def test_identical_turn_replays_offline_from_disk(tmp_path):
+    path = tmp_path / "llm.sqlite"
+    first = _model(LLMResponseCache(path, ttl=60, max_entries=10), [_RECORDED])
+    assert first.invoke("Profile 'Acme'").tool_calls[0]["name"] == "search_tavily"
+
+    # A fresh process with no scripted replies left: must be served from the recorded entry.
+    replay = _model(LLMResponseCache(path, ttl=60, max_entries=10), [])
+    cached = replay.invoke("Profile 'Acme'")
+    assert cached.tool_calls[0]["args"] == {"query": "Acme"}
+
+
+def test_ttl_and_size_bound(tmp_path):
+    cache = LLMResponseCache(tmp_path / "llm.sqlite", ttl=60, max_entries=2)
+    model = _model(cache, [AIMessage(content=str(i)) for i in range(3)])
+    for prompt in ("a", "b", "c"):
+        model.invoke(prompt)
+    assert cache.size() == 2
+    assert _model(cache, [AIMessage(content="fresh")]).invoke("a").content == "fresh"
+
+    cache.ttl = 0.01
+    time.sleep(0.02)
+    assert _model(cache, [AIMessage(content="expired")]).invoke("a").content == "expired"
+
+
+def test_bypass_skips_lookup_but_stores_the_fresh_answer(tmp_path):
+    cache = LLMResponseCache(tmp_path / "llm.sqlite", ttl=60, max_entries=10)
+    _model(cache, [AIMessage(content="old")]).invoke("Profile 'Acme'")
+
+    with bypass_llm_cache():
+        assert _model(cache, [AIMessage(content="new")]).invoke("Profile 'Acme'").content == "new"
+    assert _model(cache, []).invoke("Profile 'Acme'").content == "new"
@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+import pytest
+
+import src.server as server
+from src.schema import Entity, KnowledgeGraphUpdate
+
+
+def test_search_web_many_runs_queries_concurrently(monkeypatch):
+    def slow_search(query):
+        time.sleep(0.2)
+        return [{"url": f"https://{query}.example", "title": query, "content": f"About {query}"}]
+
+    monkeypatch.setattr(server, "perform_search", slow_search)
+
+    start = time.perf_counter()
+    output = asyncio.run(server.search_web_many(["acme", "globex", "initech"]))
+
+    assert time.perf_counter() - start < 0.5
+    assert output.index("'acme'") < output.index("'globex'") < output.index("'initech'")
+
+
+def test_add_knowledge_batch_is_one_call_and_bounded(monkeypatch):
+    batches = []
+    monkeypatch.setattr(server, "insert_knowledge_batch", lambda updates: batches.append(updates) or "ok")
+    update = KnowledgeGraphUpdate(
+        source_url="https://a.example", entities=[Entity(name="Acme", label="Organization")], relationships=[]
+    )
+
+    assert asyncio.run(server.add_knowledge_batch([update, update])) == "ok"
+    assert len(batches) == 1 and len(batches[0]) == 2
+    with pytest.raises(ValueError):
+        asyncio.run(server.add_knowledge_batch([update] * (server.MCP_BATCH_MAX_UPDATES + 1)))
+
+
+def test_insert_knowledge_batch_commits_once_and_notifies_each_update(monkeypatch):
+    import src.tools.graph as graph
+
+    transactions, notified = [], []
+
+    class Session:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute_write(self, work, *args):
+            transactions.append(args)
+            return work("tx", *args)
+
+    monkeypatch.setattr(graph, "GraphManager", lambda: type("GM", (), {"session": lambda self: Session()})())
+    monkeypatch.setattr(graph, "_apply_update", lambda tx, data: ([], [], 1, {}))
+    seqs = iter(range(10, 20))
+    monkeypatch.setattr(graph, "_stamp_write_seq", lambda tx, node_ids, rel_ids: next(seqs))
+    monkeypatch.setattr(graph, "_commit_listeners", [lambda seq, data, names: notified.append((seq, data.source_url))])
+    updates = [
+        KnowledgeGraphUpdate(source_url=f"https://{i}.example", entities=[], relationships=[]) for i in range(3)
+    ]
+
+    summary = graph.insert_knowledge_batch(updates)
+
+    assert len(transactions) == 1
+    assert notified == [(10 + i, u.source_url) for i, u in enumerate(updates)]
+    assert summary.startswith("Ingested 3 updates")
@@ -0,0 +1,37 @@
+from fastapi.testclient import TestClient
+
+import src.agent as agent_module
+import src.api as api
+from src.telemetry import bind_thread_id, metrics, span
+
+
+def test_span_records_histogram_and_thread_id():
+    with bind_thread_id("thread-42"), span("unit.test") as attrs:
+        assert attrs["thread_id"] == "thread-42"
+
+    assert metrics.histogram_count("gotham_span_duration_seconds", span="unit.test", status="ok") >= 1
+
+
+def test_metrics_endpoint_exposes_retries(monkeypatch):
+    calls = {"count": 0}
+
+    class DummyMsg:
+        content = "done"
+
+    class FlakyExecutor:
+        def invoke(self, payload, config=None):
+            calls["count"] += 1
+            if calls["count"] < 2:
+                raise Exception("429 RESOURCE_EXHAUSTED")
+            return {"messages": [DummyMsg()]}
+
+    monkeypatch.setattr(agent_module, "get_agent_executor", lambda: FlakyExecutor())
+    monkeypatch.setattr(agent_module.time, "sleep", lambda _s: None)
+    before = metrics.counter_value("gotham_llm_retries_total")
+
+    assert agent_module.run_agent("task", thread_id="t-1") == "done"
+    assert metrics.counter_value("gotham_llm_retries_total") == before + 1
+
+    body = TestClient(api.app).get("/metrics").text
+    assert "# TYPE gotham_llm_retries_total counter" in body
+    assert 'gotham_span_duration_seconds_bucket{span="agent.run",status="ok",le="+Inf"}' in body
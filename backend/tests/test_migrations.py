@@ -0,0 +1,72 @@
+import src.migrations as migrations
+
+
+class _Summary:
+    counters = None
+
+
+class _Result:
+    def __init__(self, rows=()):
+        self._rows = list(rows)
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def consume(self):
+        return _Summary()
+
+
+class _Session:
+    def __init__(self, log, applied):
+        self.log = log
+        self.applied = applied
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, **params):
+        self.log.append((query, params))
+        if "RETURN m.name AS name" in query:
+            return _Result({"name": n} for n in self.applied)
+        return _Result()
+
+
+def test_run_migrations_applies_pending_once(monkeypatch):
+    log = []
+    applied = set()
+
+    class _Manager:
+        def session(self):
+            return _Session(log, applied)
+
+    monkeypatch.setattr(migrations, "GraphManager", _Manager)
+    assert migrations.run_migrations(batch_size=10) == [name for name, _ in migrations.MIGRATIONS]
+
+    backfill = next(params for query, params in log if "IN TRANSACTIONS" in query)
+    assert backfill == {"batch": 10}
+
+    applied.update(name for name, _ in migrations.MIGRATIONS)
+    assert migrations.run_migrations() == []
+
+
+def test_nativized_edges_keep_existing_properties_and_union_sources():
+    log = []
+
+    class _Moved(_Result):
+        def consume(self):
+            return type("Summary", (), {"counters": type("Counters", (), {"relationships_deleted": 1})})()
+
+    session = _Session(log, set())
+    session.run = lambda query, **params: (log.append((query, params)), _Moved([{"type": "competitor of"}]))[1]
+
+    migrations._nativize_related(session, batch=10)
+
+    moved = next(query for query, _ in log if "DELETE r" in query)
+    competes = dict(migrations.MIGRATIONS)["0001_materialize_competes_with"]
+    for statement, var in ((moved, "n"), (competes, "c")):
+        assert "ON CREATE" not in statement
+        assert f"SET {var} += existing" in statement
+        assert "coalesce(existing.source_urls, []) + coalesce(r.source_urls, [])" in statement
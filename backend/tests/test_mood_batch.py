@@ -0,0 +1,97 @@
+import json
+
+from fastapi.testclient import TestClient
+
+import src.api as api
+import src.routes.agents as agents
+import src.services.mood as mood
+from src.admission import AdmissionController
+
+
+class DummyLLM:
+    def __init__(self, calls: list[str]):
+        self.calls = calls
+
+    def invoke(self, prompt: str, config=None):
+        self.calls.append(prompt)
+        companies = [line.split(":", 1)[1].strip(" =") for line in prompt.splitlines() if line.startswith("=== COMPANY:")]
+        if companies:
+            body = {c: {"mood_label": "Positive", "confidence": 0.8, "drivers": ["d"], "sources": []} for c in companies}
+        else:
+            body = {"mood_label": "Neutral", "confidence": 0.6, "drivers": ["d"], "sources": []}
+
+        class Msg:
+            content = json.dumps(body)
+
+        return Msg()
+
+
+def test_company_mood_batch_streams_and_packs(monkeypatch):
+    calls: list[str] = []
+
+    def fake_search(company, timeframe, max_sources):
+        if company == "Ghost":
+            return []
+        return [{"title": f"{company} news", "url": f"https://{company}.test", "content": "x" * 100}]
+
+    monkeypatch.setattr(mood, "_search_sources", fake_search)
+    monkeypatch.setattr(mood, "_build_llm", lambda: DummyLLM(calls))
+    monkeypatch.setattr(mood.Config, "MOOD_BATCH_MAX_PER_CALL", 2)
+
+    client = TestClient(api.app)
+    response = client.post(
+        "/agents/company-mood/batch",
+        json={"companies": ["Alpha", "Beta", "Gamma", "Ghost", "Alpha"], "timeframe": "30d"},
+    )
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines() if line]
+    by_company = {item["company"]: item for item in lines}
+    assert set(by_company) == {"Alpha", "Beta", "Gamma", "Ghost"}
+    assert by_company["Ghost"]["sources"] == []
+    assert all(item["status"] == "success" for item in lines)
+    # 3 companies with sources, at most 2 per call -> 2 LLM calls instead of 3
+    assert len(calls) == 2
+
+
+def test_company_mood_batch_requires_companies():
+    client = TestClient(api.app)
+    response = client.post("/agents/company-mood/batch", json={"companies": []})
+    assert response.status_code == 400
+
+
+def test_company_mood_batch_holds_weighted_admission(monkeypatch):
+    ctl = AdmissionController(concurrency=3, max_queue=10, max_per_client=5, budget=100.0, initial_estimate=1.0)
+    monkeypatch.setattr(agents, "admission", ctl)
+    held: list[int] = []
+
+    def fake_search(company, timeframe, max_sources):
+        held.append(ctl.running)
+        return [{"title": f"{company} news", "url": f"https://{company}.test", "content": "x" * 100}]
+
+    monkeypatch.setattr(mood, "_search_sources", fake_search)
+    monkeypatch.setattr(mood, "_build_llm", lambda: DummyLLM([]))
+    monkeypatch.setattr(mood.Config, "MOOD_BATCH_MAX_PER_CALL", 2)
+    monkeypatch.setattr(mood.Config, "MOOD_BATCH_LLM_CONCURRENCY", 2)
+
+    client = TestClient(api.app)
+    response = client.post("/agents/company-mood/batch", json={"companies": ["Alpha", "Beta", "Gamma"]})
+    assert response.status_code == 200
+    # 3 companies at 2 per call -> 2 LLM calls at once -> 2 slots, held while streaming
+    assert set(held) == {2}
+    assert ctl.running == 0
+
+    ctl.running = 3
+    ctl.ewma_seconds = 200.0
+    shed = client.post("/agents/company-mood/batch", json={"companies": ["Alpha"]})
+    assert shed.status_code == 429
+
+
+def test_company_mood_batch_reports_companies_past_the_deadline(monkeypatch):
+    def expired_search(company, timeframe, max_sources):
+        raise mood.DeadlineExceeded("deadline exceeded before search.tavily")
+
+    monkeypatch.setattr(mood, "_search_sources", expired_search)
+    response = TestClient(api.app).post("/agents/company-mood/batch", json={"companies": ["Alpha", "Beta"]})
+    lines = [json.loads(line) for line in response.text.splitlines() if line]
+    assert {item["company"]: item["status"] for item in lines} == {"Alpha": "timeout", "Beta": "timeout"}
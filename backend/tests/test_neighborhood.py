@@ -0,0 +1,71 @@
+from fastapi.testclient import TestClient
+
+import src.api as api
+import src.services.graph_queries as graph_queries
+
+# hub "A" with many neighbors; "B" has a second-hop neighbor "Z"
+ADJ = {"A": [f"N{i}" for i in range(20)] + ["B"], "B": ["A", "Z"]}
+
+
+class FakeResult(list):
+    def single(self):
+        return self[0] if self else None
+
+
+class FakeSession:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, cypher, **params):
+        self.calls.append(params)
+        if "frontier" not in params:
+            return FakeResult([{"id": "A", "name": "A", "labels": ["Organization"]}])
+        rows = []
+        for node in params["frontier"]:
+            for other in ADJ.get(node, [])[: params["max_per_hop"]]:
+                rows.append({
+                    "rel_id": f"{node}-{other}", "type": "COMPETES_WITH", "source": node, "target": other,
+                    "id": other, "name": other, "labels": ["Organization"],
+                })
+        return FakeResult(rows)
+
+
+class FakeManager:
+    def __init__(self):
+        self.calls = []
+
+    def session(self):
+        return FakeSession(self.calls)
+
+
+def test_neighborhood_caps_fanout_and_nodes(monkeypatch):
+    manager = FakeManager()
+    monkeypatch.setattr(graph_queries, "GraphManager", lambda: manager)
+
+    data = graph_queries.fetch_neighborhood("A", depth=2, max_per_hop=25, max_nodes=10)
+    assert data["node_count"] == 10
+    assert data["truncated"] is True
+
+    data = graph_queries.fetch_neighborhood("B", depth=1, max_per_hop=5)
+    # root lookup resolves to "A"; only 5 neighbors expanded
+    assert data["node_count"] == 6
+    assert all(n["depth"] == 1 for n in data["nodes"] if n["id"] != "A")
+
+
+def test_neighborhood_validates_depth():
+    client = TestClient(api.app)
+    response = client.get("/graph/neighborhood", params={"name": "A", "depth": 9})
+    assert response.status_code == 400
+
+
+def test_entity_lookup_skips_bookkeeping_nodes():
+    exact = graph_queries._FIND_ENTITY.split("UNION")[0]
+    # :WriteSequence {name: 'graph'} and :Migration {name} must not resolve as entities
+    assert "MATCH (e:Person|Organization|Location|Topic)" in exact
+    assert "MATCH (e)" not in graph_queries._FIND_ENTITY
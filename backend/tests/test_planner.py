@@ -0,0 +1,116 @@
+import asyncio
+
+import src.llm_cache as llm_cache
+import src.services.insight as insight
+import src.services.planner as planner
+
+_PROFILE = {
+    "properties": {"name": "Acme", "headquarters": "Berlin", "founded_year": 1999},
+    "related": [
+        {"name": "Jane Doe", "labels": ["Person"], "type": "CEO_OF"},
+        {"name": "John Roe", "labels": ["Person"], "type": "WORKS_FOR"},
+    ],
+}
+
+
+def test_plan_skips_what_the_graph_already_answers():
+    competitors = [{"name": f"C{i}"} for i in range(4)]
+    tasks = planner.plan_company_insight("Acme", _PROFILE, competitors)
+    assert {t.kind: t.status for t in tasks} == {
+        planner.PROFILE_FACTS: "cached",
+        planner.EXECUTIVES: "cached",
+        planner.COMPETITORS: "cached",
+    }
+
+    tasks = planner.plan_company_insight("Acme", {"properties": {}, "related": []}, competitors[:1], refresh=False)
+    assert all(t.status == "pending" for t in tasks)
+
+    tasks = planner.plan_company_insight("Acme", _PROFILE, competitors, refresh=True)
+    assert all(t.status == "pending" for t in tasks)
+
+
+def test_profile_halves_run_as_one_mission_unless_one_is_cached():
+    tasks = planner.plan_company_insight("Acme", None, [])
+    assert [t.kind for t in tasks] == [planner.PROFILE, planner.COMPETITORS]
+
+    tasks = planner.plan_company_insight("Acme", _PROFILE, [], refresh=True)
+    assert [t.kind for t in tasks] == [planner.PROFILE, planner.COMPETITORS]
+
+    only_facts = {**_PROFILE, "related": []}
+    tasks = planner.plan_company_insight("Acme", only_facts, [])
+    assert {t.kind: t.status for t in tasks} == {
+        planner.PROFILE_FACTS: "cached",
+        planner.EXECUTIVES: "pending",
+        planner.COMPETITORS: "pending",
+    }
+
+
+def test_mood_cache_reused_until_refresh():
+    planner.mood_cache.put("Acme", "30d", {"mood_label": "Positive"})
+    tasks = planner.plan_company_insight("acme", _PROFILE, [], include_mood=True, timeframe="30d")
+    mood_task = next(t for t in tasks if t.kind == planner.MOOD)
+    assert mood_task.status == "cached" and mood_task.result == {"mood_label": "Positive"}
+
+
+def test_run_subtasks_records_failures_without_raising():
+    async def ok(task):
+        return f"done {task.kind}"
+
+    async def slow(task):
+        raise asyncio.TimeoutError()
+
+    tasks = [planner.SubTask(planner.PROFILE_FACTS, "Acme"), planner.SubTask(planner.EXECUTIVES, "Acme")]
+    asyncio.run(planner.run_subtasks(tasks, {planner.PROFILE_FACTS: ok, planner.EXECUTIVES: slow}))
+
+    assert tasks[0].status == "ran" and tasks[0].result == "done profile_facts"
+    assert tasks[1].status == "failed" and tasks[1].error == "timed out"
+
+
+def test_company_insight_only_runs_missing_subtasks(monkeypatch):
+    prompts: list[str] = []
+
+    def fake_agent(prompt, thread_id):
+        prompts.append(thread_id)
+        return "ok"
+
+    async def fake_competitor_flow(company, thread_id):
+        raise AssertionError("competitors are already in the graph")
+
+    monkeypatch.setattr(insight, "run_agent", fake_agent)
+    monkeypatch.setattr(insight, "run_competitor_flow", fake_competitor_flow)
+    monkeypatch.setattr(insight, "fetch_entity_profile", lambda name: {**_PROFILE, "related": []})
+    monkeypatch.setattr(insight, "fetch_competitors", lambda name: [{"competitor": f"C{i}", "reason": "peer"} for i in range(5)])
+
+    data = asyncio.run(insight.run_company_insight("Acme", "run-1"))
+
+    assert prompts == ["run-1:executives"]
+    assert {p["kind"]: p["status"] for p in data["plan"]} == {
+        "profile_facts": "cached",
+        "executives": "ran",
+        "competitors": "cached",
+    }
+    assert len(data["competitors"]) == insight.COMPETITOR_DISPLAY_CAP
+
+
+def test_refresh_bypasses_the_llm_cache(monkeypatch):
+    bypassed: list[bool] = []
+
+    def fake_agent(prompt, thread_id):
+        bypassed.append(llm_cache._bypass.get())
+        return "ok"
+
+    async def fake_competitor_flow(company, thread_id, mode="agent"):
+        bypassed.append(llm_cache._bypass.get())
+        return "ok", []
+
+    monkeypatch.setattr(insight, "run_agent", fake_agent)
+    monkeypatch.setattr(insight, "run_competitor_flow", fake_competitor_flow)
+    monkeypatch.setattr(insight, "fetch_entity_profile", lambda name: _PROFILE)
+    monkeypatch.setattr(insight, "fetch_competitors", lambda name: [])
+
+    asyncio.run(insight.run_company_insight("Acme", "run-1", refresh=True))
+    assert bypassed == [True, True]
+
+    bypassed.clear()
+    asyncio.run(insight.run_company_insight("Acme", "run-2"))
+    assert bypassed == [False]  # competitors only; the profile is cached
@@ -0,0 +1,43 @@
+import src.tools.graph as graph
+from src.schema import KnowledgeGraphUpdate
+
+
+class _Tx:
+    def __init__(self):
+        self.calls = []
+
+    def run(self, query, **params):
+        self.calls.append((query, params))
+
+        class _Res:
+            def single(self_inner):
+                return {"seq": 7} if "WriteSequence" in query else None
+
+        return _Res()
+
+
+def test_mentions_are_written_once_per_entity(monkeypatch):
+    monkeypatch.setattr(graph, "resolve_entity", lambda tx, name, label, context="": name)
+    hub_edges = [{"source": "Hub", "target": f"Peer {i}", "type": "COMPETES_WITH"} for i in range(20)]
+    data = KnowledgeGraphUpdate(
+        source_url="https://example.com/a",
+        entities=[{"name": "Hub", "label": "Organization"}, {"name": "Loner", "label": "Person"}],
+        relationships=hub_edges,
+    )
+    tx = _Tx()
+    graph._write_update(tx, data)
+
+    mention_calls = [(q, p) for q, p in tx.calls if "MENTIONS" in q]
+    assert all("UNWIND $names" in q for q, _ in mention_calls)
+    mentioned = [name for _, p in mention_calls for name in p["names"]]
+    assert sorted(mentioned) == sorted(["Hub", "Loner"] + [f"Peer {i}" for i in range(20)])
+
+    # known labels are matched through their label; unknown endpoints fan out per label
+    person_query = next(q for q, p in mention_calls if p["names"] == ["Loner"])
+    assert "MATCH (e:Person {name: row.s})" in person_query
+
+    rel_query, rel_params = next((q, p) for q, p in tx.calls if "UNWIND $rels" in q)
+    assert "MATCH (s:Organization {name: row.s})" in rel_query
+    assert "source_urls" in rel_query
+    assert rel_params["url"] == "https://example.com/a"
+    assert len(rel_params["rels"]) == 20
@@ -0,0 +1,86 @@
+from fastapi.testclient import TestClient
+
+import src.api as api
+from src.config import Config
+from src.graph_db import TracedSession
+from src.query_profiler import normalize_shape, query_profiler
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+        self.consumed = False
+        self.buffered = False
+
+    def _buffer_all(self):
+        self.buffered = True
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def single(self):
+        return self.rows[0] if self.rows else None
+
+    def consume(self):
+        self.consumed = True
+        return None
+
+
+class FakeSession:
+    def __init__(self):
+        self.queries = []
+        self.results = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, parameters=None, **kwargs):
+        self.queries.append(query)
+        self.results.append(FakeResult([{"n": 1}]))
+        return self.results[-1]
+
+
+def test_normalize_shape_groups_literals():
+    a = normalize_shape("MATCH (n)  WHERE n.x = 'a'\n LIMIT 5")
+    b = normalize_shape("MATCH (n) WHERE n.x = 'b' LIMIT 10")
+    assert a == b == "MATCH (n) WHERE n.x = ? LIMIT ?"
+
+
+def test_traced_session_records_drained_and_unconsumed_queries(monkeypatch):
+    query_profiler.reset()
+    monkeypatch.setattr(query_profiler, "slow_ms", 0.0)
+    inner = FakeSession()
+
+    with TracedSession(inner) as session:
+        merged = session.run("MERGE (n:Thing {name: $name}) RETURN n", name="x")  # not read yet
+        assert list(session.run("MATCH (n:Thing) RETURN n")) == [{"n": 1}]
+        # buffered, not consumed: its records are still readable after the next run
+        assert merged.single() == {"n": 1}
+
+    shapes = {row["shape"]: row for row in query_profiler.top(10)}
+    assert shapes["MERGE (n:Thing {name: $name}) RETURN n"]["count"] == 1
+    assert shapes["MATCH (n:Thing) RETURN n"]["slow"] == 1
+    assert inner.results[0].buffered and not inner.results[0].consumed
+
+
+def test_profile_sampling_prefixes_query():
+    query_profiler.enable_profiling(rate=1.0, count=1)
+    inner = FakeSession()
+    with TracedSession(inner) as session:
+        session.run("MATCH (n) RETURN n").single()
+        session.run("MATCH (n) RETURN n").single()
+    assert inner.queries == ["PROFILE MATCH (n) RETURN n", "MATCH (n) RETURN n"]
+    assert query_profiler.sample_rate == 0.0
+
+
+def test_debug_queries_endpoint_is_opt_in(monkeypatch):
+    client = TestClient(api.app)
+    assert client.get("/debug/queries").status_code == 404
+
+    monkeypatch.setattr(Config, "DEBUG_ENDPOINTS", True)
+    response = client.get("/debug/queries", params={"top": 5})
+    assert response.status_code == 200
+    assert "queries" in response.json()
@@ -0,0 +1,52 @@
+from fastapi.testclient import TestClient
+
+import src.api as api
+import src.services.graph_queries as graph_queries
+
+
+class FakeSession:
+    def __init__(self, docs, calls):
+        self.docs = docs
+        self.calls = calls
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, cypher, params):
+        self.calls.append((cypher, params))
+        rows = sorted(self.docs, key=lambda d: (d["created_at"], d["id"]), reverse=True)
+        if params["before_ts"] is not None:
+            key = (params["before_ts"], params["before_id"] or "")
+            rows = [d for d in rows if (d["created_at"], d["id"]) < key]
+        return iter(rows[: params["limit"]])
+
+
+def test_recent_docs_pages_with_keyset_cursor(monkeypatch):
+    # two documents share a millisecond; the elementId tie-breaker keeps both
+    docs = [{"id": f"d{i}", "url": f"https://news.example/{i}", "created_at": 1000 + i // 2 * 2} for i in range(5)]
+    calls = []
+    monkeypatch.setattr(graph_queries, "GraphManager", lambda: type("GM", (), {"session": lambda self: FakeSession(docs, calls)})())
+    client = TestClient(api.app)
+
+    seen = []
+    before = None
+    while True:
+        body = client.get("/graph/recent-docs", params={"limit": 2, **({"before": before} if before else {})}).json()
+        seen += [d["id"] for d in body["documents"]]
+        before = body["next_before"]
+        if not before:
+            break
+
+    assert seen == ["d4", "d3", "d2", "d1", "d0"]
+    # bounded range predicates only, never an expression over created_at
+    assert all("coalesce" not in cypher and "LIMIT $limit" in cypher for cypher, _ in calls)
+    assert "d.created_at <= $before_ts" in calls[1][0] and "$since" not in calls[1][0]
+
+
+def test_recent_docs_rejects_bad_input():
+    client = TestClient(api.app)
+    assert client.get("/graph/recent-docs", params={"limit": 0}).status_code == 400
+    assert client.get("/graph/recent-docs", params={"before": "yesterday"}).status_code == 400
@@ -0,0 +1,65 @@
+import src.tools.graph as graph
+from src.relationships import native_type, normalize_rel_type, type_filter
+from src.schema import KnowledgeGraphUpdate
+
+
+def test_types_are_normalized_onto_the_whitelist():
+    assert normalize_rel_type("competitor of") == "COMPETES_WITH"
+    assert native_type("works-for") == "WORKS_FOR"
+    assert native_type("Sponsors") == "RELATED"
+    assert normalize_rel_type("") == "RELATED_TO"
+
+    assert type_filter(["COMPETES_WITH", "rival_of"]) == ("COMPETES_WITH", None)
+    assert type_filter(["WORKS_FOR", "sponsors"]) == ("WORKS_FOR|RELATED", ["SPONSORS"])
+
+
+class _Tx:
+    def __init__(self):
+        self.calls = []
+
+    def run(self, query, **params):
+        self.calls.append((query, params))
+
+        class _Res:
+            def single(self_inner):
+                return {"seq": 1} if "WriteSequence" in query else None
+
+        return _Res()
+
+
+def test_write_update_batches_one_query_per_native_type(monkeypatch):
+    monkeypatch.setattr(graph, "resolve_entity", lambda tx, name, label, context="": name)
+    data = KnowledgeGraphUpdate(
+        source_url="https://example.com",
+        entities=[{"name": n, "label": "Organization"} for n in ("A", "B", "C")],
+        relationships=[
+            {"source": "A", "target": "B", "type": "COMPETES_WITH", "properties": {"type": "x"}},
+            {"source": "A", "target": "C", "type": "competitor of"},
+            {"source": "B", "target": "C", "type": "sponsors"},
+        ],
+    )
+    tx = _Tx()
+    seq, count, _ = graph._write_update(tx, data)
+
+    rel_calls = [(q, p) for q, p in tx.calls if "UNWIND $rels" in q]
+    assert (seq, count, len(rel_calls)) == (1, 3, 2)
+    competes = next(p for q, p in rel_calls if "[r:COMPETES_WITH]-(t)" in q)
+    assert [(r["s"], r["t"]) for r in competes["rels"]] == [("A", "B"), ("A", "C")]
+    assert competes["rels"][0]["props"] == {}
+    fallback = next(p for q, p in rel_calls if "RELATED {type: row.type}" in q)
+    assert fallback["rels"][0]["type"] == "SPONSORS"
+
+
+def test_write_sequence_is_taken_last(monkeypatch):
+    monkeypatch.setattr(graph, "resolve_entity", lambda tx, name, label, context="": name)
+    data = KnowledgeGraphUpdate(
+        source_url="https://example.com",
+        entities=[{"name": "A", "label": "Organization"}, {"name": "B", "label": "Organization"}],
+        relationships=[{"source": "A", "target": "B", "type": "COMPETES_WITH"}],
+    )
+    tx = _Tx()
+    graph._write_update(tx, data)
+
+    seq_calls = [i for i, (q, _) in enumerate(tx.calls) if "WriteSequence" in q]
+    assert seq_calls == [len(tx.calls) - 1]
+    assert all("$seq" not in q for q, _ in tx.calls)
@@ -0,0 +1,62 @@
+import orjson
+from fastapi.testclient import TestClient
+
+import src.api as api
+import src.routes.graph as graph_routes
+from benchmarks.bench_serialization import measure, synthetic_sample
+from src.serialization import compact_graph, dumps
+
+
+class _Neo4jDate:
+    def iso_format(self):
+        return "2024-05-01"
+
+
+def test_compact_graph_interns_labels_and_types():
+    sample = synthetic_sample(nodes=8, edges=12)
+    compact = compact_graph(sample)
+
+    assert compact["format"] == "compact" and "props" not in compact["nodes"]
+    assert len(compact["nodes"]["id"]) == 8 and len(compact["edges"]["type"]) == 12
+    first = sample["edges"][0]
+    assert compact["nodes"]["id"][compact["edges"]["source"][0]] == first["source"]
+    assert compact["types"][compact["edges"]["type"][0]] == first["type"]
+    assert compact["label_sets"][compact["nodes"]["labels"][1]] == sample["nodes"][1]["labels"]
+    assert compact_graph(sample, include_props=True)["edges"]["props"][0] == first["props"]
+
+
+def test_dumps_handles_driver_types():
+    assert orjson.loads(dumps({"since": _Neo4jDate(), "tags": {"a"}})) == {"since": "2024-05-01", "tags": ["a"]}
+
+
+def test_compact_payload_is_several_times_smaller():
+    report = measure(synthetic_sample(nodes=300, edges=900), runs=1)
+    assert report["stdlib full"]["bytes"] == report["orjson full"]["bytes"]
+    assert report["orjson compact"]["bytes"] * 4 < report["stdlib full"]["bytes"]
+
+
+def test_graph_sample_compact_and_gzip(monkeypatch):
+    calls = []
+
+    def fake_sample(doc_limit, include_props=True):
+        calls.append(include_props)
+        sample = synthetic_sample(nodes=50, edges=100)
+        if not include_props:
+            for item in sample["nodes"] + sample["edges"]:
+                item["props"] = None
+        return sample
+
+    monkeypatch.setattr(graph_routes, "fetch_graph_sample", fake_sample)
+    monkeypatch.setattr(graph_routes, "read_write_seq", lambda: 42)
+    client = TestClient(api.app)
+
+    response = client.get("/graph/sample", params={"format": "compact"}, headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200 and response.headers["content-encoding"] == "gzip"
+    body = response.json()
+    assert body["format"] == "compact" and body["seq"] == 42 and calls == [False]
+    assert len(body["nodes"]["id"]) == 50
+
+    full = client.get("/graph/sample", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in full.headers and full.json()["nodes"][0]["props"]
+    assert calls == [False, True]
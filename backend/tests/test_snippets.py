@@ -0,0 +1,57 @@
+from src.config import Config
+from src.constants import SEARCH_CONTENT_CHARS
+from src.tools import search
+from src.tools.snippets import bm25_scores, compact_results, estimate_tokens, split_passages, tokenize
+
+_BOILERPLATE = "Subscribe to our newsletter for more stories. Cookie settings and privacy policy apply. "
+
+
+def test_bm25_prefers_passages_with_rare_query_terms():
+    docs = [tokenize(t) for t in ("acme reports record revenue", "weather is sunny today", "acme acme acme")]
+    scores = bm25_scores(docs, tokenize("acme revenue"))
+    assert scores.argmax() == 0 and scores[1] == 0
+
+
+def test_compaction_keeps_relevant_facts_within_budget():
+    fact = "Acme Corp was founded in 1999 and is headquartered in Berlin, Germany."
+    results = [
+        {"url": "https://a.example", "title": "A", "content": _BOILERPLATE * 10 + fact},
+        # the same fact syndicated elsewhere is a near-duplicate
+        {"url": "https://b.example", "title": "B", "content": fact + " " + _BOILERPLATE * 10},
+        {"url": "https://c.example", "title": "C", "content": "Acme Corp CEO Jane Doe leads the company. " + _BOILERPLATE},
+    ]
+    raw = sum(estimate_tokens(r["content"]) for r in results)
+
+    compacted = compact_results(results, "Acme headquarters founded CEO", focus="Acme Corp", token_budget=120, passage_chars=200)
+    text = " ".join(r["content"] for r in compacted)
+
+    assert "founded in 1999" in text and "Jane Doe" in text
+    assert text.count("founded in 1999") == 1
+    assert sum(estimate_tokens(r["content"]) for r in compacted) <= 120 < raw
+
+
+def test_split_passages_respects_sentence_boundaries():
+    passages = split_passages("One. Two two. Three three three.", max_chars=12)
+    assert passages == ["One.", "Two two.", "Three three three."]
+
+
+def test_raw_window_is_only_widened_when_compaction_is_on(monkeypatch):
+    page = "Acme Corp opens a new plant in Ohio. " * 400  # ~15k chars
+
+    class _Tavily:
+        def __init__(self, api_key):
+            pass
+
+        def search(self, **kwargs):
+            return {"results": [{"url": f"https://{i}.example", "title": "T", "content": page} for i in range(3)]}
+
+    monkeypatch.setattr(search, "TavilyClient", _Tavily)
+    monkeypatch.setattr(Config, "TAVILY_API_KEY", "test-key")
+
+    monkeypatch.setattr(Config, "SNIPPET_COMPACTION", False)
+    results = search.perform_search("Acme plant")
+    assert [len(r["content"]) for r in results] == [SEARCH_CONTENT_CHARS] * 3
+
+    monkeypatch.setattr(Config, "SNIPPET_COMPACTION", True)
+    results = search.perform_search("Acme plant", focus="Acme Corp")
+    assert sum(estimate_tokens(r["content"]) for r in results) <= Config.SNIPPET_TOKEN_BUDGET
@@ -0,0 +1,153 @@
+from src.config import Config
+from src.llm_cache import bypass_llm_cache
+from src.services import changes
+from src.tools import search, sources
+from src.tools.sources import BloomFilter, SourceRegistry, content_hash, normalize_url, screen_known_sources
+
+
+class _Session:
+    def __init__(self, documents):
+        self.documents = documents
+        self.queries = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, **params):
+        self.queries.append(query)
+        urls, hashes, mission = params.get("urls"), params.get("hashes"), params.get("mission")
+        rows = []
+        for url, digest, *rest in self.documents:
+            missions, seq = (rest + [None, 0])[:2]
+            if "since" in params:
+                match = params["since"] < seq <= params["upto"]
+            else:
+                match = urls is None or (
+                    (url in urls or digest in hashes) and (mission is None or mission in (missions or []))
+                )
+            if match:
+                rows.append({"url": url, "hash": digest, "missions": missions})
+        return rows
+
+
+def _registry(monkeypatch, documents, seq=None):
+    session = _Session(documents)
+    seq = seq or {"value": 0}
+    monkeypatch.setattr(sources, "GraphManager", lambda: type("GM", (), {"session": lambda self: session})())
+    monkeypatch.setattr(changes, "read_write_seq", lambda: seq["value"])
+    monkeypatch.setattr(changes.change_feed, "current_seq", lambda max_age=None: seq["value"])
+    registry = SourceRegistry(bits=4096)
+    monkeypatch.setattr(sources, "source_registry", registry)
+    return registry, session
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(bits=2048)
+    keys = [f"url:https://news.example/{i}" for i in range(100)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    assert sum(f"url:https://other.example/{i}" in bloom for i in range(100)) < 10
+
+
+def test_normalize_url_ignores_tracking_and_fragments():
+    assert normalize_url("HTTPS://News.example/a/?utm_source=x&id=3#top") == "https://news.example/a?id=3"
+
+
+def test_known_sources_are_marked_or_filtered_with_one_lookup(monkeypatch):
+    syndicated = "Acme opens a Berlin office."
+    _, session = _registry(
+        monkeypatch,
+        [("https://news.example/a", None), ("https://wire.example/x", content_hash(syndicated))],
+    )
+    results = [
+        {"url": "https://news.example/a/?utm_medium=rss", "title": "A", "content": "Old story"},
+        {"url": "https://blog.example/b", "title": "B", "content": "  ACME opens a   Berlin office. "},
+        {"url": "https://fresh.example/c", "title": "C", "content": "Brand new story"},
+    ]
+
+    marked = screen_known_sources(results, "mark")
+    assert [bool(r.get("known")) for r in marked] == [True, True, False]
+    assert marked[2]["content"] == "Brand new story"
+    # bootstrap scan + one batched confirmation
+    assert len(session.queries) == 2
+
+    filtered = screen_known_sources(results, "filter")
+    assert [r["url"] for r in filtered] == ["https://fresh.example/c"]
+    assert screen_known_sources(results, "off") is results
+
+
+def test_recorded_ingest_is_known_without_rebootstrap(monkeypatch):
+    registry, session = _registry(monkeypatch, [])
+    results = [{"url": "https://news.example/new", "title": "N", "content": "Acme news"}]
+    assert registry.known(results) == set()
+
+    digest = registry.hash_for("https://news.example/new")
+    assert digest == content_hash("Acme news")
+    registry.record("https://news.example/new", digest)
+    session.documents.append(("https://news.example/new", digest))
+
+    assert registry.known(results) == {"https://news.example/new"}
+    assert sum("$urls" not in q for q in session.queries) == 1
+
+
+def test_sources_are_known_per_mission_kind(monkeypatch):
+    registry, session = _registry(monkeypatch, [("https://news.example/a", None, ["profile_facts"])])
+    results = [
+        {"url": "https://news.example/a", "title": "A", "content": "Acme HQ"},
+        {"url": "https://news.example/b", "title": "B", "content": "Acme CEO"},
+    ]
+
+    assert registry.known(results) == {"https://news.example/a"}
+    assert registry.known(results, "profile_facts") == {"https://news.example/a"}
+    assert registry.known(results, "executives") == set()
+
+    registry.record("https://news.example/b", None, "executives")
+    session.documents.append(("https://news.example/b", None, ["executives"]))
+    assert registry.known(results, "executives") == {"https://news.example/b"}
+
+
+def test_documents_from_other_processes_are_caught_up(monkeypatch):
+    seq = {"value": 4}
+    registry, session = _registry(monkeypatch, [("https://news.example/old", None, None, 4)], seq)
+    results = [{"url": "https://news.example/mcp", "title": "M", "content": "Acme news"}]
+    assert registry.known(results) == set()
+
+    # the MCP server ingests the article: no local commit listener runs here
+    session.documents.append(("https://news.example/mcp", None, None, 5))
+    seq["value"] = 5
+
+    assert registry.known(results) == {"https://news.example/mcp"}
+    assert sum("$since" in q for q in session.queries) == 1
+
+
+def test_agent_search_keeps_content_read_by_another_mission_kind(monkeypatch):
+    _registry(monkeypatch, [("https://news.example/a", None, ["profile_facts"])])
+    hit = {"url": "https://news.example/a", "title": "A", "content": "Acme appoints a new CEO"}
+
+    class _Tavily:
+        def __init__(self, api_key):
+            pass
+
+        def search(self, **kwargs):
+            return {"results": [hit]}
+
+    monkeypatch.setattr(search, "TavilyClient", _Tavily)
+    monkeypatch.setattr(Config, "TAVILY_API_KEY", "test-key")
+    monkeypatch.setattr(Config, "SOURCE_DEDUP", "mark")
+    monkeypatch.setattr(Config, "SNIPPET_COMPACTION", False)
+
+    with sources.bind_mission("executives"):
+        [result] = search.search_tavily.invoke({"query": "Acme CEO"})
+    assert not result.get("known") and result["content"] == hit["content"]
+
+    with sources.bind_mission("profile_facts"):
+        [result] = search.search_tavily.invoke({"query": "Acme HQ"})
+    assert result["known"]
+
+    with sources.bind_mission("profile_facts"), bypass_llm_cache():
+        [result] = search.search_tavily.invoke({"query": "Acme HQ"})
+    assert result["content"] == hit["content"]
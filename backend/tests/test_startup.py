@@ -0,0 +1,67 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+import src.api as api
+import src.routes.ops as ops
+import src.startup as startup
+from src.config import Config
+from benchmarks.bench_startup import eagerly_loaded
+
+
+def test_api_import_does_not_load_llm_stack():
+    assert eagerly_loaded() == []
+
+
+def test_ready_reports_warmup_progress(monkeypatch):
+    def broken():
+        raise RuntimeError("neo4j down")
+
+    monkeypatch.setattr(startup, "WARMUP_STEPS", {"graph": broken, "agent": lambda: None})
+    monkeypatch.setattr(startup, "warmup_state", startup.WarmupState())
+    monkeypatch.setattr(ops, "warmup_state", startup.warmup_state)
+    client = TestClient(api.app)
+
+    resp = client.get("/ready")
+    assert resp.status_code == 503 and resp.json()["components"]["agent"]["status"] == "pending"
+
+    asyncio.run(startup.run_warmup())
+    body = client.get("/ready").json()
+    assert body["components"]["agent"]["status"] == "ready"
+    assert body["components"]["graph"]["status"] == "failed"
+    assert body["components"]["graph"]["error"] == "neo4j down"
+
+    startup.WARMUP_STEPS["graph"] = lambda: None
+    asyncio.run(startup.run_warmup())
+    assert client.get("/ready").status_code == 200
+
+
+def test_failed_warmup_steps_are_retried(monkeypatch):
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("neo4j starting")
+
+    monkeypatch.setattr(startup, "WARMUP_STEPS", {"graph": flaky})
+    monkeypatch.setattr(startup, "warmup_state", startup.WarmupState())
+    monkeypatch.setattr(Config, "WARMUP_RETRY_SECONDS", 0.001)
+
+    state = asyncio.run(startup.run_warmup(retry=True))
+    assert state.ready
+    assert state.components["graph"]["attempts"] == 3
+
+
+def test_warmup_applies_pending_migrations(monkeypatch):
+    import src.migrations as migrations
+
+    ran = []
+    monkeypatch.setattr(migrations, "run_migrations", lambda: ran.append("pending") or ["0004_document_created_at"])
+    monkeypatch.setattr(Config, "MIGRATE_ON_STARTUP", True)
+    startup.WARMUP_STEPS["migrations"]()
+    assert ran == ["pending"]
+
+    monkeypatch.setattr(Config, "MIGRATE_ON_STARTUP", False)
+    startup.WARMUP_STEPS["migrations"]()
+    assert ran == ["pending"]
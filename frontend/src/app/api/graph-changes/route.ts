@@ -0,0 +1,23 @@
+import { NextResponse } from "next/server";
+import { API_BASE } from "@/lib/config";
+
+export async function GET(request: Request) {
+  const url = new URL(request.url);
+  const since = url.searchParams.get("since") ?? "0";
+
+  const response = await fetch(
+    `${API_BASE}/graph/changes?since=${encodeURIComponent(since)}`,
+    { method: "GET", cache: "no-store" },
+  );
+
+  const text = await response.text();
+  try {
+    const data = JSON.parse(text);
+    return NextResponse.json(data, { status: response.status });
+  } catch {
+    return NextResponse.json(
+      { nodes: [], edges: [], documents: [], deleted: [], seq: Number(since), has_more: false, reset: false, raw: text },
+      { status: response.status },
+    );
+  }
+}
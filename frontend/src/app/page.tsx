@@ -6,9 +6,9 @@ import StatCard from "@/components/ui/stat-card";
 import ThemeToggle from "@/components/ui/theme-toggle";
 import GraphPreview, { type GraphEdge, type GraphNode } from "@/components/ui/graph-preview";
 import { missionHighlights, stats as staticStats } from "@/lib/content";
-import { useEffect, useState } from "react";
+import { useCallback, useEffect, useRef, useState } from "react";
 import { fetchJson } from "@/lib/fetcher";
-import { SAMPLE_DOC_LIMIT } from "@/lib/constants";
+import { GRAPH_CHANGES_POLL_MS, SAMPLE_DOC_LIMIT } from "@/lib/constants";
 
 type GraphSample = {
   nodes?: GraphNode[];
@@ -16,8 +16,45 @@ type GraphSample = {
   node_count?: number;
   edge_count?: number;
   documents?: { url?: string }[];
+  seq?: number;
 };
 
+type GraphChanges = {
+  nodes?: GraphNode[];
+  edges?: GraphEdge[];
+  deleted?: { id: string; kind: "node" | "edge" }[];
+  seq?: number;
+  has_more?: boolean;
+  reset?: boolean;
+};
+
+// Merge by id; existing node objects are updated in place so the force layout keeps their positions.
+const mergeNodes = (current: GraphNode[], incoming: GraphNode[]) => {
+  const byId = new Map(current.map((n) => [n.id, n]));
+  for (const n of incoming) {
+    const existing = byId.get(n.id);
+    if (existing) Object.assign(existing, n);
+    else byId.set(n.id, n);
+  }
+  return Array.from(byId.values());
+};
+
+const mergeEdges = (current: GraphEdge[], incoming: GraphEdge[]) => {
+  const byId = new Map(current.map((e) => [e.id ?? `${e.source}->${e.target}:${e.type}`, e]));
+  for (const e of incoming) {
+    byId.set(e.id ?? `${e.source}->${e.target}:${e.type}`, e);
+  }
+  return Array.from(byId.values());
+};
+
+// Tombstones from the change feed: drop deleted nodes, deleted edges and edges of deleted nodes.
+const endpointId = (end: unknown) => (typeof end === "object" && end ? (end as GraphNode).id : String(end));
+
+const dropEdges = (current: GraphEdge[], deleted: Set<string>) =>
+  current.filter(
+    (e) => !(e.id && deleted.has(e.id)) && !deleted.has(endpointId(e.source)) && !deleted.has(endpointId(e.target)),
+  );
+
 export default function Home() {
   const [sampleSummary, setSampleSummary] = useState<{
     node_count: number;
@@ -32,6 +69,74 @@ export default function Home() {
   const [showGraph, setShowGraph] = useState(false);
   const [stats, setStats] = useState(staticStats);
   const [statsError, setStatsError] = useState<string | null>(null);
+  const sampleSeq = useRef<number | null>(null);
+
+  // Fetch a fresh /graph/sample snapshot and replace the displayed graph with it.
+  const loadSample = useCallback(async () => {
+    const { response, data } = await fetchJson<GraphSample>(`/api/run-mission?doc_limit=${SAMPLE_DOC_LIMIT}`);
+    if (!response.ok) {
+      throw new Error(`Backend responded ${response.status}`);
+    }
+    const graphData: GraphSample = data && typeof data === "object" ? (data as GraphSample) : {};
+    const names: string[] = [];
+    if (Array.isArray(graphData.nodes)) {
+      for (const node of graphData.nodes.slice(0, SAMPLE_DOC_LIMIT)) {
+        if (node && typeof node === "object" && "name" in node) {
+          const name = String((node as { name?: unknown }).name ?? "");
+          if (name) names.push(name);
+        }
+      }
+    }
+    setSampleSummary({
+      node_count: graphData.node_count ?? 0,
+      edge_count: graphData.edge_count ?? 0,
+      sample_nodes: names,
+      documents: Array.isArray(graphData.documents) ? graphData.documents : [],
+    });
+    sampleSeq.current = typeof graphData.seq === "number" ? graphData.seq : null;
+    setGraphNodes(Array.isArray(graphData.nodes) ? graphData.nodes : []);
+    setGraphEdges(Array.isArray(graphData.edges) ? graphData.edges : []);
+  }, []);
+
+  // While the graph is visible, pull only deltas since the last seen write sequence.
+  useEffect(() => {
+    if (!showGraph || sampleSeq.current === null) return;
+    let cancelled = false;
+    const poll = async () => {
+      try {
+        let more = true;
+        while (more && !cancelled && sampleSeq.current !== null) {
+          const { response, data } = await fetchJson<GraphChanges>(`/api/graph-changes?since=${sampleSeq.current}`);
+          if (!response.ok || !data || typeof data !== "object") return;
+          const delta = data as GraphChanges;
+          if (delta.reset) {
+            // The server's sequence went backwards (e.g. database reset): the nodes on screen
+            // may no longer exist, so replace them with a fresh snapshot.
+            await loadSample();
+            return;
+          }
+          const nodes = Array.isArray(delta.nodes) ? delta.nodes : [];
+          const edges = Array.isArray(delta.edges) ? delta.edges : [];
+          if (nodes.length) setGraphNodes((prev) => mergeNodes(prev, nodes));
+          if (edges.length) setGraphEdges((prev) => mergeEdges(prev, edges));
+          const deleted = new Set((Array.isArray(delta.deleted) ? delta.deleted : []).map((d) => d.id));
+          if (deleted.size) {
+            setGraphNodes((prev) => prev.filter((n) => !deleted.has(n.id)));
+            setGraphEdges((prev) => dropEdges(prev, deleted));
+          }
+          sampleSeq.current = delta.seq ?? sampleSeq.current;
+          more = Boolean(delta.has_more);
+        }
+      } catch {
+        // transient; next tick retries
+      }
+    };
+    const id = setInterval(poll, GRAPH_CHANGES_POLL_MS);
+    return () => {
+      cancelled = true;
+      clearInterval(id);
+    };
+  }, [showGraph, loadSample]);
 
   useEffect(() => {
     const loadStats = async () => {
@@ -60,28 +165,7 @@ export default function Home() {
     setSampleLoading(true);
     setSampleError(null);
     try {
-      const { response, data } = await fetchJson<GraphSample>(`/api/run-mission?doc_limit=${SAMPLE_DOC_LIMIT}`);
-      if (!response.ok) {
-        throw new Error(`Backend responded ${response.status}`);
-      }
-      const graphData: GraphSample = data && typeof data === "object" ? (data as GraphSample) : {};
-      const names: string[] = [];
-      if (Array.isArray(graphData.nodes)) {
-        for (const node of graphData.nodes.slice(0, SAMPLE_DOC_LIMIT)) {
-          if (node && typeof node === "object" && "name" in node) {
-            const name = String((node as { name?: unknown }).name ?? "");
-            if (name) names.push(name);
-          }
-        }
-      }
-      setSampleSummary({
-        node_count: graphData.node_count ?? 0,
-        edge_count: graphData.edge_count ?? 0,
-        sample_nodes: names,
-        documents: Array.isArray(graphData.documents) ? graphData.documents : [],
-      });
-      setGraphNodes(Array.isArray(graphData.nodes) ? graphData.nodes : []);
-      setGraphEdges(Array.isArray(graphData.edges) ? graphData.edges : []);
+      await loadSample();
       setShowGraph(true);
     } catch {
       // Keep any prior graph visible; only show a friendly message.
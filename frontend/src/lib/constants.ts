@@ -1,3 +1,4 @@
 export const SAMPLE_DOC_LIMIT = 5;
 export const COMPETITOR_DISPLAY_CAP = 4;
 export const MOOD_DRIVERS_DISPLAY_CAP = 2;
+export const GRAPH_CHANGES_POLL_MS = 5000;